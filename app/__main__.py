@@ -6,9 +6,8 @@ This allows the server to be run with:
     uv run python -m app
 """
 
-import asyncio
-
 from app.server import main
+from app.speedups import run
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
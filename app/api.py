@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Low-level helpers for CourtListener REST API requests.
+
+Tools and pipelines that need a CourtListener record use ``get_resource`` so
+that every request is authenticated, rate limited and error-checked the same
+way. Callers that can tolerate slightly stale data (e.g. graph traversal, where
+the same opinions and clusters are requested over and over) can opt into a
+shared response cache. Behind the in-memory cache, responses are shared with
+the other workers and replicas through the configured cache backend (see
+app/cache_backend.py), which also makes sure only one of them fetches a record
+that several request at once.
+"""
+
+from typing import Any
+
+import httpx
+
+from app.cache import LRUCache, register_cache
+from app.cache_backend import SharedCache
+from app.config import config, get_auth_headers
+from app.ratelimit import rate_limiter
+from app.speedups import json_loads
+from app.timing import phase
+from app.tracing import record_response, span
+
+# Responses keyed on "endpoint/resource ID/requested fields"
+response_cache: LRUCache[str, dict[str, Any]] = LRUCache(
+    config.courtlistener_response_cache_size,
+    ttl=config.courtlistener_response_cache_ttl,
+)
+register_cache("api_responses", response_cache)
+shared_responses = SharedCache("api_responses")
+
+
+async def get_resource(
+    http_client: httpx.AsyncClient,
+    endpoint: str,
+    resource_id: str | int,
+    fields: list[str] | None = None,
+    use_cache: bool = False,
+) -> dict[str, Any]:
+    """Fetch a single record from the CourtListener API.
+
+    Args:
+        http_client: The HTTP client to use.
+        endpoint: The API endpoint path (e.g., 'opinions', 'clusters').
+        resource_id: The ID of the record to retrieve.
+        fields: Only return these fields (smaller responses for large records).
+        use_cache: Whether to serve and store the response in the shared
+            response cache.
+
+    Returns:
+        dict[str, Any]: The record as returned by the CourtListener API.
+
+    Raises:
+        ValueError: If COURT_LISTENER_API_KEY is not found in environment variables.
+        httpx.HTTPStatusError: If the API request fails.
+
+    """
+    key = f"{endpoint}/{resource_id}/{','.join(fields or [])}"
+    with span(
+        "courtlistener.get_resource",
+        {"courtlistener.endpoint": endpoint, "courtlistener.fields": len(fields or [])},
+    ) as current:
+
+        async def fetch() -> dict[str, Any]:
+            headers = get_auth_headers()
+            params = {"fields": ",".join(fields)} if fields else None
+            async with rate_limiter:
+                response = await http_client.get(
+                    f"{config.courtlistener_base_url}{endpoint}/{resource_id}/",
+                    headers=headers,
+                    params=params,
+                )
+            record_response(current, response)
+            response.raise_for_status()
+            with span("json.decode"), phase("json_decode"):
+                data: dict[str, Any] = json_loads(response.content)
+            return data
+
+        if not use_cache:
+            return await fetch()
+
+        with phase("cache_lookup"):
+            cached: dict[str, Any] | None = response_cache.get(key)
+        current.set_attribute("cache.outcome", "miss" if cached is None else "hit")
+        if cached is not None:
+            return cached
+        # Served by another worker or replica when it has (or is) fetching it
+        data = await shared_responses.get_or_fetch(
+            key, fetch, config.courtlistener_response_cache_ttl
+        )
+
+    response_cache.put(key, data)
+    return data
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Process-wide background tasks shared by server sessions.
+
+The server lifespan runs once per MCP session (once per request for
+stateless HTTP), but background work such as template watching, system
+sampling and loop monitoring belongs to the process. A ``SharedTask`` is held
+by every session (and, for the HTTP transports, by the server itself) while
+it runs: the first holder starts the task and it is only cancelled once the
+last holder has left, so one session ending does not stop it for the others.
+"""
+
+import asyncio
+from collections.abc import Callable, Coroutine, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+
+class SharedTask:
+    """A background task that runs while at least one holder needs it."""
+
+    def __init__(self, name: str, run: Callable[[], Coroutine[Any, Any, None]]):
+        """Create the task's holder registry; nothing runs until held.
+
+        Args:
+            name: Task name, for debugging.
+            run: Creates the coroutine to run, e.g. ``lambda: sampler.run(5)``.
+
+        """
+        self.name = name
+        self._run = run
+        self._holders = 0
+        self.task: asyncio.Task[None] | None = None
+
+    @property
+    def holders(self) -> int:
+        """Number of current holders."""
+        return self._holders
+
+    def acquire(self) -> None:
+        """Hold the task, starting it if it is not running."""
+        self._holders += 1
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(), name=self.name)
+
+    def release(self) -> None:
+        """Release a hold, cancelling the task when no holders remain."""
+        self._holders -= 1
+        if self._holders <= 0 and self.task is not None:
+            self._holders = 0
+            self.task.cancel()
+            self.task = None
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        """Hold the task for the duration of the block."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
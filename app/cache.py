@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""Caching primitives for CourtListener MCP Server.
+
+This module provides a small, thread-safe LRU cache with hit/miss accounting
+and optional expiry, a SQLite-backed store for entries that should survive
+restarts, and a registry so that cache statistics can be reported by the
+status tool.
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import asdict, dataclass
+import json
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Seconds a PersistentStore waits for another process's write to finish
+_BUSY_TIMEOUT = 10.0
+# Seconds between PersistentStore sweeps of expired entries
+_PRUNE_INTERVAL = 60.0
+# Keys per PersistentStore query, below the bound parameter limit
+_BATCH = 500
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how a cache has been used.
+
+    Attributes:
+        hits: Number of lookups that found an entry.
+        misses: Number of lookups that did not find an entry.
+        evictions: Number of entries dropped to stay within maxsize.
+        size: Current number of entries.
+        maxsize: Maximum number of entries.
+
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    maxsize: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that were hits (0.0 when unused)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the statistics as a JSON-serializable dictionary."""
+        data = asdict(self)
+        data["hit_rate"] = round(self.hit_rate, 4)
+        return data
+
+
+class LRUCache(Generic[K, V]):
+    """A bounded, thread-safe least-recently-used cache.
+
+    Lookups that miss return the supplied default, so callers that need to
+    cache negative results (e.g. ``None``) should pass a sentinel default.
+    Entries may carry a time-to-live; expired entries are dropped on access
+    and counted as misses.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None) -> None:
+        """Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries to keep (must be positive).
+            ttl: Default time-to-live in seconds, or None to keep entries
+                until evicted.
+
+        Raises:
+            ValueError: If maxsize is not positive.
+
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Values are stored with their expiry time (None for no expiry)
+        self._data: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: K, default: Any = None) -> Any:
+        """Return the cached value for key, or default on a miss."""
+        with self._lock:
+            try:
+                value, expires_at = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def peek(self, key: K, default: Any = None) -> Any:
+        """Return the cached value for key without touching recency or counters."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[1] is not None and entry[1] <= time.monotonic()):
+                return default
+            return entry[0]
+
+    def put(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store value under key, evicting the oldest entry if full.
+
+        Args:
+            key: The cache key.
+            value: The value to store.
+            ttl: Time-to-live in seconds, overriding the cache default.
+
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def discard_where(self, predicate: Callable[[K], bool]) -> int:
+        """Remove every entry whose key matches predicate.
+
+        Args:
+            predicate: Called with each key; entries returning True are removed.
+
+        Returns:
+            The number of entries removed.
+
+        """
+        with self._lock:
+            doomed = [key for key in self._data if predicate(key)]
+            for key in doomed:
+                del self._data[key]
+            return len(doomed)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._data),
+                maxsize=self.maxsize,
+            )
+
+    def __contains__(self, key: object) -> bool:
+        """Check membership without touching recency or counters."""
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        """Return the current number of entries."""
+        with self._lock:
+            return len(self._data)
+
+
+class PersistentStore:
+    """A small SQLite-backed key/value store for JSON-serializable values.
+
+    Several caches, and several processes (e.g. HTTP workers), can share one
+    database file; each cache uses its own namespace. Entries may expire, in
+    which case they are ignored on read and pruned by later writes.
+
+    Calls block on the file (and on writers in other processes), so async
+    callers should run them in a worker thread.
+    """
+
+    def __init__(self, path: str | Path, namespace: str) -> None:
+        """Open (creating if needed) the store at path.
+
+        Args:
+            path: Path to the SQLite database file.
+            namespace: Name separating this store's keys from other users of
+                the same file.
+
+        """
+        self.path = Path(path)
+        self.namespace = namespace
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=_BUSY_TIMEOUT, check_same_thread=False
+        )
+        self._pruned_at = 0.0
+        with self._lock, self._conn:
+            # Readers in other processes do not block on a writer
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL, PRIMARY KEY (namespace, key))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_entries_expiry "
+                "ON cache_entries (namespace, expires_at)"
+            )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the stored value for key, or default if absent or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries "
+                "WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return default
+        return json.loads(row[0])
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Return the stored values of several keys, skipping absent or expired ones.
+
+        Args:
+            keys: Keys to read.
+
+        Returns:
+            dict[str, Any]: The values found, by key.
+
+        """
+        now = time.time()
+        found: dict[str, Any] = {}
+        with self._lock:
+            for start in range(0, len(keys), _BATCH):
+                batch = keys[start : start + _BATCH]
+                rows = self._conn.execute(
+                    "SELECT key, value FROM cache_entries WHERE namespace = ? "
+                    "AND (expires_at IS NULL OR expires_at > ?) "
+                    f"AND key IN ({','.join('?' * len(batch))})",
+                    (self.namespace, now, *batch),
+                ).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+        return found
+
+    def put_many(self, items: Iterable[tuple[str, Any, float | None]]) -> None:
+        """Store several (key, value, ttl) entries in one transaction.
+
+        Args:
+            items: Entries to store; ttl is in seconds, or None for no expiry.
+
+        """
+        now = time.time()
+        rows = [
+            (
+                self.namespace,
+                key,
+                json.dumps(value),
+                now + ttl if ttl is not None else None,
+            )
+            for key, value, ttl in items
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?)", rows
+            )
+            if now - self._pruned_at >= _PRUNE_INTERVAL:
+                self._pruned_at = now
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+                    (self.namespace, now),
+                )
+
+    def put(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store value under key, optionally expiring after ttl seconds."""
+        self.put_many([(key, value, ttl)])
+
+    def clear(self) -> None:
+        """Remove every entry in this namespace."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# Named caches whose statistics are reported by the status tool
+_registry: dict[str, LRUCache[Any, Any]] = {}
+
+
+def register_cache(name: str, cache: LRUCache[Any, Any]) -> None:
+    """Register a cache so its statistics appear in get_cache_stats().
+
+    Args:
+        name: Unique, human-readable cache name.
+        cache: The cache instance to report on.
+
+    """
+    _registry[name] = cache
+
+
+def get_cache_stats() -> dict[str, dict[str, Any]]:
+    """Get statistics for every registered cache.
+
+    Returns:
+        Mapping of cache name to its statistics dictionary.
+
+    """
+    return {name: cache.stats().to_dict() for name, cache in _registry.items()}
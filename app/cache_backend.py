@@ -0,0 +1,722 @@
+#!/usr/bin/env python3
+"""Cache tier shared between processes and replicas.
+
+The get, search and citation lookup caches keep an in-memory LRU per process.
+Behind it, a ``CacheBackend`` shares entries with the other HTTP workers or
+replicas (several servers behind a load balancer), so a hot record is fetched
+from CourtListener once rather than once per process. ``CACHE_BACKEND``
+selects the backend:
+
+- "local": no shared tier; each process warms its own caches;
+- "sqlite": a table in ``SHARED_STATE_PATH``, for processes on one host
+  (HTTP workers use it unless another backend is configured);
+- "redis": a Redis-protocol server (Redis, Valkey, KeyDB, ...) at
+  ``CACHE_REDIS_URL``, for replicas on several hosts. The client speaks RESP
+  over asyncio streams, so it needs no extra dependency.
+
+``SharedCache`` is one namespace of entries in the backend:
+
+- values are stored as JSON, zlib-compressed from ``CACHE_COMPRESS_MIN_BYTES``;
+- every entry expires after the TTL it was stored with;
+- ``get_or_fetch`` protects against stampedes: concurrent misses for a key
+  in one process share one fetch, and processes that find another process
+  holding the key's lock (a short-lived key set with SET NX, and released
+  only by its holder) wait for its result instead of fetching it again, and
+  fetch it themselves as soon as the lock is released without one;
+- backend errors are logged and treated as misses, so an unreachable cache
+  server makes requests slower, not failed.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from functools import lru_cache
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any
+from urllib.parse import unquote, urlsplit
+import uuid
+import weakref
+import zlib
+
+from loguru import logger
+
+from app.config import config
+from app.speedups import json_dumps, json_loads
+from app.timing import phase
+
+# First byte of a stored value: how the JSON that follows is encoded
+_PLAIN = b"j"
+_ZLIB = b"z"
+# zlib level for large values; JSON compresses well even at the fastest level
+_COMPRESS_LEVEL = 1
+
+# Seconds between checks for a value another process is fetching
+_LOCK_POLL_INTERVAL = 0.05
+# Seconds between warnings about an unavailable backend
+_WARNING_INTERVAL = 60.0
+# Keys per SQLite query, below the bound parameter limit
+_SQLITE_BATCH = 500
+# Seconds between SQLite sweeps of expired entries
+_SQLITE_PRUNE_INTERVAL = 60.0
+# Deletes KEYS[1] only if it still holds ARGV[1], atomically on the server
+_DELETE_IF_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) else return 0 end"
+)
+
+
+class CacheBackendError(Exception):
+    """An error reply or malformed response from the cache server."""
+
+
+# Failures of a backend operation, which callers treat as a cache miss
+_BACKEND_ERRORS = (OSError, EOFError, sqlite3.Error, CacheBackendError)
+
+
+class CacheBackend(ABC):
+    """Byte-valued key/value storage with expiry, shared between processes."""
+
+    name = "backend"
+
+    @abstractmethod
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        """Get several values, with None for missing or expired keys."""
+
+    @abstractmethod
+    async def set_many(self, items: Iterable[tuple[str, bytes, float]]) -> None:
+        """Store several (key, value, ttl) entries; ttl is in seconds."""
+
+    @abstractmethod
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Store value only if key is absent; returns whether it was stored."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove key, if present."""
+
+    @abstractmethod
+    async def delete_if(self, key: str, value: bytes) -> bool:
+        """Remove key only if it holds value; returns whether it was removed."""
+
+    async def close(self) -> None:
+        """Release connections opened from the running event loop."""
+
+
+class SQLiteBackend(CacheBackend):
+    """Backend storing entries in a SQLite file shared by processes on one host."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str | Path) -> None:
+        """Open (creating if needed) the cache table in the file at path.
+
+        Args:
+            path: Path to the SQLite database file, shared by all processes.
+
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False)
+        self._pruned_at = 0.0
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS shared_cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        """Get several values, with None for missing or expired keys."""
+        return await asyncio.to_thread(self._get_many, keys)
+
+    async def set_many(self, items: Iterable[tuple[str, bytes, float]]) -> None:
+        """Store several (key, value, ttl) entries; ttl is in seconds."""
+        await asyncio.to_thread(self._set_many, list(items))
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Store value only if key is absent; returns whether it was stored."""
+        return await asyncio.to_thread(self._add, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        """Remove key, if present."""
+        await asyncio.to_thread(self._delete, key, None)
+
+    async def delete_if(self, key: str, value: bytes) -> bool:
+        """Remove key only if it holds value; returns whether it was removed."""
+        return await asyncio.to_thread(self._delete, key, value)
+
+    # The blocking halves of the methods above, run in a worker thread since
+    # another process may hold the file's write lock
+
+    def _get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        now = time.time()
+        found: dict[str, bytes] = {}
+        with self._lock:
+            for start in range(0, len(keys), _SQLITE_BATCH):
+                batch = keys[start : start + _SQLITE_BATCH]
+                rows = self._conn.execute(
+                    "SELECT key, value FROM shared_cache WHERE expires_at > ? "
+                    f"AND key IN ({','.join('?' * len(batch))})",
+                    (now, *batch),
+                )
+                found.update(rows)
+        return [found.get(key) for key in keys]
+
+    def _set_many(self, items: list[tuple[str, bytes, float]]) -> None:
+        now = time.time()
+        rows = [(key, value, now + ttl) for key, value, ttl in items]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO shared_cache VALUES (?, ?, ?)", rows
+            )
+            if now - self._pruned_at >= _SQLITE_PRUNE_INTERVAL:
+                self._pruned_at = now
+                self._conn.execute(
+                    "DELETE FROM shared_cache WHERE expires_at <= ?", (now,)
+                )
+
+    def _add(self, key: str, value: bytes, ttl: float) -> bool:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM shared_cache WHERE key = ? AND expires_at <= ?",
+                (key, now),
+            )
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO shared_cache VALUES (?, ?, ?)",
+                (key, value, now + ttl),
+            )
+            return cursor.rowcount == 1
+
+    def _delete(self, key: str, value: bytes | None) -> bool:
+        with self._lock, self._conn:
+            if value is None:
+                cursor = self._conn.execute(
+                    "DELETE FROM shared_cache WHERE key = ?", (key,)
+                )
+            else:
+                cursor = self._conn.execute(
+                    "DELETE FROM shared_cache WHERE key = ? AND value = ?",
+                    (key, value),
+                )
+            return cursor.rowcount == 1
+
+
+def _encode_command(args: Sequence[str | bytes | int]) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%b\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    """Read one RESP reply; error replies are returned, not raised."""
+    line = await reader.readuntil(b"\r\n")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        return CacheBackendError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        return None if length < 0 else (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(rest)
+        return (
+            None if length < 0 else [await _read_reply(reader) for _ in range(length)]
+        )
+    raise CacheBackendError(f"Unexpected reply from cache server: {line!r}")
+
+
+class _RedisConnection:
+    """One connection to the cache server, used by one command at a time."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Wrap an open connection."""
+        self.reader = reader
+        self.writer = writer
+
+    async def execute(
+        self, commands: Sequence[Sequence[str | bytes | int]]
+    ) -> list[Any]:
+        """Send commands in one pipelined write and read their replies."""
+        self.writer.write(b"".join(_encode_command(command) for command in commands))
+        await self.writer.drain()
+        return [await _read_reply(self.reader) for _ in commands]
+
+    def close(self) -> None:
+        """Close the connection."""
+        self.writer.close()
+
+
+class _ConnectionPool:
+    """Idle connections and a cap on open connections, for one event loop."""
+
+    def __init__(self, size: int) -> None:
+        """Create an empty pool of at most size connections."""
+        self.idle: list[_RedisConnection] = []
+        self.slots = asyncio.Semaphore(size)
+
+
+class RedisBackend(CacheBackend):
+    """Backend storing entries on a Redis-protocol server.
+
+    Like ``RateLimiter``, the backend is safe to share across event loops:
+    a separate connection pool is kept for each running loop.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, pool_size: int = 8, timeout: float = 2.0) -> None:
+        """Create a backend for the server at url; connections open on first use.
+
+        Args:
+            url: Server URL, ``redis://[[user]:password@]host[:port][/db]``.
+            pool_size: Maximum connections per event loop.
+            timeout: Seconds to wait for a connection or a reply.
+
+        Raises:
+            ValueError: If url is not a redis:// URL.
+
+        """
+        parts = urlsplit(url)
+        if parts.scheme != "redis":
+            raise ValueError(f"Unsupported cache URL {url!r}; use redis://host:port/db")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.db = int(parts.path.strip("/") or 0)
+        self.username = unquote(parts.username) if parts.username else None
+        self.password = unquote(parts.password) if parts.password else None
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._pools: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, _ConnectionPool
+        ] = weakref.WeakKeyDictionary()
+
+    def _pool(self) -> _ConnectionPool:
+        """Get the connection pool for the running event loop."""
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            pool = self._pools[loop] = _ConnectionPool(self.pool_size)
+        return pool
+
+    async def _connect(self) -> _RedisConnection:
+        """Open a connection, authenticating and selecting the database."""
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        connection = _RedisConnection(reader, writer)
+        setup: list[list[str | bytes | int]] = []
+        if self.password is not None:
+            setup.append(["AUTH", *filter(None, [self.username, self.password])])
+        if self.db:
+            setup.append(["SELECT", self.db])
+        if setup:
+            try:
+                replies = await asyncio.wait_for(
+                    connection.execute(setup), self.timeout
+                )
+            except BaseException:
+                connection.close()
+                raise
+            for reply in replies:
+                if isinstance(reply, CacheBackendError):
+                    connection.close()
+                    raise reply
+        return connection
+
+    async def execute(self, *commands: Sequence[str | bytes | int]) -> list[Any]:
+        """Run commands on a pooled connection, pipelined.
+
+        Args:
+            commands: Commands, e.g. ``("GET", "key")``.
+
+        Returns:
+            list[Any]: One reply per command.
+
+        Raises:
+            CacheBackendError: If the server replied to a command with an error.
+            OSError: If the server could not be reached in time.
+
+        """
+        pool = self._pool()
+        async with pool.slots:
+            connection = pool.idle.pop() if pool.idle else await self._connect()
+            try:
+                replies = await asyncio.wait_for(
+                    connection.execute(commands), self.timeout
+                )
+            except BaseException:
+                # Replies may still be in flight; the stream cannot be reused
+                connection.close()
+                raise
+            pool.idle.append(connection)
+        for reply in replies:
+            if isinstance(reply, CacheBackendError):
+                raise reply
+        return replies
+
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        """Get several values, with None for missing or expired keys."""
+        if not keys:
+            return []
+        [values] = await self.execute(["MGET", *keys])
+        return list(values)
+
+    async def set_many(self, items: Iterable[tuple[str, bytes, float]]) -> None:
+        """Store several (key, value, ttl) entries; ttl is in seconds."""
+        commands: list[list[str | bytes | int]] = [
+            ["SET", key, value, "PX", max(1, int(ttl * 1000))]
+            for key, value, ttl in items
+        ]
+        if commands:
+            await self.execute(*commands)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Store value only if key is absent; returns whether it was stored."""
+        [reply] = await self.execute(
+            ["SET", key, value, "NX", "PX", max(1, int(ttl * 1000))]
+        )
+        return reply == "OK"
+
+    async def delete(self, key: str) -> None:
+        """Remove key, if present."""
+        await self.execute(["DEL", key])
+
+    async def delete_if(self, key: str, value: bytes) -> bool:
+        """Remove key only if it holds value; returns whether it was removed."""
+        [removed] = await self.execute(["EVAL", _DELETE_IF_SCRIPT, 1, key, value])
+        return bool(removed)
+
+    async def close(self) -> None:
+        """Close the idle connections opened from the running event loop."""
+        pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            for connection in pool.idle:
+                connection.close()
+
+
+@lru_cache(maxsize=1)
+def get_cache_backend() -> CacheBackend | None:
+    """Get the configured shared cache backend.
+
+    Returns:
+        The backend, or None when CACHE_BACKEND is "local".
+
+    Raises:
+        ValueError: If CACHE_BACKEND is unknown, or "sqlite" without
+            SHARED_STATE_PATH.
+
+    """
+    backend = config.cache_backend.lower()
+    if backend == "local":
+        return None
+    if backend == "sqlite":
+        if not config.shared_state_path:
+            raise ValueError("CACHE_BACKEND=sqlite requires SHARED_STATE_PATH")
+        logger.info(f"Sharing caches through {config.shared_state_path}")
+        return SQLiteBackend(config.shared_state_path)
+    if backend == "redis":
+        cache = RedisBackend(config.cache_redis_url)
+        logger.info(f"Sharing caches through redis://{cache.host}:{cache.port}")
+        return cache
+    raise ValueError(
+        f"Unknown cache backend: {config.cache_backend}. Use local, sqlite or redis"
+    )
+
+
+async def close_cache_backend() -> None:
+    """Close the shared cache backend's connections, if it was opened."""
+    if get_cache_backend.cache_info().currsize:
+        backend = get_cache_backend()
+        if backend is not None:
+            await backend.close()
+
+
+def encode_value(value: Any) -> bytes:
+    """Encode a value for the backend, compressing large values.
+
+    Args:
+        value: A JSON-serializable value.
+
+    Returns:
+        bytes: A one-byte encoding marker followed by the (compressed) JSON.
+
+    """
+    data = json_dumps(value).encode()
+    if 0 < config.cache_compress_min_bytes <= len(data):
+        return _ZLIB + zlib.compress(data, _COMPRESS_LEVEL)
+    return _PLAIN + data
+
+
+def decode_value(data: bytes) -> Any:
+    """Decode a value stored by encode_value.
+
+    Args:
+        data: The stored bytes.
+
+    Returns:
+        Any: The value.
+
+    Raises:
+        ValueError: If data is not a valid encoded value.
+
+    """
+    marker, body = data[:1], data[1:]
+    if marker == _ZLIB:
+        try:
+            body = zlib.decompress(body)
+        except zlib.error as e:
+            raise ValueError(f"Corrupt compressed cache entry: {e}") from e
+    elif marker != _PLAIN:
+        raise ValueError(f"Unknown cache entry encoding: {marker!r}")
+    return json_loads(body)
+
+
+# When the last backend failure was logged
+_warned_at: float | None = None
+
+
+def _warn_unavailable(error: Exception) -> None:
+    """Log a backend failure, at most once per _WARNING_INTERVAL."""
+    global _warned_at
+    now = time.monotonic()
+    if _warned_at is None or now - _warned_at >= _WARNING_INTERVAL:
+        _warned_at = now
+        logger.warning(f"Shared cache unavailable, continuing without it: {error!r}")
+
+
+class SharedCache:
+    """One namespace of entries in the shared cache backend.
+
+    Values must be JSON-serializable and never None (None means a miss). The
+    counters only cover the shared tier; the in-memory caches in front of it
+    report their own.
+    """
+
+    def __init__(self, namespace: str, backend: CacheBackend | None = None) -> None:
+        """Create a namespace and register it for status reporting.
+
+        Args:
+            namespace: Name separating these keys from other users of the backend.
+            backend: The backend to use; None uses the configured one.
+
+        """
+        self.namespace = namespace
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.lock_waits = 0
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        _registry[namespace] = self
+
+    def _backend(self) -> CacheBackend | None:
+        """Get the backend, or None when there is no shared tier."""
+        return self.backend if self.backend is not None else get_cache_backend()
+
+    def _key(self, key: str) -> str:
+        """Get the backend key for a key in this namespace."""
+        return f"{config.cache_key_prefix}:{self.namespace}:{key}"
+
+    async def _load(self, backend: CacheBackend, keys: Sequence[str]) -> dict[str, Any]:
+        """Read keys from the backend, treating failures as misses."""
+        try:
+            values = await backend.get_many([self._key(key) for key in keys])
+        except _BACKEND_ERRORS as e:
+            self.errors += 1
+            _warn_unavailable(e)
+            return {}
+        found = {}
+        for key, data in zip(keys, values, strict=True):
+            if data is None:
+                continue
+            try:
+                found[key] = decode_value(data)
+            except ValueError as e:
+                self.errors += 1
+                logger.warning(f"Ignoring unreadable shared cache entry {key}: {e}")
+        return found
+
+    async def _poll(
+        self, backend: CacheBackend, key: str, lock: str
+    ) -> tuple[dict[str, Any], bool]:
+        """Read a key and whether its lock is still held, in one round trip."""
+        try:
+            data, holder = await backend.get_many([self._key(key), lock])
+        except _BACKEND_ERRORS as e:
+            self.errors += 1
+            _warn_unavailable(e)
+            return {}, False
+        if data is not None:
+            try:
+                return {key: decode_value(data)}, True
+            except ValueError as e:
+                self.errors += 1
+                logger.warning(f"Ignoring unreadable shared cache entry {key}: {e}")
+        return {}, holder is not None
+
+    async def get_many(self, keys: Sequence[str]) -> dict[str, Any]:
+        """Get the values of several keys from the shared tier.
+
+        Args:
+            keys: Keys in this namespace.
+
+        Returns:
+            dict[str, Any]: The values found, by key.
+
+        """
+        backend = self._backend()
+        if backend is None or not keys:
+            return {}
+        with phase("cache_lookup"):
+            found = await self._load(backend, keys)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def put_many(self, items: Iterable[tuple[str, Any, float]]) -> None:
+        """Store several (key, value, ttl) entries in the shared tier.
+
+        Args:
+            items: Entries to store; ttl is in seconds.
+
+        """
+        backend = self._backend()
+        if backend is None:
+            return
+        entries = [
+            (self._key(key), encode_value(value), ttl) for key, value, ttl in items
+        ]
+        if not entries:
+            return
+        try:
+            await backend.set_many(entries)
+        except _BACKEND_ERRORS as e:
+            self.errors += 1
+            _warn_unavailable(e)
+
+    async def get_or_fetch(
+        self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: float
+    ) -> Any:
+        """Get a value from the shared tier, or fetch and store it exactly once.
+
+        Concurrent calls for the same key in this process share one attempt,
+        which keeps running if the caller that started it is cancelled.
+
+        Args:
+            key: Key in this namespace.
+            fetch: Fetches the value on a miss, e.g. from CourtListener.
+            ttl: Seconds the fetched value is shared for.
+
+        Returns:
+            Any: The cached or fetched value.
+
+        Raises:
+            Exception: Whatever fetch raised.
+
+        """
+        attempt = self._inflight.get(key)
+        if attempt is None:
+            attempt = asyncio.ensure_future(self._get_or_fetch(key, fetch, ttl))
+            self._inflight[key] = attempt
+            attempt.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(attempt)
+
+    def _finish(self, key: str, attempt: asyncio.Future[Any]) -> None:
+        """Forget a finished attempt, marking its exception as retrieved."""
+        if self._inflight.get(key) is attempt:
+            del self._inflight[key]
+        if not attempt.cancelled():
+            attempt.exception()
+
+    async def _get_or_fetch(
+        self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: float
+    ) -> Any:
+        """Look the key up, then wait for another process or fetch it."""
+        backend = self._backend()
+        if backend is None:
+            return await fetch()
+        found = await self.get_many([key])
+        if key in found:
+            return found[key]
+
+        lock = f"{config.cache_key_prefix}:lock:{self.namespace}:{key}"
+        # Unique per holder, so a fetch that outlives its lock does not
+        # release the lock another process has taken since
+        token = uuid.uuid4().hex.encode()
+        try:
+            locked = await backend.add(lock, token, config.cache_lock_timeout)
+        except _BACKEND_ERRORS as e:
+            self.errors += 1
+            _warn_unavailable(e)
+            return await fetch()
+
+        if not locked:
+            # Another process is fetching it; its result is usually close
+            self.lock_waits += 1
+            deadline = time.monotonic() + config.cache_lock_timeout
+            with phase("cache_lookup"):
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(_LOCK_POLL_INTERVAL)
+                    # Read the value and the lock together: the holder stores
+                    # the value before releasing the lock, so a released lock
+                    # with no value means its fetch failed
+                    found, held = await self._poll(backend, key, lock)
+                    if key in found:
+                        return found[key]
+                    if not held:
+                        break
+                else:
+                    logger.debug(
+                        f"Gave up waiting for {self.namespace}:{key}; fetching it"
+                    )
+
+        try:
+            value = await fetch()
+            await self.put_many([(key, value, ttl)])
+        finally:
+            if locked:
+                try:
+                    await backend.delete_if(lock, token)
+                except _BACKEND_ERRORS as e:
+                    self.errors += 1
+                    _warn_unavailable(e)
+        return value
+
+    def stats(self) -> dict[str, int]:
+        """Return the shared tier counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "lock_waits": self.lock_waits,
+        }
+
+
+# Shared cache namespaces whose statistics are reported by the status tool
+_registry: dict[str, SharedCache] = {}
+
+
+def get_shared_cache_stats() -> dict[str, Any]:
+    """Get the shared cache backend and the statistics of each namespace.
+
+    Returns:
+        dict[str, Any]: The configured backend and per-namespace counters.
+
+    """
+    return {
+        "backend": config.cache_backend.lower(),
+        "namespaces": {name: cache.stats() for name, cache in _registry.items()},
+    }
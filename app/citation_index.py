@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""Offline volume/reporter/page to cluster index for citation resolution.
+
+CourtListener publishes a bulk export of every citation it knows about
+(``citations-YYYY-MM-DD.csv.bz2``, with ``volume``, ``reporter``, ``page`` and
+``cluster_id`` columns). Importing it into a local SQLite index lets common
+reporter citations resolve to cluster IDs without a network round trip and
+without counting against the API rate limit.
+
+Usage:
+    uv run python -m app.citation_index import citations-2025-01-01.csv.bz2
+    uv run python -m app.citation_index import citations.csv --all-reporters
+    uv run python -m app.citation_index lookup "410 U.S. 113"
+
+Point ``CITATION_INDEX_PATH`` at the index to enable offline resolution.
+"""
+
+import argparse
+import bz2
+from collections.abc import Iterable, Iterator
+import csv
+from datetime import UTC, datetime
+from functools import lru_cache
+import gzip
+import io
+from pathlib import Path
+import re
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from loguru import logger
+
+from app.citator import normalize_citation_text, parse_citation
+from app.config import config
+
+# Reporters imported by default (see reporter_key for the normalized form)
+DEFAULT_REPORTERS = frozenset(
+    {
+        "us",  # U.S.
+        "sct",  # S. Ct.
+        "led",  # L. Ed.
+        "led2d",  # L. Ed. 2d
+        "f",  # F.
+        "f2d",  # F.2d
+        "f3d",  # F.3d
+        "f4th",  # F.4th
+        "fsupp",  # F. Supp.
+        "fsupp2d",  # F. Supp. 2d
+        "fsupp3d",  # F. Supp. 3d
+        "fappx",  # F. App'x
+    }
+)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+# "<volume> <reporter> <page>", e.g. "93 S. Ct. 705" or "45 F.4th 10"
+_VOLUME_REPORTER_PAGE = re.compile(r"^(\d+)\s+(\D.*?)\s+(\d+)\b")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS citations (
+    reporter TEXT NOT NULL,
+    volume TEXT NOT NULL,
+    page TEXT NOT NULL,
+    cluster_id INTEGER NOT NULL,
+    PRIMARY KEY (reporter, volume, page, cluster_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def reporter_key(reporter: str) -> str:
+    """Normalize a reporter abbreviation for indexing.
+
+    Spacing and punctuation vary between sources ("F. Supp. 2d", "F.Supp.2d",
+    citeurl's "f-supp-2d"), so only lowercase letters and digits are kept.
+
+    Args:
+        reporter: The reporter abbreviation or citeurl reporter slug.
+
+    Returns:
+        The normalized reporter key.
+
+    """
+    return _NON_ALNUM.sub("", reporter.lower())
+
+
+def split_citation(citation: str) -> tuple[str, str, str] | None:
+    """Split a case citation into (volume, reporter key, page).
+
+    Uses the citeurl parse when it has volume, reporter and page tokens, and
+    otherwise falls back to the plain "<volume> <reporter> <page>" shape, which
+    also covers reporters citeurl does not know (e.g. S. Ct., F.4th).
+
+    Args:
+        citation: The citation text.
+
+    Returns:
+        The citation parts, or None if the citation does not have that shape.
+
+    """
+    parsed = parse_citation(citation, broad=True)
+    if parsed is not None:
+        tokens = parsed.tokens_dict()
+        if tokens.get("volume") and tokens.get("reporter") and tokens.get("page"):
+            return (
+                str(tokens["volume"]),
+                reporter_key(str(tokens["reporter"])),
+                str(tokens["page"]),
+            )
+
+    match = _VOLUME_REPORTER_PAGE.match(normalize_citation_text(citation))
+    if match is None:
+        return None
+    volume, reporter, page = match.groups()
+    return volume, reporter_key(reporter), page
+
+
+def _open_text(path: Path) -> io.TextIOBase:
+    """Open a plain, bzip2 or gzip compressed CSV file as text."""
+    if path.suffix == ".bz2":
+        return bz2.open(path, "rt", encoding="utf-8", newline="")
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return path.open(encoding="utf-8", newline="")
+
+
+def _read_rows(
+    path: Path, reporters: frozenset[str] | None
+) -> Iterator[tuple[str, str, str, int]]:
+    """Yield (reporter, volume, page, cluster_id) rows from a bulk citations CSV."""
+    with _open_text(path) as handle:
+        reader = csv.DictReader(handle)
+        missing = {"volume", "reporter", "page", "cluster_id"} - set(
+            reader.fieldnames or []
+        )
+        if missing:
+            raise ValueError(f"{path} is missing columns: {', '.join(sorted(missing))}")
+        for row in reader:
+            reporter = reporter_key(row["reporter"] or "")
+            if reporters is not None and reporter not in reporters:
+                continue
+            try:
+                cluster_id = int(row["cluster_id"])
+            except (TypeError, ValueError):
+                continue
+            yield reporter, row["volume"].strip(), row["page"].strip(), cluster_id
+
+
+def _batched(
+    rows: Iterable[tuple[str, str, str, int]], size: int
+) -> Iterator[list[tuple[str, str, str, int]]]:
+    """Group rows into lists of at most size rows."""
+    batch: list[tuple[str, str, str, int]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_citations(
+    csv_path: str | Path,
+    index_path: str | Path,
+    reporters: frozenset[str] | None = DEFAULT_REPORTERS,
+    batch_size: int = 50_000,
+) -> int:
+    """Import a CourtListener bulk citations CSV into an index.
+
+    The index is rebuilt in a temporary file and moved into place when the
+    import finishes, so a running server never sees a partial index.
+
+    Args:
+        csv_path: Path to the bulk export (.csv, .csv.bz2 or .csv.gz).
+        index_path: Path of the SQLite index to create or replace.
+        reporters: Normalized reporter keys to import, or None for all.
+        batch_size: Number of rows inserted per transaction.
+
+    Returns:
+        The number of citations imported.
+
+    Raises:
+        ValueError: If the CSV does not have the expected columns.
+
+    """
+    csv_path = Path(csv_path)
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    start = time.perf_counter()
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(
+            "PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + _SCHEMA
+        )
+        for batch in _batched(_read_rows(csv_path, reporters), batch_size):
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO citations VALUES (?, ?, ?, ?)", batch
+                )
+        count = conn.execute("SELECT COUNT(*) FROM citations").fetchone()[0]
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?)",
+                [
+                    ("source", csv_path.name),
+                    ("imported_at", datetime.now(UTC).isoformat()),
+                    ("citations", str(count)),
+                ],
+            )
+        conn.execute("VACUUM")
+    except BaseException:
+        conn.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    conn.close()
+
+    tmp_path.replace(index_path)
+    logger.info(
+        f"Imported {count} citations from {csv_path} into {index_path} "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    return int(count)
+
+
+class CitationIndex:
+    """Read-only view of an imported citation index."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Open an index created by import_citations().
+
+        Args:
+            path: Path to the SQLite index.
+
+        Raises:
+            FileNotFoundError: If the index does not exist.
+
+        """
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Citation index not found: {self.path}")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+        # Memory-map the index so hot pages are served from the page cache
+        self._conn.execute("PRAGMA mmap_size = 1073741824")
+
+    def lookup(self, volume: str, reporter: str, page: str) -> list[int]:
+        """Get the cluster IDs for a volume/reporter/page citation.
+
+        Args:
+            volume: The volume number.
+            reporter: The reporter abbreviation (normalized or not).
+            page: The first page.
+
+        Returns:
+            Matching cluster IDs (empty if the citation is not indexed).
+
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT cluster_id FROM citations "
+                "WHERE reporter = ? AND volume = ? AND page = ?",
+                (reporter_key(reporter), volume, page),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def resolve(self, citation: str) -> list[int]:
+        """Get the cluster IDs for a citation string.
+
+        Args:
+            citation: The citation text, e.g. "410 U.S. 113".
+
+        Returns:
+            Matching cluster IDs (empty if unparseable or not indexed).
+
+        """
+        parts = split_citation(citation)
+        if parts is None:
+            return []
+        return self.lookup(*parts)
+
+    def metadata(self) -> dict[str, Any]:
+        """Get information about the import that built this index."""
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM metadata").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        """Close the index."""
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache(maxsize=1)
+def get_citation_index() -> CitationIndex | None:
+    """Get the configured offline citation index.
+
+    Returns:
+        The index, or None when CITATION_INDEX_PATH is unset or missing.
+
+    """
+    if not config.citation_index_path:
+        return None
+    try:
+        index = CitationIndex(config.citation_index_path)
+    except (FileNotFoundError, sqlite3.Error) as e:
+        logger.warning(f"Offline citation index unavailable: {e}")
+        return None
+    logger.info(f"Using offline citation index {index.path} ({index.metadata()})")
+    return index
+
+
+def main() -> None:
+    """Command-line entry point for importing and querying the index."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Import a bulk citations CSV")
+    import_parser.add_argument("csv_path", type=Path)
+    import_parser.add_argument(
+        "--index",
+        type=Path,
+        default=config.citation_index_path,
+        required=config.citation_index_path is None,
+        help="Index path (defaults to CITATION_INDEX_PATH)",
+    )
+    import_parser.add_argument(
+        "--all-reporters",
+        action="store_true",
+        help="Import every reporter, not just the common federal ones",
+    )
+
+    lookup_parser = commands.add_parser("lookup", help="Resolve a citation")
+    lookup_parser.add_argument("citation")
+    lookup_parser.add_argument(
+        "--index",
+        type=Path,
+        default=config.citation_index_path,
+        required=config.citation_index_path is None,
+        help="Index path (defaults to CITATION_INDEX_PATH)",
+    )
+
+    args = parser.parse_args()
+    if args.command == "import":
+        count = import_citations(
+            args.csv_path,
+            args.index,
+            reporters=None if args.all_reporters else DEFAULT_REPORTERS,
+        )
+        print(f"Imported {count} citations into {args.index}")
+    else:
+        index = CitationIndex(args.index)
+        parts = split_citation(args.citation)
+        if parts is None:
+            raise SystemExit(f"{args.citation}: not a volume/reporter/page citation")
+        start = time.perf_counter()
+        cluster_ids = index.lookup(*parts)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{args.citation}: {cluster_ids or 'not indexed'} ({elapsed:.3f}ms)")
+
+
+if __name__ == "__main__":
+    main()
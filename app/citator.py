@@ -0,0 +1,642 @@
+#!/usr/bin/env python3
+"""citeurl citator management and memoized citation parsing.
+
+All citation tools share one citeurl ``Citator`` (built from citeurl's default
+templates plus ``tools/custom_citation_templates.yaml``) and one bounded LRU of
+parse results. Results are stored as immutable ``ParsedCitation`` records keyed
+on the whitespace-normalized citation text, the broad flag, and the version of
+the template set that produced them.
+
+``list_citations`` can also run incrementally: long-form matches are cached
+per paragraph, keyed on a hash of the paragraph text and the template version,
+so re-extracting a lightly edited document only scans the changed paragraphs.
+
+``reload_templates`` rebuilds the citator when the custom template file
+changes and swaps it in atomically, either on demand or from the polling
+``watch_templates`` task, without restarting the server.
+"""
+
+import asyncio
+from dataclasses import dataclass
+import hashlib
+from pathlib import Path
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from app.background import SharedTask
+from app.cache import LRUCache, register_cache
+from app.config import config
+from app.metrics import citeurl_cpu_time
+from app.prefilter import CitationPrefilter
+from app.timing import phase
+from app.tracing import span
+
+if TYPE_CHECKING:
+    from citeurl import Citation, Citator  # type: ignore[import-untyped]
+
+TEMPLATE_PATH = Path(__file__).parent / "tools" / "custom_citation_templates.yaml"
+
+# Sentinel distinguishing "not cached" from a cached negative (None) result
+_MISSING = object()
+
+# Paragraph breaks; no citeurl template matches across a blank line
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+
+# Tokens that point into an authority (a page or footnote of a case) rather
+# than name it, so citations differing only in them share a lookup key
+_PINPOINT_TOKENS = ["pincite", "footnote"]
+
+
+def _authority_name(citation: "Citation") -> str | None:
+    """Name the authority a citation refers to, dropping its pinpoint."""
+    name = getattr(citation, "name", None)
+    if not any(citation.tokens.get(token) for token in _PINPOINT_TOKENS):
+        return name
+    from citeurl import Authority
+
+    return Authority(citation, ignored_tokens=_PINPOINT_TOKENS).name or name
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedCitation:
+    """Compact, immutable snapshot of a citeurl ``Citation``.
+
+    Attributes:
+        text: The matched citation text.
+        template: Name of the citeurl template that matched.
+        tokens: Normalized token values as ordered (name, value) pairs.
+        URL: URL generated by the template, if any.
+        name: Canonical citation name generated by the template, if any.
+        authority: Canonical name of the cited authority, without any pincite
+            or footnote (``410 U.S. 113`` for ``410 U.S. 113, 120``).
+        span: Start and end offsets of the match within the parsed text.
+
+    """
+
+    text: str
+    template: str
+    tokens: tuple[tuple[str, str | None], ...]
+    URL: str | None
+    name: str | None
+    authority: str | None
+    span: tuple[int, int]
+
+    @classmethod
+    def from_citation(cls, citation: "Citation") -> "ParsedCitation":
+        """Build a snapshot from a citeurl Citation object."""
+        return cls(
+            text=citation.text,
+            template=str(citation.template),
+            tokens=tuple(citation.tokens.items()),
+            URL=getattr(citation, "URL", None),
+            name=getattr(citation, "name", None),
+            authority=_authority_name(citation),
+            span=tuple(citation.span),
+        )
+
+    def tokens_dict(self) -> dict[str, str | None]:
+        """Return the tokens as a fresh dictionary."""
+        return dict(self.tokens)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the fields reported by the citation tools."""
+        return {
+            "text": self.text,
+            "tokens": self.tokens_dict(),
+            "template": self.template,
+            "URL": self.URL,
+            "canonical_name": self.name,
+        }
+
+
+class TemplateError(Exception):
+    """The custom citation template file could not be loaded by citeurl."""
+
+
+@dataclass(frozen=True, slots=True)
+class TemplateSet:
+    """A citator and everything derived from one version of the templates.
+
+    Attributes:
+        citator: The citeurl Citator with the custom templates loaded.
+        prefilter: The literal prefilter built from the citator's templates.
+        version: First 12 hex digits of the SHA-256 of the custom template file.
+
+    """
+
+    citator: "Citator"
+    prefilter: CitationPrefilter
+    version: str
+
+
+# The current template set. It is only ever replaced as a whole, so readers
+# that take one reference see a consistent citator, prefilter and version.
+_template_set: TemplateSet | None = None
+_template_lock = threading.Lock()
+# Serializes reloads so concurrent triggers do not build the same set twice
+_reload_lock = threading.Lock()
+
+
+def _load_template_set() -> TemplateSet:
+    """Build a citator, prefilter and version from the custom template file."""
+    # citeurl is imported here rather than at module level so that starting
+    # the server does not pay for it until citations are first needed
+    from citeurl import Citator
+    import yaml
+
+    data = TEMPLATE_PATH.read_bytes()
+    with citeurl_cpu_time("build"):
+        citator = Citator()
+        try:
+            citator.load_yaml(data.decode("utf-8"))
+        # citeurl does not validate the file, so a malformed entry surfaces
+        # as whatever error it causes while being read
+        except (
+            yaml.YAMLError,
+            re.error,
+            AttributeError,
+            KeyError,
+            TypeError,
+            ValueError,
+        ) as e:
+            raise TemplateError(f"Invalid citation templates: {e}") from e
+        prefilter = CitationPrefilter(citator)
+    return TemplateSet(
+        citator=citator,
+        prefilter=prefilter,
+        version=hashlib.sha256(data).hexdigest()[:12],
+    )
+
+
+def get_template_set() -> TemplateSet:
+    """Get the current template set, building it on first use.
+
+    Returns:
+        TemplateSet: The citator, prefilter and version in use.
+
+    """
+    global _template_set
+    template_set = _template_set
+    if template_set is None:
+        with _template_lock:
+            if _template_set is None:
+                _template_set = _load_template_set()
+                logger.info(
+                    f"Created citator with custom citation templates from "
+                    f"{TEMPLATE_PATH} (version {_template_set.version})"
+                )
+            template_set = _template_set
+    return template_set
+
+
+async def warm_up() -> None:
+    """Build the template set in a worker thread if it does not exist yet.
+
+    Started in the background at server startup so that the first citation
+    tool call does not pay for importing citeurl and compiling its templates.
+    """
+    if _template_set is not None:
+        return
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(get_template_set)
+    except (OSError, TemplateError) as e:
+        logger.error(f"Citator warm-up failed: {e}")
+        return
+    logger.info(f"Citator warmed up in {time.perf_counter() - start:.2f}s")
+
+
+def get_citator() -> "Citator":
+    """Get or create the citeurl citator instance with custom citation templates.
+
+    Returns:
+        Citator: The singleton citeurl Citator instance with custom citation support.
+
+    """
+    return get_template_set().citator
+
+
+def get_prefilter() -> CitationPrefilter:
+    """Get the literal prefilter built from the citator's templates.
+
+    Returns:
+        CitationPrefilter: The prefilter for the current template set.
+
+    """
+    return get_template_set().prefilter
+
+
+def get_template_version() -> str:
+    """Get a short fingerprint of the custom citation template set.
+
+    Returns:
+        The first 12 hex digits of the SHA-256 of the custom template file.
+
+    """
+    return get_template_set().version
+
+
+def reload_templates(force: bool = False) -> dict[str, Any]:
+    """Rebuild the citator from the custom template file and swap it in.
+
+    The new template set is built before anything is replaced, so requests
+    keep using the old one until the swap, and a file that fails to load
+    leaves the old one in place. Only parse results tagged with the replaced
+    version are dropped; everything else stays warm.
+
+    This is CPU-bound; call it from a worker thread in async code.
+
+    Args:
+        force: Swap in a freshly built set even if the file is unchanged.
+
+    Returns:
+        dict[str, Any]: A dictionary containing:
+            - reloaded: Whether a new template set was swapped in
+            - previous_version: The version before the reload
+            - version: The version now in use
+            - templates: Number of templates in the current citator
+            - invalidated_parse_entries: Parse results dropped by the reload
+
+    Raises:
+        OSError: If the template file cannot be read.
+        TemplateError: If citeurl cannot load the template file.
+
+    """
+    global _template_set
+    with _reload_lock:
+        previous = get_template_set()
+        loaded = _load_template_set()
+        reloaded = force or loaded.version != previous.version
+        invalidated = 0
+        if reloaded:
+            with _template_lock:
+                _template_set = loaded
+            if loaded.version != previous.version:
+                invalidated = parse_cache.discard_where(
+                    lambda key: key[2] == previous.version
+                )
+                paragraph_cache.discard_where(lambda key: key[1] == previous.version)
+            logger.info(
+                f"Reloaded citation templates {previous.version} -> "
+                f"{loaded.version}, dropped {invalidated} parse results"
+            )
+        current = get_template_set()
+        return {
+            "reloaded": reloaded,
+            "previous_version": previous.version,
+            "version": current.version,
+            "templates": len(current.citator.templates),
+            "invalidated_parse_entries": invalidated,
+        }
+
+
+def _template_file_state() -> tuple[int, int] | None:
+    """Get the (mtime, size) of the template file, or None if it is missing."""
+    try:
+        stat = TEMPLATE_PATH.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+async def watch_templates(interval: float) -> None:
+    """Reload the templates whenever the custom template file changes.
+
+    Polls the file's modification time and size, and rebuilds the citator in a
+    worker thread when either changes. Runs until cancelled.
+
+    Args:
+        interval: Seconds between checks.
+
+    """
+    last = _template_file_state()
+    while True:
+        await asyncio.sleep(interval)
+        current = _template_file_state()
+        if current is None or current == last:
+            continue
+        last = current
+        try:
+            await asyncio.to_thread(reload_templates)
+        except (OSError, TemplateError) as e:
+            logger.error(f"Keeping current citation templates, reload failed: {e}")
+
+
+# One watcher per process, however many sessions are open
+template_watcher = SharedTask(
+    "citation-template-watcher",
+    lambda: watch_templates(config.citation_templates_watch_interval),
+)
+
+
+def normalize_citation_text(text: str) -> str:
+    """Collapse runs of whitespace and strip the ends of a citation string.
+
+    Args:
+        text: The raw citation text.
+
+    Returns:
+        The whitespace-normalized citation text.
+
+    """
+    return " ".join(text.split())
+
+
+# Parse results keyed on (normalized text, broad, template version)
+parse_cache: LRUCache[tuple[str, bool, str], ParsedCitation | None] = LRUCache(
+    config.citation_parse_cache_size
+)
+register_cache("citation_parse", parse_cache)
+
+
+@dataclass(frozen=True, slots=True)
+class _LongformMatch:
+    """Where a long-form citation matched, relative to its paragraph."""
+
+    template: str
+    regex: int
+    start: int
+    end: int
+
+
+# Long-form matches keyed on (paragraph digest, template version)
+paragraph_cache: LRUCache[tuple[str, str], tuple[_LongformMatch, ...]] = LRUCache(
+    config.citation_paragraph_cache_size
+)
+register_cache("citation_paragraphs", paragraph_cache)
+
+
+def parse_citation(text: str, broad: bool = True) -> ParsedCitation | None:
+    """Parse a single citation with citeurl, memoizing the result.
+
+    Both successful parses and misses are cached, so repeated lookups of
+    unrecognized strings are also cheap.
+
+    Args:
+        text: The citation text to parse.
+        broad: Whether to use citeurl's broad (case-insensitive) patterns.
+
+    Returns:
+        The parsed citation, or None if citeurl does not recognize it.
+
+    """
+    template_set = get_template_set()
+    normalized = normalize_citation_text(text)
+    key = (normalized, broad, template_set.version)
+    with span("citeurl.parse", {"citeurl.chars": len(normalized)}) as current:
+        with phase("cache_lookup"):
+            cached = parse_cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            current.set_attribute("cache.outcome", "hit")
+            return cached
+
+        current.set_attribute("cache.outcome", "miss")
+        with citeurl_cpu_time("parse"), phase("citeurl"):
+            citation = template_set.citator.cite(normalized, broad=broad)
+        parsed = ParsedCitation.from_citation(citation) if citation else None
+    parse_cache.put(key, parsed)
+    return parsed
+
+
+def _key_for(parsed: ParsedCitation | None, text: str) -> str:
+    """Build the deduplication key from a broad parse result."""
+    if parsed is not None and (parsed.authority or parsed.name or parsed.text):
+        return parsed.authority or parsed.name or parsed.text
+    return normalize_citation_text(text)
+
+
+def citation_key(text: str) -> str:
+    """Get the key under which equivalent citations are deduplicated.
+
+    Citations citeurl recognizes are keyed on the canonical name of the
+    authority they cite, so ``410 u.s. 113``, ``410  U.S. 113`` and
+    ``410 U.S. 113, 120`` share a key; anything else falls back to its
+    whitespace-normalized text.
+
+    Args:
+        text: The raw citation text.
+
+    Returns:
+        The deduplication key for the citation.
+
+    """
+    return _key_for(parse_citation(text, broad=True), text)
+
+
+def cached_citation_key(text: str) -> str | None:
+    """Get a citation's key only if its broad parse is already cached.
+
+    This never runs citeurl, so it is safe to call on the event loop.
+
+    Args:
+        text: The raw citation text.
+
+    Returns:
+        The deduplication key, or None if the citation has not been parsed yet.
+
+    """
+    cached = parse_cache.peek(
+        (normalize_citation_text(text), True, get_template_version()), _MISSING
+    )
+    if cached is _MISSING:
+        return None
+    return _key_for(cached, text)
+
+
+def match_citation(text: str) -> tuple[ParsedCitation | None, str | None]:
+    """Match a citation with strict patterns, falling back to broad ones.
+
+    The broad pass only runs when the strict pass misses, so well-formed
+    citations cost a single template scan.
+
+    Args:
+        text: The citation text to match.
+
+    Returns:
+        A (parsed citation, matching mode) pair, where the mode is "strict",
+        "broad", or None when neither pass recognizes the citation.
+
+    """
+    parsed = parse_citation(text, broad=False)
+    if parsed:
+        return parsed, "strict"
+    parsed = parse_citation(text, broad=True)
+    if parsed:
+        return parsed, "broad"
+    return None, None
+
+
+def _paragraph_spans(text: str) -> list[tuple[int, int]]:
+    """Split text into (start, end) spans at blank lines."""
+    spans = []
+    start = 0
+    for match in _PARAGRAPH_BREAK.finditer(text):
+        spans.append((start, match.start()))
+        start = match.end()
+    spans.append((start, len(text)))
+    return [(begin, end) for begin, end in spans if end > begin]
+
+
+def _sort_and_remove_overlaps(citations: list["Citation"]) -> None:
+    """Sort citations by position, dropping the shorter of any overlapping pair.
+
+    Mirrors citeurl's own overlap resolution so results match ``list_cites``.
+    """
+    citations.sort(key=lambda c: c.span[0])
+    i = 1
+    while i < len(citations):
+        if citations[i].span[0] < citations[i - 1].span[1]:
+            if len(citations[i - 1]) > len(citations[i]):
+                citations.pop(i)
+            else:
+                citations.pop(i - 1)
+        else:
+            i += 1
+
+
+def _scan_paragraph(
+    template_set: TemplateSet, text: str, start: int, end: int
+) -> list["Citation"]:
+    """Find the long-form citations in one paragraph, template by template.
+
+    Collecting matches in citator order, as citeurl does, makes the overlap
+    resolution in list_citations break ties the same way.
+    """
+    prefilter = template_set.prefilter
+    if not prefilter.may_contain_citation(text, start, end):
+        return []
+    longforms: list[Citation] = []
+    for template in prefilter.candidate_templates(text[start:end]):
+        longforms += template.list_longform_cites(text, span=(start, end))
+    return longforms
+
+
+def _rebuild_paragraph(
+    template_set: TemplateSet,
+    text: str,
+    start: int,
+    end: int,
+    matches: tuple[_LongformMatch, ...],
+) -> list["Citation"] | None:
+    """Recreate cached long-form citations without scanning the paragraph.
+
+    Each citation is rebuilt by matching its regex at the cached offset only.
+    Returns None if any match cannot be reproduced, so the caller rescans.
+    """
+    from citeurl import Citation
+
+    templates = template_set.citator.templates
+    longforms = []
+    for cached in matches:
+        template = templates.get(cached.template)
+        if template is None or cached.regex >= len(template.regexes):
+            return None
+        match = template.regexes[cached.regex].match(text, start + cached.start, end)
+        if match is None or match.end() != start + cached.end:
+            return None
+        try:
+            longforms.append(Citation(match, template))
+        except SyntaxError:
+            return None
+    return longforms
+
+
+def _cached_paragraph(
+    template_set: TemplateSet, text: str, start: int, end: int
+) -> list["Citation"]:
+    """Find the long-form citations in one paragraph, reusing cached matches."""
+    digest = hashlib.blake2b(text[start:end].encode(), digest_size=16).hexdigest()
+    key = (digest, template_set.version)
+    cached = paragraph_cache.get(key)
+    if cached is not None:
+        rebuilt = _rebuild_paragraph(template_set, text, start, end, cached)
+        if rebuilt is not None:
+            return rebuilt
+
+    longforms = _scan_paragraph(template_set, text, start, end)
+    paragraph_cache.put(
+        key,
+        tuple(
+            _LongformMatch(
+                template=citation.template.name,
+                regex=citation.template.regexes.index(citation.match.re),
+                start=citation.span[0] - start,
+                end=citation.span[1] - start,
+            )
+            for citation in longforms
+        ),
+    )
+    return longforms
+
+
+def list_citations(text: str, incremental: bool = False) -> list["Citation"]:
+    """Find all long-form, short-form and id. citations in text.
+
+    Equivalent to citeurl's ``list_cites``, except that long-form matching only
+    runs the templates the prefilter selects for each paragraph, and skips
+    paragraphs that cannot contain a citation at all. Short-form and id.
+    citations are still searched across the whole text, since they may refer
+    back to a citation in an earlier paragraph.
+
+    Args:
+        text: The text to scan for citations.
+        incremental: Reuse the long-form matches of paragraphs seen before
+            (by any caller) instead of scanning them again. Useful when the
+            same document is extracted repeatedly with small edits.
+
+    Returns:
+        list[Citation]: The citations found, in order of appearance.
+
+    """
+    template_set = get_template_set()
+    with (
+        span(
+            "citeurl.extract",
+            {"citeurl.chars": len(text), "citeurl.incremental": incremental},
+        ) as current,
+        citeurl_cpu_time("extract"),
+        phase("citeurl"),
+    ):
+        citations = _list_citations(template_set, text, incremental)
+        current.set_attribute("citeurl.citations", len(citations))
+    return citations
+
+
+def _list_citations(
+    template_set: TemplateSet, text: str, incremental: bool
+) -> list["Citation"]:
+    """Find citations in text with the given template set (see list_citations)."""
+    scan = _cached_paragraph if incremental else _scan_paragraph
+    longforms: list[Citation] = []
+    for start, end in _paragraph_spans(text):
+        longforms += scan(template_set, text, start, end)
+
+    shortforms: list[Citation] = []
+    for citation in longforms:
+        shortforms += citation.get_shortform_cites()
+
+    citations = longforms + shortforms
+    _sort_and_remove_overlaps(citations)
+
+    # Look for id. citations after each citation, up to the next one
+    breakpoints = sorted({c.span[0] for c in citations})
+    breakpoints.append(len(text))
+    idforms: list[Citation] = []
+    for citation in citations:
+        for i, breakpoint in enumerate(breakpoints):
+            if breakpoint >= citation.span[1]:
+                breakpoints = breakpoints[i:]
+                break
+        until = breakpoints[0] if breakpoints else None
+        idform = citation.get_idform_cite(until_index=until)
+        while idform:
+            idforms.append(idform)
+            idform = idform.get_idform_cite(until_index=until)
+
+    citations += idforms
+    _sort_and_remove_overlaps(citations)
+    return citations
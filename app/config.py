@@ -22,10 +22,16 @@ class Config(BaseSettings):
     mcp_port: int = 8000
     mcp_transport: str = "stdio"  # Options: stdio, http, sse
     mcp_path: str = "/mcp/"  # Path for HTTP/SSE transports
+    http_workers: int = 1  # HTTP transport processes (see app/workers.py)
+    # SQLite file HTTP workers share caches and the upstream rate limit through;
+    # None uses a file in the temp directory when HTTP_WORKERS > 1
+    shared_state_path: str | None = None
 
     # Logging
     courtlistener_log_level: str = "INFO"
     courtlistener_debug: bool = False
+    log_info_sample_every: int = 1  # Keep 1 in N DEBUG/INFO file logs per call site
+    tool_log_level: str = "info"  # Lowest ctx log level sent to clients, or "off"
 
     # Environment
     environment: str = "production"
@@ -34,6 +40,72 @@ class Config(BaseSettings):
     courtlistener_base_url: str = "https://www.courtlistener.com/api/rest/v4/"
     courtlistener_api_key: str | None = None
     courtlistener_timeout: int = 30
+    courtlistener_max_concurrency: int = 8  # Requests in flight at once
+    courtlistener_requests_per_second: float = 0.0  # 0 disables pacing
+    courtlistener_response_cache_size: int = 2048  # Records cached by opt-in callers
+    courtlistener_response_cache_ttl: int = 3600
+    get_cache_enabled: bool = False  # Serve get tools from the response cache
+    search_cache_size: int = 512
+    search_cache_ttl: int = 0  # Seconds search results are cached; 0 disables
+
+    # citation-lookup/ per-request limits (enforced upstream)
+    citation_lookup_max_citations: int = 250
+    citation_lookup_max_chars: int = 64000
+
+    # Citation lookup result cache
+    citation_lookup_cache_size: int = 10000
+    citation_lookup_cache_ttl: int = 30 * 24 * 3600  # Found / ambiguous citations
+    citation_lookup_negative_ttl: int = 24 * 3600  # Not found / invalid citations
+    citation_lookup_cache_path: str | None = None  # SQLite file; None for memory
+
+    # Cache tier shared between processes and replicas (see app/cache_backend.py)
+    cache_backend: str = "local"  # Options: local, sqlite, redis
+    cache_redis_url: str = "redis://localhost:6379/0"
+    cache_key_prefix: str = "courtlistener-mcp"  # Separates servers sharing a backend
+    cache_compress_min_bytes: int = 1024  # Larger entries are compressed; 0 never
+    cache_lock_timeout: float = 10.0  # Seconds replicas wait for a key being fetched
+
+    # Citation network expansion
+    citation_network_cache_size: int = 10000  # Expanded opinions kept across calls
+
+    # Offline citation index (see app/citation_index.py)
+    citation_index_path: str | None = None
+
+    # Citation parsing
+    citation_parse_cache_size: int = 4096
+    # Paragraphs whose long-form matches are kept for incremental extraction
+    citation_paragraph_cache_size: int = 20000
+    # Build the citator in the background at startup instead of on first use
+    citation_warmup: bool = True
+    # Seconds between checks for edits to the custom templates (0 disables)
+    citation_templates_watch_interval: float = 0.0
+
+    # Seconds between background samples of CPU, memory and loop lag; 0 samples
+    # on each status call instead
+    status_sample_interval: float = 5.0
+
+    # Event loop lag and slow callback detection (see app/loop_monitor.py)
+    loop_monitor_enabled: bool = False
+    loop_monitor_interval: float = 0.05  # Seconds between lag measurements
+    loop_slow_callback_threshold: float = 0.1  # Stalls longer than this are reported
+
+    # Admin profiling tools (see app/tools/admin.py); off unless explicitly enabled
+    admin_tools_enabled: bool = False
+    profile_dir: str | None = None  # Profiling artifacts; None uses a temp directory
+
+    # Optional fast paths (see app/speedups.py); used only when installed
+    uvloop_enabled: bool = True
+    orjson_enabled: bool = True
+
+    # Prometheus metrics at /metrics (HTTP and SSE transports); aggregate counts
+    # only, with bounded label cardinality, so on by default (see README)
+    metrics_enabled: bool = True
+
+    # OpenTelemetry tracing (needs the "tracing" extra)
+    tracing_enabled: bool = False
+    tracing_exporter: str = "otlp"  # Options: otlp, console
+    tracing_endpoint: str | None = None  # OTLP/HTTP traces URL; None uses OTEL_* env
+    tracing_service_name: str = "courtlistener-mcp"
 
     model_config = {
         "env_file": ".env",
@@ -130,7 +202,9 @@ async def get_http_client(ctx: "Context") -> AsyncIterator[httpx.AsyncClient]:
             return
 
     # Fallback: create a temporary client and ensure it's closed
-    logger.debug("Creating fallback HTTP client (lifespan client unavailable or closed)")
+    logger.debug(
+        "Creating fallback HTTP client (lifespan client unavailable or closed)"
+    )
     client = httpx.AsyncClient(
         timeout=config.courtlistener_timeout,
         limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
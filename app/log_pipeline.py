@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Low-overhead logging for the request path.
+
+- ``configure_file_logging`` adds the server log file as an enqueued loguru
+  sink, so formatting, writing and rotation happen on loguru's background
+  thread instead of in the tool call.
+- ``InfoSampler`` is a sink filter that keeps one in N DEBUG and INFO records
+  per call site; warnings and errors are always kept.
+- ``CallLogMiddleware`` coalesces the ``ctx.info``/``ctx.error`` messages of a
+  tool call into one structured MCP log message sent when the call finishes.
+  ``TOOL_LOG_LEVEL`` drops messages below a level, or all of them with "off".
+"""
+
+from collections.abc import Mapping
+from pathlib import Path
+import time
+from typing import Any
+
+import anyio
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from loguru import logger
+import mcp.types as mt
+
+from app.config import config
+
+# MCP logging levels, lowest first
+LEVELS = (
+    "debug",
+    "info",
+    "notice",
+    "warning",
+    "error",
+    "critical",
+    "alert",
+    "emergency",
+)
+
+# loguru severity of WARNING; records at or above it are never sampled out
+_WARNING_NO = 30
+
+
+class InfoSampler:
+    """loguru filter keeping one in every N DEBUG/INFO records per call site."""
+
+    def __init__(self, keep_every: int) -> None:
+        """Create a sampler.
+
+        Args:
+            keep_every: Keep the first of every keep_every records from each
+                call site; 1 keeps everything.
+
+        """
+        self.keep_every = max(1, keep_every)
+        self._counts: dict[tuple[str | None, int], int] = {}
+
+    def __call__(self, record: Mapping[str, Any]) -> bool:
+        """Decide whether to keep a record."""
+        if self.keep_every == 1 or record["level"].no >= _WARNING_NO:
+            return True
+        site = (record["name"], record["line"])
+        count = self._counts.get(site, 0)
+        self._counts[site] = count + 1
+        return count % self.keep_every == 0
+
+
+def configure_file_logging(path: Path) -> int:
+    """Add the server log file as a background, sampled loguru sink.
+
+    Args:
+        path: The log file; its directory is created if needed.
+
+    Returns:
+        int: The loguru sink ID.
+
+    """
+    path.parent.mkdir(exist_ok=True)
+    return logger.add(
+        path,
+        rotation="1 MB",
+        retention="1 week",
+        enqueue=True,
+        filter=InfoSampler(config.log_info_sample_every),
+    )
+
+
+class CallLogMiddleware(Middleware):
+    """Coalesce a tool call's context log messages into one MCP log message."""
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mt.CallToolRequestParams],
+        call_next: CallNext[mt.CallToolRequestParams, Any],
+    ) -> Any:
+        """Buffer ``ctx.log`` messages during the call and send them at the end."""
+        ctx = context.fastmcp_context
+        if ctx is None:
+            return await call_next(context)
+
+        level = config.tool_log_level.lower()
+        threshold = LEVELS.index(level) if level in LEVELS else len(LEVELS)
+        messages: list[dict[str, str]] = []
+
+        async def buffered_log(
+            message: str,
+            level: mt.LoggingLevel | None = None,
+            logger_name: str | None = None,
+            extra: Mapping[str, Any] | None = None,
+        ) -> None:
+            level = level or "info"
+            if LEVELS.index(level) >= threshold:
+                messages.append({"level": level, "message": message})
+
+        # Tools log through ctx.info/ctx.error, which all call ctx.log; this
+        # context object belongs to this call only
+        send_log = ctx.log
+        ctx.log = buffered_log  # type: ignore[method-assign]
+        start = time.perf_counter()
+        try:
+            return await call_next(context)
+        finally:
+            del ctx.log
+            if messages:
+                tool = context.message.name
+                highest = max((m["level"] for m in messages), key=LEVELS.index)
+                try:
+                    await send_log(
+                        messages[-1]["message"],
+                        level=highest,  # type: ignore[arg-type]
+                        logger_name=tool,
+                        extra={
+                            "tool": tool,
+                            "duration_ms": round(
+                                (time.perf_counter() - start) * 1000, 1
+                            ),
+                            "messages": messages,
+                        },
+                    )
+                except (
+                    anyio.BrokenResourceError,
+                    anyio.ClosedResourceError,
+                    ValueError,
+                ) as e:
+                    # The client may be gone; never mask the tool's own outcome
+                    logger.debug(f"Could not send log messages for {tool}: {e}")
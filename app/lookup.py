@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""Client for the CourtListener ``citation-lookup/`` endpoint.
+
+The endpoint accepts a block of text, finds the citations in it, and returns
+one result object per citation found, including the offsets of that citation
+within the submitted text. CourtListener caps each request both by text length
+and by number of citations, so large lookups are packed into chunks that
+respect those limits, sent concurrently under the shared rate limiter, and the
+per-citation results are mapped back to the submitted citations by offset.
+
+Outcomes are cached on the citation's normalized key: found citations for a
+long time, "not found" and invalid citations for a shorter time, and errors not
+at all. Set ``CITATION_LOOKUP_CACHE_PATH`` to persist the cache across restarts;
+outcomes are also shared with other workers and replicas through the
+configured cache backend (see app/cache_backend.py).
+Citations in the offline citation index (``CITATION_INDEX_PATH``) never reach
+the API at all.
+"""
+
+import asyncio
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+import httpx
+from loguru import logger
+
+from app.cache import LRUCache, PersistentStore, register_cache
+from app.cache_backend import SharedCache
+from app.citation_index import get_citation_index
+from app.config import config, get_auth_headers
+from app.ratelimit import rate_limiter
+from app.speedups import json_loads
+from app.timing import phase
+from app.tracing import record_response, span
+
+# Separator placed between citations packed into one lookup request
+_SEPARATOR = "\n"
+
+
+@dataclass
+class LookupChunk:
+    """A group of citations submitted together in one lookup request.
+
+    Attributes:
+        citations: The citation strings in this chunk.
+        text: The request text (citations joined by newlines).
+        starts: Offset of each citation within text.
+
+    """
+
+    citations: list[str] = field(default_factory=list)
+    text: str = ""
+    starts: list[int] = field(default_factory=list)
+
+    def add(self, citation: str) -> None:
+        """Append a citation to the chunk text."""
+        if self.citations:
+            self.text += _SEPARATOR
+        self.starts.append(len(self.text))
+        self.citations.append(citation)
+        self.text += citation
+
+
+@dataclass
+class LookupOutcome:
+    """Lookup result for a single submitted citation.
+
+    Attributes:
+        status: Upstream status for the citation (200 found, 300 ambiguous,
+            400 invalid, 404 not found, 429 over the citation limit), the HTTP
+            status of a failed request, or None if the request never completed.
+        results: Upstream result objects that matched this citation.
+        error: Error message, if the lookup failed or found nothing.
+        request_failed: Whether the upstream request itself failed, as opposed
+            to completing with a per-citation status.
+
+    """
+
+    status: int | None
+    results: list[dict[str, Any]] = field(default_factory=list)
+    error: str | None = None
+    request_failed: bool = False
+
+    @property
+    def found(self) -> bool:
+        """Whether the citation resolved to at least one cluster."""
+        return self.status == 200
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the outcome as a JSON-serializable dictionary."""
+        return {"status": self.status, "results": self.results, "error": self.error}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LookupOutcome":
+        """Rebuild an outcome from its to_dict() form."""
+        return cls(
+            status=data.get("status"),
+            results=data.get("results") or [],
+            error=data.get("error"),
+        )
+
+
+def pack_chunks(
+    citations: list[str],
+    max_citations: int | None = None,
+    max_chars: int | None = None,
+) -> list[LookupChunk]:
+    """Pack citations into request-sized chunks, preserving order.
+
+    Args:
+        citations: Citation strings to pack.
+        max_citations: Maximum citations per chunk (defaults to config).
+        max_chars: Maximum text length per chunk (defaults to config).
+
+    Returns:
+        list[LookupChunk]: Chunks that each respect both limits. A single
+            citation longer than max_chars is placed in a chunk of its own.
+
+    """
+    max_citations = max_citations or config.citation_lookup_max_citations
+    max_chars = max_chars or config.citation_lookup_max_chars
+
+    chunks: list[LookupChunk] = []
+    current = LookupChunk()
+    for citation in citations:
+        added_length = len(citation) + (len(_SEPARATOR) if current.citations else 0)
+        if current.citations and (
+            len(current.citations) >= max_citations
+            or len(current.text) + added_length > max_chars
+        ):
+            chunks.append(current)
+            current = LookupChunk()
+        current.add(citation)
+    if current.citations:
+        chunks.append(current)
+    return chunks
+
+
+async def post_citation_lookup(
+    http_client: httpx.AsyncClient,
+    text: str,
+    timeout: float | None = None,
+) -> Any:
+    """Submit text to the citation-lookup endpoint under the rate limiter.
+
+    Args:
+        http_client: The HTTP client to use.
+        text: The text to look up.
+        timeout: Optional request timeout override, in seconds.
+
+    Returns:
+        The decoded JSON response.
+
+    Raises:
+        ValueError: If COURT_LISTENER_API_KEY is not found in environment variables.
+        httpx.HTTPStatusError: If the API request fails.
+
+    """
+    headers = get_auth_headers()
+    if timeout is None:
+        timeout = config.courtlistener_timeout
+    with span(
+        "courtlistener.citation_lookup", {"citation_lookup.chars": len(text)}
+    ) as current:
+        async with rate_limiter:
+            response = await http_client.post(
+                f"{config.courtlistener_base_url}citation-lookup/",
+                headers=headers,
+                data={"text": text},
+                timeout=timeout,
+            )
+        record_response(current, response)
+        response.raise_for_status()
+        with span("json.decode"), phase("json_decode"):
+            return json_loads(response.content)
+
+
+def _assign_results(
+    chunk: LookupChunk, items: list[dict[str, Any]]
+) -> list[list[dict[str, Any]]]:
+    """Map upstream result objects back to the chunk's citations.
+
+    Results are matched by ``start_index`` when present, falling back to
+    comparing the result's citation text with the submitted citation.
+    """
+    if len(chunk.citations) == 1:
+        return [list(items)]
+
+    assigned: list[list[dict[str, Any]]] = [[] for _ in chunk.citations]
+    for item in items:
+        start = item.get("start_index")
+        if isinstance(start, int) and 0 <= start < len(chunk.text):
+            assigned[bisect_right(chunk.starts, start) - 1].append(item)
+            continue
+        cited = item.get("citation")
+        normalized = item.get("normalized_citations") or []
+        for index, citation in enumerate(chunk.citations):
+            if cited == citation or citation in normalized:
+                assigned[index].append(item)
+                break
+    return assigned
+
+
+def _outcome(items: list[dict[str, Any]]) -> LookupOutcome:
+    """Summarize the upstream results for one citation."""
+    if not items:
+        return LookupOutcome(status=404, error="Citation not found in lookup response")
+    # Results without a status are treated as matches
+    statuses = [item.get("status", 200) for item in items]
+    status = 200 if 200 in statuses else statuses[0]
+    error = None if status == 200 else items[0].get("error_message") or None
+    return LookupOutcome(status=status, results=items, error=error)
+
+
+async def lookup_citations(
+    http_client: httpx.AsyncClient,
+    citations: list[str],
+) -> list[LookupOutcome]:
+    """Look up citations in as many concurrent chunked requests as needed.
+
+    Args:
+        http_client: The HTTP client to use.
+        citations: Citation strings to look up (already deduplicated).
+
+    Returns:
+        list[LookupOutcome]: One outcome per citation, in input order.
+
+    Raises:
+        ValueError: If COURT_LISTENER_API_KEY is not found in environment variables.
+        Exception: The first request error, if every chunk failed.
+
+    """
+    chunks = pack_chunks(citations)
+    # Batch requests make upstream parse more text, so allow them longer
+    timeout = (
+        config.courtlistener_timeout * 2
+        if len(chunks) > 1 or len(citations) > 1
+        else None
+    )
+    responses = await asyncio.gather(
+        *(post_citation_lookup(http_client, chunk.text, timeout) for chunk in chunks),
+        return_exceptions=True,
+    )
+
+    errors = [r for r in responses if isinstance(r, BaseException)]
+    if errors and len(errors) == len(responses):
+        raise errors[0]
+
+    outcomes: list[LookupOutcome] = []
+    for chunk, response in zip(chunks, responses, strict=True):
+        if isinstance(response, httpx.HTTPStatusError):
+            status = response.response.status_code
+            failed = LookupOutcome(
+                status=status, error=str(response), request_failed=True
+            )
+            outcomes += [failed] * len(chunk.citations)
+        elif isinstance(response, BaseException):
+            failed = LookupOutcome(
+                status=None, error=str(response), request_failed=True
+            )
+            outcomes += [failed] * len(chunk.citations)
+        else:
+            items = response if isinstance(response, list) else []
+            outcomes += [_outcome(found) for found in _assign_results(chunk, items)]
+    return outcomes
+
+
+# In-memory lookup outcomes keyed on normalized citation
+lookup_cache: LRUCache[str, LookupOutcome] = LRUCache(config.citation_lookup_cache_size)
+register_cache("citation_lookup", lookup_cache)
+shared_lookups = SharedCache("citation_lookup")
+
+
+@lru_cache(maxsize=1)
+def get_lookup_store() -> PersistentStore | None:
+    """Get the persistent lookup store, if a cache path is configured.
+
+    Returns:
+        The store, or None when CITATION_LOOKUP_CACHE_PATH is unset.
+
+    """
+    if not config.citation_lookup_cache_path:
+        return None
+    logger.info(f"Persisting citation lookups to {config.citation_lookup_cache_path}")
+    return PersistentStore(config.citation_lookup_cache_path, "citation_lookup")
+
+
+def _cache_ttl(outcome: LookupOutcome) -> int | None:
+    """Get how long an outcome may be cached, or None if it must not be."""
+    if outcome.request_failed:
+        return None
+    if outcome.status in (200, 300):
+        return config.citation_lookup_cache_ttl
+    if outcome.status in (400, 404):
+        return config.citation_lookup_negative_ttl
+    # Request errors and upstream throttling (429) are transient
+    return None
+
+
+async def get_cached_outcomes(keys: list[str]) -> dict[str, LookupOutcome]:
+    """Get cached outcomes from memory, falling back to the persistent store.
+
+    The store is read in a worker thread, since it may wait on another
+    process writing to the same file.
+
+    Args:
+        keys: Normalized citation keys.
+
+    Returns:
+        dict[str, LookupOutcome]: The outcomes found, by key.
+
+    """
+    outcomes: dict[str, LookupOutcome] = {}
+    for key in keys:
+        outcome: LookupOutcome | None = lookup_cache.get(key)
+        if outcome is not None:
+            outcomes[key] = outcome
+
+    store = get_lookup_store()
+    misses = [key for key in keys if key not in outcomes]
+    if store is None or not misses:
+        return outcomes
+    for key, data in (await asyncio.to_thread(store.get_many, misses)).items():
+        outcome = outcomes[key] = LookupOutcome.from_dict(data)
+        # Promote to memory; the store still enforces the original expiry
+        lookup_cache.put(key, outcome, ttl=_cache_ttl(outcome))
+    return {key: outcomes[key] for key in keys if key in outcomes}
+
+
+async def cache_outcomes(outcomes: dict[str, LookupOutcome]) -> None:
+    """Cache the cacheable outcomes in memory and, if configured, on disk.
+
+    Args:
+        outcomes: Outcomes keyed on normalized citation.
+
+    """
+    store = get_lookup_store()
+    persisted: list[tuple[str, Any, float | None]] = []
+    for key, outcome in outcomes.items():
+        ttl = _cache_ttl(outcome)
+        if ttl is None:
+            continue
+        lookup_cache.put(key, outcome, ttl=ttl)
+        persisted.append((key, outcome.to_dict(), ttl))
+    if store is not None and persisted:
+        await asyncio.to_thread(store.put_many, persisted)
+
+
+async def get_shared_outcomes(keys: list[str]) -> dict[str, LookupOutcome]:
+    """Get outcomes cached by other workers or replicas, promoting them to memory.
+
+    Args:
+        keys: Normalized citation keys missing from the local caches.
+
+    Returns:
+        dict[str, LookupOutcome]: The outcomes found, by key.
+
+    """
+    outcomes = {}
+    for key, data in (await shared_lookups.get_many(keys)).items():
+        outcome = outcomes[key] = LookupOutcome.from_dict(data)
+        lookup_cache.put(key, outcome, ttl=_cache_ttl(outcome))
+    return outcomes
+
+
+async def share_outcomes(outcomes: dict[str, LookupOutcome]) -> None:
+    """Share the cacheable outcomes with other workers and replicas.
+
+    Args:
+        outcomes: Outcomes keyed on normalized citation.
+
+    """
+    await shared_lookups.put_many(
+        (key, outcome.to_dict(), ttl)
+        for key, outcome in outcomes.items()
+        if (ttl := _cache_ttl(outcome)) is not None
+    )
+
+
+def _offline_outcome(key: str, cluster_ids: list[int]) -> LookupOutcome:
+    """Build a lookup outcome, shaped like the API's, from an offline index hit."""
+    item: dict[str, Any] = {
+        "citation": key,
+        "normalized_citations": [key],
+        "start_index": 0,
+        "end_index": len(key),
+        # The API reports 300 when a citation matches several clusters
+        "status": 200 if len(cluster_ids) == 1 else 300,
+        "error_message": "",
+        "clusters": [
+            {
+                "id": cluster_id,
+                "resource_uri": f"{config.courtlistener_base_url}clusters/{cluster_id}/",
+            }
+            for cluster_id in cluster_ids
+        ],
+        "source": "offline_index",
+    }
+    return LookupOutcome(status=item["status"], results=[item])
+
+
+def resolve_offline(keys: list[str]) -> dict[str, LookupOutcome]:
+    """Resolve citations from the offline citation index, if one is configured.
+
+    Args:
+        keys: Normalized citation keys.
+
+    Returns:
+        Outcomes for the keys found in the index.
+
+    """
+    index = get_citation_index()
+    if index is None:
+        return {}
+    found = {}
+    for key in keys:
+        cluster_ids = index.resolve(key)
+        if cluster_ids:
+            found[key] = _offline_outcome(key, cluster_ids)
+    return found
+
+
+@dataclass
+class ResolvedCitations:
+    """Outcomes of a cached lookup of several citations.
+
+    Attributes:
+        outcomes: Outcome for each normalized citation key, in input order.
+        cached_keys: Keys that were answered from the cache.
+        offline_keys: Keys that were answered from the offline citation index.
+        requests: Number of upstream requests made for the remaining keys.
+
+    """
+
+    outcomes: dict[str, LookupOutcome]
+    cached_keys: frozenset[str] = frozenset()
+    offline_keys: frozenset[str] = frozenset()
+    requests: int = 0
+
+    @property
+    def cached(self) -> int:
+        """Number of keys answered from the cache."""
+        return len(self.cached_keys)
+
+
+async def resolve_citations(
+    http_client: httpx.AsyncClient,
+    keys: list[str],
+) -> ResolvedCitations:
+    """Look up normalized citations, sending only local misses upstream.
+
+    Each key is answered from the lookup cache, then the offline citation
+    index, then the cache shared with other workers and replicas, and only
+    then from the citation-lookup API.
+
+    Args:
+        http_client: The HTTP client to use.
+        keys: Normalized citation keys (already deduplicated).
+
+    Returns:
+        ResolvedCitations: One outcome per key, with cache and request counts.
+
+    Raises:
+        ValueError: If COURT_LISTENER_API_KEY is not found in environment variables.
+        Exception: The first request error, if every upstream request failed.
+
+    """
+    with span("citation_lookup.cache", {"citation_lookup.keys": len(keys)}) as current:
+        with phase("cache_lookup"):
+            cached = await get_cached_outcomes(keys)
+            offline = resolve_offline([key for key in keys if key not in cached])
+        shared = await get_shared_outcomes(
+            [key for key in keys if key not in cached and key not in offline]
+        )
+        cached.update(shared)
+        misses = [key for key in keys if key not in cached and key not in offline]
+        current.set_attributes(
+            {
+                "cache.hits": len(cached),
+                "cache.shared_hits": len(shared),
+                "citation_lookup.offline": len(offline),
+                "cache.misses": len(misses),
+            }
+        )
+
+    fetched: dict[str, LookupOutcome] = {}
+    if misses:
+        fetched = dict(
+            zip(misses, await lookup_citations(http_client, misses), strict=True)
+        )
+        await cache_outcomes(fetched)
+        await share_outcomes(fetched)
+
+    found = {**cached, **offline, **fetched}
+    return ResolvedCitations(
+        outcomes={key: found[key] for key in keys},
+        cached_keys=frozenset(cached),
+        offline_keys=frozenset(offline),
+        requests=len(pack_chunks(misses)),
+    )
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Event loop lag and slow callback detection.
+
+An opt-in instrumentation mode (``LOOP_MONITOR_ENABLED``) for finding code
+that blocks the event loop, such as synchronous citeurl calls or disk-bound
+logging inside async tools:
+
+- a monitor task wakes up every ``LOOP_MONITOR_INTERVAL`` seconds and records
+  how late each wakeup ran as event loop lag;
+- a watchdog thread notices when the monitor has not woken up for longer than
+  ``LOOP_SLOW_CALLBACK_THRESHOLD`` seconds, and captures the stack of the
+  event loop thread and the tool whose task is running at that moment.
+
+Lag and stalls are exported as Prometheus metrics and reported by the
+``event_loop_diagnostics`` tool.
+"""
+
+import asyncio
+from collections import Counter, deque
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+import sys
+import threading
+import time
+import traceback
+from typing import Any
+import weakref
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from loguru import logger
+import mcp.types as mt
+
+from app.background import SharedTask
+from app.config import config
+from app.metrics import loop_lag, slow_callbacks
+
+# Frames kept from the blocked stack, innermost last
+STACK_LIMIT = 25
+
+
+@dataclass
+class SlowCallback:
+    """One stall of the event loop.
+
+    Attributes:
+        detected_at: When the watchdog noticed the stall (ISO 8601, UTC).
+        blocked_seconds: How long the loop was blocked; updated when it
+            resumes, so it is a lower bound while the stall is ongoing.
+        tool: The tool whose task was running, or None if not in a tool call.
+        task: Name of the running asyncio task, if any.
+        stack: Stack of the event loop thread when the stall was detected.
+
+    """
+
+    detected_at: str
+    blocked_seconds: float
+    tool: str | None
+    task: str | None
+    stack: list[str]
+
+
+# Tool name for each task currently running a tool call
+_task_tools: "weakref.WeakKeyDictionary[asyncio.Task[Any], str]" = (
+    weakref.WeakKeyDictionary()
+)
+# Completed tool calls by tool name
+_completed: Counter[str] = Counter()
+
+
+def tool_for_task(task: "asyncio.Task[Any] | None") -> str | None:
+    """Get the tool a task is running.
+
+    Args:
+        task: An asyncio task, e.g. from ``asyncio.current_task(loop)``.
+
+    Returns:
+        The tool name, or None if the task is not running a tool call.
+
+    """
+    return _task_tools.get(task) if task is not None else None
+
+
+def completed_calls(tool: str | None = None) -> int:
+    """Count tool calls completed since the server started.
+
+    Args:
+        tool: Only count calls of this tool; None counts every tool.
+
+    Returns:
+        int: The number of completed calls.
+
+    """
+    return _completed[tool] if tool is not None else _completed.total()
+
+
+class ToolTaskMiddleware(Middleware):
+    """FastMCP middleware tracking which tool each task is running.
+
+    Used to attribute event loop stalls and profiler samples to tools, and to
+    count completed calls so a profile can stop after N calls.
+    """
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mt.CallToolRequestParams],
+        call_next: CallNext[mt.CallToolRequestParams, Any],
+    ) -> Any:
+        """Tag the current task with the tool name for the duration of the call."""
+        tool = context.message.name
+        task = asyncio.current_task()
+        previous = tool_for_task(task)
+        if task is not None:
+            _task_tools[task] = tool
+        try:
+            return await call_next(context)
+        finally:
+            _completed[tool] += 1
+            if task is not None and previous is None:
+                _task_tools.pop(task, None)
+            elif task is not None and previous is not None:
+                _task_tools[task] = previous
+
+
+class LoopMonitor:
+    """Measures event loop lag and records stalls with their stacks."""
+
+    def __init__(self, interval: float, threshold: float, history: int = 50) -> None:
+        """Create a monitor.
+
+        Args:
+            interval: Seconds between the monitor task's wakeups.
+            threshold: Stalls longer than this many seconds are recorded.
+            history: Number of recent lag samples and stalls to keep.
+
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self._lags: deque[float] = deque(maxlen=history)
+        self._stalls: deque[SlowCallback] = deque(maxlen=history)
+        self._max_lag = 0.0
+        self._heartbeat = time.perf_counter()
+        self._pending: SlowCallback | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def _capture(self, blocked: float) -> SlowCallback:
+        """Describe what the event loop thread is doing right now."""
+        frame = (
+            sys._current_frames().get(self._loop_thread)
+            if self._loop_thread is not None
+            else None
+        )
+        stack = traceback.format_stack(frame, limit=STACK_LIMIT) if frame else []
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        return SlowCallback(
+            detected_at=datetime.now(UTC).isoformat(),
+            blocked_seconds=round(blocked, 4),
+            tool=tool_for_task(task),
+            task=task.get_name() if task is not None else None,
+            stack=[line.rstrip() for line in stack],
+        )
+
+    def _watch(self) -> None:
+        """Watchdog thread: detect wakeups that are overdue by the threshold."""
+        while not self._stop.wait(self.threshold / 2):
+            with self._lock:
+                blocked = time.perf_counter() - self._heartbeat - self.interval
+                if blocked < self.threshold or self._pending is not None:
+                    continue
+                stall = self._capture(blocked)
+                self._pending = stall
+                self._stalls.append(stall)
+            slow_callbacks.inc(stall.tool or "")
+            where = stall.stack[-1].strip() if stall.stack else "unknown location"
+            logger.warning(
+                f"Event loop blocked for over {blocked * 1000:.0f}ms "
+                f"(tool: {stall.tool or 'none'}) at {where}"
+            )
+
+    def _beat(self, lag: float) -> None:
+        """Record one wakeup of the monitor task."""
+        loop_lag.observe(lag)
+        with self._lock:
+            self._heartbeat = time.perf_counter()
+            self._lags.append(lag)
+            self._max_lag = max(self._max_lag, lag)
+            if self._pending is not None:
+                self._pending.blocked_seconds = round(lag, 4)
+                self._pending = None
+
+    async def run(self) -> None:
+        """Measure loop lag until cancelled, with a watchdog thread alongside."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stop.clear()
+        watchdog = threading.Thread(
+            target=self._watch, name="loop-monitor-watchdog", daemon=True
+        )
+        watchdog.start()
+        try:
+            while True:
+                start = time.perf_counter()
+                await asyncio.sleep(self.interval)
+                self._beat(max(0.0, time.perf_counter() - start - self.interval))
+        finally:
+            self._stop.set()
+
+    def report(self) -> dict[str, Any]:
+        """Summarize recent lag and stalls.
+
+        Returns:
+            dict[str, Any]: Lag statistics in milliseconds and the recent
+            stalls, most recent first.
+
+        """
+        with self._lock:
+            lags = sorted(self._lags)
+            stalls = [asdict(stall) for stall in reversed(self._stalls)]
+            max_lag = self._max_lag
+        return {
+            "interval_ms": round(self.interval * 1000, 1),
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "lag_ms": {
+                "samples": len(lags),
+                "median": round(lags[len(lags) // 2] * 1000, 2) if lags else None,
+                "p99": round(lags[int(len(lags) * 0.99)] * 1000, 2) if lags else None,
+                "max": round(max_lag * 1000, 2),
+            },
+            "slow_callbacks": stalls,
+        }
+
+
+# Shared monitor, run once per process while the server is up, when enabled
+monitor = LoopMonitor(config.loop_monitor_interval, config.loop_slow_callback_threshold)
+monitoring = SharedTask("loop-monitor", monitor.run)
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""Prometheus metrics for CourtListener MCP Server.
+
+Counters and histograms are updated in-process with a dictionary lookup and a
+lock per observation, so instrumentation stays cheap on the hot path. Gauges
+that describe shared state (cache hit ratios, rate limiter queue depth,
+connection pool usage) are read only when the metrics are scraped.
+
+``render`` produces the Prometheus text exposition format; the server serves
+it at ``/metrics`` on the HTTP and SSE transports. The module has no
+dependency on ``prometheus_client``.
+"""
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+import threading
+import time
+from typing import Any
+import weakref
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+import httpx
+import mcp.types as mt
+
+from app.cache import get_cache_stats
+from app.config import config
+from app.ratelimit import rate_limiter
+
+PREFIX = "courtlistener_mcp_"
+
+# Upper bounds (seconds) for latency histograms: 5ms to 60s
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    """Format a label set, e.g. ``{tool="status",outcome="ok"}``."""
+    pairs = [
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    """Format a sample value."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing counter with optional labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()) -> None:
+        """Create a counter.
+
+        Args:
+            name: Metric name, without the common prefix.
+            documentation: Help text.
+            labelnames: Names of the labels, in the order values are passed.
+
+        """
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Add amount to the counter for the given label values."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        """Return the current value for the given label values."""
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def collect(self) -> list[str]:
+        """Render the counter in the text exposition format."""
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        lines += [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+            for labels, value in values
+        ]
+        return lines
+
+
+class Histogram:
+    """A latency histogram with fixed buckets and optional labels."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        """Create a histogram.
+
+        Args:
+            name: Metric name, without the common prefix.
+            documentation: Help text.
+            labelnames: Names of the labels, in the order values are passed.
+            buckets: Sorted bucket upper bounds; +Inf is added automatically.
+
+        """
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Per label set: [count per bucket (last is +Inf), sum]
+        self._values: dict[Labels, tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation for the given label values."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        """Return the number of observations for the given label values."""
+        with self._lock:
+            entry = self._values.get(labels)
+            return sum(entry[0]) if entry else 0
+
+    def collect(self) -> list[str]:
+        """Render the histogram in the text exposition format."""
+        with self._lock:
+            values = sorted(
+                (labels, (list(c), s[0])) for labels, (c, s) in self._values.items()
+            )
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        bounds = [*self.buckets, float("inf")]
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(bounds, counts, strict=True):
+                cumulative += count
+                le = _labels(self.labelnames, labels, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            suffix = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_number(total)}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """A gauge whose samples are computed by a callback at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], dict[Labels, float]],
+        labelnames: Labels = (),
+        metric_type: str = "gauge",
+    ) -> None:
+        """Create a gauge.
+
+        Args:
+            name: Metric name, without the common prefix.
+            documentation: Help text.
+            callback: Returns the current value for each label set.
+            labelnames: Names of the labels, in the order of the callback's keys.
+            metric_type: Type reported to Prometheus; "counter" for callbacks
+                that read counters kept elsewhere.
+
+        """
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelnames = labelnames
+        self.metric_type = metric_type
+
+    def collect(self) -> list[str]:
+        """Render the gauge in the text exposition format."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        lines += [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+            for labels, value in sorted(self.callback().items())
+        ]
+        return lines
+
+
+tool_calls = Counter(
+    "tool_calls_total", "MCP tool calls by tool and outcome.", ("tool", "outcome")
+)
+tool_duration = Histogram(
+    "tool_duration_seconds", "MCP tool call latency in seconds.", ("tool",)
+)
+upstream_duration = Histogram(
+    "upstream_request_duration_seconds",
+    "CourtListener API response latency in seconds, by endpoint and HTTP status.",
+    ("endpoint", "status"),
+)
+citeurl_cpu = Counter(
+    "citeurl_cpu_seconds_total",
+    "Thread CPU time spent in citeurl, by operation.",
+    ("operation",),
+)
+loop_lag = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop monitor's scheduled wakeups ran.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+slow_callbacks = Counter(
+    "event_loop_slow_callbacks_total",
+    "Event loop stalls longer than the slow callback threshold, by tool.",
+    ("tool",),
+)
+
+
+@contextmanager
+def citeurl_cpu_time(operation: str) -> Iterator[None]:
+    """Add the thread CPU time of the block to ``citeurl_cpu``.
+
+    Args:
+        operation: Label for the citeurl work, e.g. "parse" or "extract".
+
+    """
+    start = time.thread_time()
+    try:
+        yield
+    finally:
+        citeurl_cpu.inc(operation, amount=time.thread_time() - start)
+
+
+def _base_path() -> str:
+    """Path of the configured CourtListener API base URL."""
+    return httpx.URL(config.courtlistener_base_url).path
+
+
+def _endpoint(request: httpx.Request) -> str:
+    """Label a request by its API endpoint, e.g. "opinions" or "search"."""
+    base = _base_path()
+    path = request.url.path
+    if not path.startswith(base):
+        return "other"
+    return path[len(base) :].split("/", 1)[0] or "root"
+
+
+async def _on_request(request: httpx.Request) -> None:
+    """httpx request hook: note when the request was sent."""
+    request.extensions["metrics_start"] = time.perf_counter()
+
+
+async def _on_response(response: httpx.Response) -> None:
+    """httpx response hook: record latency until the response headers arrived."""
+    start = response.request.extensions.get("metrics_start")
+    if start is not None:
+        upstream_duration.observe(
+            time.perf_counter() - start,
+            _endpoint(response.request),
+            str(response.status_code),
+        )
+
+
+# Clients whose connection pools are reported; dropped once closed and freed
+_clients: "weakref.WeakSet[httpx.AsyncClient]" = weakref.WeakSet()
+
+
+def instrument_http_client(client: httpx.AsyncClient) -> httpx.AsyncClient:
+    """Record upstream latency and pool usage for a client.
+
+    Args:
+        client: A client used for CourtListener API requests.
+
+    Returns:
+        httpx.AsyncClient: The same client, for chaining.
+
+    """
+    client.event_hooks["request"].append(_on_request)
+    client.event_hooks["response"].append(_on_response)
+    _clients.add(client)
+    return client
+
+
+def http_pool_usage() -> dict[str, int]:
+    """Count open connections and connection limits across instrumented clients.
+
+    Returns:
+        dict[str, int]: Active and idle connections, and the maximum allowed.
+
+    """
+    usage = {"active": 0, "idle": 0, "max": 0}
+    for client in list(_clients):
+        if client.is_closed:
+            continue
+        # httpx does not expose pool statistics; read them from httpcore
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        if pool is None:
+            continue
+        usage["max"] += getattr(pool, "_max_connections", 0) or 0
+        for connection in pool.connections:
+            usage["idle" if connection.is_idle() else "active"] += 1
+    return usage
+
+
+def _cache_stat(field: str) -> Callable[[], dict[Labels, float]]:
+    """Build a callback reading one statistic from every registered cache."""
+
+    def callback() -> dict[Labels, float]:
+        return {(name,): stats[field] for name, stats in get_cache_stats().items()}
+
+    return callback
+
+
+_metrics: list[Counter | Histogram | Gauge] = [
+    tool_calls,
+    tool_duration,
+    upstream_duration,
+    Gauge(
+        "http_pool_connections",
+        "Open CourtListener API connections by state.",
+        lambda: {
+            (state,): count
+            for state, count in http_pool_usage().items()
+            if state != "max"
+        },
+        ("state",),
+    ),
+    Gauge(
+        "http_pool_max_connections",
+        "Maximum CourtListener API connections.",
+        lambda: {(): http_pool_usage()["max"]},
+    ),
+    Gauge(
+        "rate_limiter_waiting",
+        "Requests queued for an upstream rate limiter slot.",
+        lambda: {(): rate_limiter.waiting},
+    ),
+    Gauge(
+        "rate_limiter_in_flight",
+        "Upstream requests holding a rate limiter slot.",
+        lambda: {(): rate_limiter.in_flight},
+    ),
+    Gauge(
+        "cache_hits_total",
+        "Cache lookups that found an entry.",
+        _cache_stat("hits"),
+        ("cache",),
+        "counter",
+    ),
+    Gauge(
+        "cache_misses_total",
+        "Cache lookups that did not find an entry.",
+        _cache_stat("misses"),
+        ("cache",),
+        "counter",
+    ),
+    Gauge(
+        "cache_hit_ratio",
+        "Fraction of cache lookups that were hits.",
+        _cache_stat("hit_rate"),
+        ("cache",),
+    ),
+    Gauge(
+        "cache_entries",
+        "Entries currently in each cache.",
+        _cache_stat("size"),
+        ("cache",),
+    ),
+    citeurl_cpu,
+    loop_lag,
+    slow_callbacks,
+]
+
+
+def render() -> str:
+    """Render every metric in the Prometheus text exposition format.
+
+    Returns:
+        str: The exposition, ending with a newline.
+
+    """
+    lines: list[str] = []
+    for metric in _metrics:
+        lines += metric.collect()
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware(Middleware):
+    """FastMCP middleware recording the count and latency of each tool call.
+
+    Calls to tools the server does not have are labelled "unknown", so
+    clients cannot add a series per made-up tool name.
+    """
+
+    def __init__(self) -> None:
+        """Create the middleware with an empty set of known tool names."""
+        self._known: set[str] = set()
+
+    async def _tool_label(self, context: MiddlewareContext[Any]) -> str:
+        """Get the label for the called tool, "unknown" if it is not registered."""
+        name = context.message.name
+        if name in self._known:
+            return name
+        # Only new or made-up names get here; refresh the registered names
+        if context.fastmcp_context is not None:
+            tools = await context.fastmcp_context.fastmcp.get_tools()
+            self._known = set(tools)
+        return name if name in self._known else "unknown"
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mt.CallToolRequestParams],
+        call_next: CallNext[mt.CallToolRequestParams, Any],
+    ) -> Any:
+        """Time the tool call and count it as ok, or error if it raised."""
+        tool = await self._tool_label(context)
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await call_next(context)
+            outcome = "ok"
+            return result
+        finally:
+            tool_duration.observe(time.perf_counter() - start, tool)
+            tool_calls.inc(tool, outcome)
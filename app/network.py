@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Citation network expansion.
+
+``build_network`` walks the citation graph breadth-first from one or more
+opinions (or the opinions of one or more clusters): what does this opinion
+cite, and what do those cite, down to a configurable depth.
+
+Each opinion's outgoing citations come from its ``opinions_cited`` field when
+CourtListener has populated it. Otherwise the opinion text is run through the
+citation extraction and lookup pipeline and the matched clusters are mapped
+back to their opinions. Expanded opinions are cached across calls, fetches go
+through the shared response cache and rate limiter, and a per-call
+concurrency cap and node budget keep large graphs bounded.
+"""
+
+import asyncio
+from dataclasses import dataclass
+import html
+import re
+from typing import Any
+
+import httpx
+from loguru import logger
+
+from app.api import get_resource
+from app.cache import LRUCache, register_cache
+from app.config import config
+from app.lookup import resolve_citations
+from app.pipeline import extract_document_citations
+
+_TAG = re.compile(r"<[^>]+>")
+_OPINION_FIELDS = ["id", "cluster", "opinions_cited"]
+# Text fields, in order of preference, for opinions without opinions_cited
+_TEXT_FIELDS = [
+    "plain_text",
+    "html_with_citations",
+    "html",
+    "html_lawbox",
+    "html_columbia",
+    "xml_harvard",
+]
+
+
+@dataclass(frozen=True, slots=True)
+class OpinionEdges:
+    """The outgoing citations of one opinion.
+
+    Attributes:
+        opinion_id: The citing opinion.
+        cluster_id: The cluster the opinion belongs to, if known.
+        cited: IDs of the opinions it cites, in first-cited order.
+        source: "opinions_cited" or "text", depending on how edges were found.
+
+    """
+
+    opinion_id: int
+    cluster_id: int | None
+    cited: tuple[int, ...]
+    source: str
+
+
+# Expanded opinions, shared across calls
+edges_cache: LRUCache[int, OpinionEdges] = LRUCache(
+    config.citation_network_cache_size,
+    ttl=config.courtlistener_response_cache_ttl,
+)
+register_cache("citation_network", edges_cache)
+
+
+def _resource_id(value: Any, endpoint: str) -> int | None:
+    """Get a record ID from an API URL (or a bare ID)."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        if value.isdigit():
+            return int(value)
+        match = re.search(rf"/{endpoint}/(\d+)/?$", value)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def _opinion_ids(values: Any) -> list[int]:
+    """Get opinion IDs from a list of opinion URLs, dropping duplicates."""
+    ids = (_resource_id(value, "opinions") for value in values or [])
+    return list(dict.fromkeys(i for i in ids if i is not None))
+
+
+def _opinion_text(record: dict[str, Any]) -> str:
+    """Get the best available plain text of an opinion record."""
+    for field in _TEXT_FIELDS:
+        value = record.get(field)
+        if value:
+            return (
+                value if field == "plain_text" else html.unescape(_TAG.sub(" ", value))
+            )
+    return ""
+
+
+async def _cluster_opinions(
+    http_client: httpx.AsyncClient, cluster: dict[str, Any]
+) -> list[int]:
+    """Get the opinion IDs of a cluster, fetching it if they are not included."""
+    sub_opinions = cluster.get("sub_opinions")
+    if sub_opinions is None and cluster.get("id") is not None:
+        record = await get_resource(
+            http_client, "clusters", cluster["id"], ["id", "sub_opinions"], True
+        )
+        sub_opinions = record.get("sub_opinions")
+    return _opinion_ids(sub_opinions)
+
+
+async def _cited_from_text(
+    http_client: httpx.AsyncClient, opinion_id: int
+) -> tuple[tuple[int, ...], bool]:
+    """Find the opinions an opinion cites by extracting citations from its text.
+
+    Returns the cited opinions and whether every cited cluster was resolved;
+    clusters that fail to load are skipped rather than failing the opinion.
+    """
+    record = await get_resource(http_client, "opinions", opinion_id, _TEXT_FIELDS)
+    text = _opinion_text(record)
+    if not text:
+        return (), True
+
+    extracted = await asyncio.to_thread(extract_document_citations, text)
+    authorities = list(dict.fromkeys(c.authority for c in extracted if c.is_case))
+    if not authorities:
+        return (), True
+
+    resolved = await resolve_citations(http_client, authorities)
+    clusters = [
+        cluster
+        for outcome in resolved.outcomes.values()
+        for item in outcome.results
+        for cluster in item.get("clusters") or []
+        if isinstance(cluster, dict)
+    ]
+    results = await asyncio.gather(
+        *(_cluster_opinions(http_client, cluster) for cluster in clusters),
+        return_exceptions=True,
+    )
+    opinions = []
+    for cluster, result in zip(clusters, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.warning(
+                f"Skipping cluster {cluster.get('id')} cited by opinion "
+                f"{opinion_id}: {result}"
+            )
+            continue
+        opinions.append(result)
+    complete = len(opinions) == len(results)
+    return tuple(dict.fromkeys(i for ids in opinions for i in ids)), complete
+
+
+async def expand_opinion(
+    http_client: httpx.AsyncClient, opinion_id: int
+) -> OpinionEdges:
+    """Get the outgoing citations of an opinion, using the shared cache.
+
+    Args:
+        http_client: The HTTP client to use.
+        opinion_id: The opinion to expand.
+
+    Returns:
+        OpinionEdges: The opinion's cluster and the opinions it cites.
+
+    Raises:
+        ValueError: If COURT_LISTENER_API_KEY is not found in environment variables.
+        httpx.HTTPStatusError: If fetching the opinion fails.
+
+    """
+    cached: OpinionEdges | None = edges_cache.get(opinion_id)
+    if cached is not None:
+        return cached
+
+    record = await get_resource(
+        http_client, "opinions", opinion_id, _OPINION_FIELDS, use_cache=True
+    )
+    cited = tuple(_opinion_ids(record.get("opinions_cited")))
+    source = "opinions_cited"
+    complete = True
+    if not cited:
+        cited, complete = await _cited_from_text(http_client, opinion_id)
+        source = "text"
+
+    edges = OpinionEdges(
+        opinion_id=opinion_id,
+        cluster_id=_resource_id(record.get("cluster"), "clusters"),
+        cited=tuple(i for i in cited if i != opinion_id),
+        source=source,
+    )
+    if complete:
+        # Partial edges are returned but expanded again next time
+        edges_cache.put(opinion_id, edges)
+    return edges
+
+
+async def build_network(
+    http_client: httpx.AsyncClient,
+    opinion_ids: list[int],
+    cluster_ids: list[int],
+    depth: int = 1,
+    max_nodes: int = 200,
+    max_concurrency: int = 8,
+) -> dict[str, Any]:
+    """Expand the citation network around the given opinions and clusters.
+
+    Args:
+        http_client: The HTTP client to use.
+        opinion_ids: Opinions to start from.
+        cluster_ids: Clusters whose opinions to start from.
+        depth: Number of citation hops to follow from the starting opinions.
+        max_nodes: Maximum number of opinions in the graph.
+        max_concurrency: Maximum opinions expanded at once by this call.
+
+    Returns:
+        dict[str, Any]: A dictionary containing:
+            - roots: The starting opinion IDs
+            - summary: Node, edge, truncation and error counts
+            - nodes: One entry per opinion with its cluster and depth
+            - adjacency: Citing opinion ID -> cited opinion IDs within the graph
+            - errors: Opinion ID -> error for opinions that could not be expanded
+
+    Raises:
+        ValueError: If COURT_LISTENER_API_KEY is not found in environment variables.
+        httpx.HTTPStatusError: If fetching a starting cluster fails.
+
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def expand(opinion_id: int) -> OpinionEdges:
+        async with semaphore:
+            return await expand_opinion(http_client, opinion_id)
+
+    clusters = await asyncio.gather(
+        *(
+            _cluster_opinions(http_client, {"id": cluster_id})
+            for cluster_id in cluster_ids
+        )
+    )
+    roots = list(dict.fromkeys([*opinion_ids, *(i for ids in clusters for i in ids)]))
+
+    depth_of = {opinion_id: 0 for opinion_id in roots[:max_nodes]}
+    expanded: dict[int, OpinionEdges] = {}
+    errors: dict[str, str] = {}
+    truncated = len(roots) > max_nodes
+    dropped_edges = 0
+
+    frontier = list(depth_of)
+    for level in range(depth):
+        if not frontier:
+            break
+        results = await asyncio.gather(
+            *(expand(opinion_id) for opinion_id in frontier), return_exceptions=True
+        )
+        next_frontier = []
+        for opinion_id, result in zip(frontier, results, strict=True):
+            if isinstance(result, BaseException):
+                errors[str(opinion_id)] = str(result)
+                continue
+            expanded[opinion_id] = result
+            for cited in result.cited:
+                if cited in depth_of:
+                    continue
+                if len(depth_of) >= max_nodes:
+                    truncated = True
+                    dropped_edges += 1
+                    continue
+                depth_of[cited] = level + 1
+                next_frontier.append(cited)
+        frontier = next_frontier
+
+    adjacency = {
+        str(opinion_id): [c for c in edges.cited if c in depth_of]
+        for opinion_id, edges in expanded.items()
+    }
+    return {
+        "roots": roots,
+        "summary": {
+            "nodes": len(depth_of),
+            "edges": sum(len(cited) for cited in adjacency.values()),
+            "expanded": len(expanded),
+            "expanded_from_text": sum(
+                edges.source == "text" for edges in expanded.values()
+            ),
+            "depth": depth,
+            "truncated": truncated,
+            "dropped_edges": dropped_edges,
+            "errors": len(errors),
+        },
+        "nodes": [
+            {
+                "id": opinion_id,
+                "cluster_id": expanded[opinion_id].cluster_id
+                if opinion_id in expanded
+                else None,
+                "depth": node_depth,
+            }
+            for opinion_id, node_depth in depth_of.items()
+        ],
+        "adjacency": adjacency,
+        "errors": errors,
+    }
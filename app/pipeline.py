@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""End-to-end citation resolution for whole documents.
+
+``resolve_document`` runs the usual multi-step workflow of extracting the
+citations from a document, looking them up, and fetching their clusters as
+one server-side pipeline:
+
+1. extract every citation (full, short and "id." forms) with citeurl, in a
+   worker thread;
+2. group them by authority, so ``410 U.S. 113, 120``, ``Id. at 125`` and
+   ``410 U.S. at 130`` are resolved once as ``410 U.S. 113``;
+3. resolve the case authorities with one cached, chunked batch lookup;
+4. optionally fetch metadata for clusters the lookup did not describe (e.g.
+   offline index hits), with concurrency bounded by the shared rate limiter.
+
+Only the final annotated table is returned to the caller.
+"""
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+import re
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from app.api import get_resource
+from app.citator import list_citations
+from app.lookup import LookupOutcome, resolve_citations
+
+if TYPE_CHECKING:
+    from citeurl import Citation  # type: ignore[import-untyped]
+
+_ID_FORM = re.compile(r"^(id|ibid)\b", re.IGNORECASE)
+# Tokens that identify a reported case (as opposed to a statute or rule)
+_CASE_TOKENS = ("volume", "reporter", "page")
+_CLUSTER_FIELDS = (
+    "id",
+    "case_name",
+    "date_filed",
+    "absolute_url",
+    "precedential_status",
+    "citation_count",
+)
+
+
+@dataclass
+class ExtractedCitation:
+    """One citation occurrence in a document.
+
+    Attributes:
+        text: The citation text as it appears in the document.
+        start: Offset of the first character.
+        end: Offset just past the last character.
+        form: "full", "short" or "id".
+        authority: Canonical name of the cited authority (without pincite).
+        is_case: Whether the authority is a reported case.
+
+    """
+
+    text: str
+    start: int
+    end: int
+    form: str
+    authority: str
+    is_case: bool
+
+
+def _form(citation: "Citation") -> str:
+    """Classify a citeurl citation as a full, short or "id." form."""
+    if citation.parent is None:
+        return "full"
+    return "id" if _ID_FORM.match(citation.text) else "short"
+
+
+def extract_document_citations(text: str) -> list[ExtractedCitation]:
+    """Extract and group every citation in a document.
+
+    This is CPU-bound; call it from a worker thread in async code.
+
+    Args:
+        text: The document text.
+
+    Returns:
+        The citations in document order, each tagged with its authority.
+
+    """
+    from citeurl import list_authorities
+
+    citations = list_citations(text)
+    authority_of: dict[int, tuple[str, bool]] = {}
+    for authority in list_authorities(citations):
+        is_case = all(authority.tokens.get(token) for token in _CASE_TOKENS)
+        for citation in authority.citations:
+            authority_of[id(citation)] = (authority.name, is_case)
+
+    extracted = []
+    for citation in citations:
+        name, is_case = authority_of.get(id(citation), (citation.name, False))
+        extracted.append(
+            ExtractedCitation(
+                text=citation.text,
+                start=citation.span[0],
+                end=citation.span[1],
+                form=_form(citation),
+                authority=name,
+                is_case=is_case,
+            )
+        )
+    return extracted
+
+
+def _cluster_summary(cluster: dict[str, Any]) -> dict[str, Any]:
+    """Keep the cluster fields useful for annotating a citation."""
+    summary = {field: cluster.get(field) for field in _CLUSTER_FIELDS}
+    if summary["absolute_url"] and str(summary["absolute_url"]).startswith("/"):
+        summary["absolute_url"] = (
+            f"https://www.courtlistener.com{summary['absolute_url']}"
+        )
+    return summary
+
+
+def _clusters(outcome: LookupOutcome) -> list[dict[str, Any]]:
+    """Collect the clusters a lookup outcome matched."""
+    return [
+        cluster
+        for item in outcome.results
+        for cluster in item.get("clusters") or []
+        if isinstance(cluster, dict) and cluster.get("id") is not None
+    ]
+
+
+async def _hydrate(
+    http_client: httpx.AsyncClient, cluster_ids: list[int]
+) -> dict[int, dict[str, Any] | Exception]:
+    """Fetch clusters concurrently; the shared rate limiter bounds concurrency."""
+    fetched = await asyncio.gather(
+        *(
+            get_resource(http_client, "clusters", cluster_id, use_cache=True)
+            for cluster_id in cluster_ids
+        ),
+        return_exceptions=True,
+    )
+    return dict(zip(cluster_ids, fetched, strict=True))  # type: ignore[arg-type]
+
+
+async def resolve_document(
+    http_client: httpx.AsyncClient,
+    text: str,
+    hydrate_clusters: bool = True,
+    max_hydrated_clusters: int = 100,
+) -> dict[str, Any]:
+    """Extract, resolve and annotate every citation in a document.
+
+    Args:
+        http_client: The HTTP client to use.
+        text: The document text.
+        hydrate_clusters: Whether to fetch metadata for clusters the lookup
+            returned only as IDs.
+        max_hydrated_clusters: Upper bound on clusters fetched for metadata.
+
+    Returns:
+        dict[str, Any]: A dictionary containing:
+            - summary: Counts for each stage of the pipeline
+            - authorities: One entry per cited authority with its status and
+              matching clusters
+            - citations: One row per citation occurrence with offsets, form,
+              authority, status and the matched case
+
+    Raises:
+        ValueError: If COURT_LISTENER_API_KEY is not found in environment variables.
+        httpx.HTTPStatusError: If every citation lookup request fails.
+
+    """
+    extracted = await asyncio.to_thread(extract_document_citations, text)
+    authorities = list(dict.fromkeys(c.authority for c in extracted))
+    case_authorities = list(dict.fromkeys(c.authority for c in extracted if c.is_case))
+
+    resolved = await resolve_citations(http_client, case_authorities)
+
+    clusters: dict[str, list[dict[str, Any]]] = {
+        name: [_cluster_summary(c) for c in _clusters(outcome)]
+        for name, outcome in resolved.outcomes.items()
+    }
+
+    hydrated = 0
+    if hydrate_clusters:
+        missing = list(
+            dict.fromkeys(
+                summary["id"]
+                for summaries in clusters.values()
+                for summary in summaries
+                if not summary["case_name"]
+            )
+        )[:max_hydrated_clusters]
+        if missing:
+            fetched = await _hydrate(http_client, missing)
+            for summaries in clusters.values():
+                for index, summary in enumerate(summaries):
+                    cluster = fetched.get(summary["id"])
+                    if isinstance(cluster, dict):
+                        summaries[index] = _cluster_summary(cluster)
+            hydrated = sum(isinstance(c, dict) for c in fetched.values())
+
+    occurrences = Counter(c.authority for c in extracted)
+    authority_rows = []
+    for name in authorities:
+        outcome = resolved.outcomes.get(name)
+        authority_rows.append(
+            {
+                "authority": name,
+                "occurrences": occurrences[name],
+                "status": outcome.status if outcome else None,
+                "error": outcome.error if outcome else "Not a case citation",
+                "clusters": clusters.get(name, []),
+            }
+        )
+
+    citation_rows = []
+    for index, citation in enumerate(extracted):
+        outcome = resolved.outcomes.get(citation.authority)
+        matched = clusters.get(citation.authority, [])
+        case = matched[0] if len(matched) == 1 else None
+        citation_rows.append(
+            {
+                "index": index,
+                "text": citation.text,
+                "start": citation.start,
+                "end": citation.end,
+                "form": citation.form,
+                "authority": citation.authority,
+                "status": outcome.status if outcome else None,
+                "cluster_ids": [c["id"] for c in matched],
+                "case_name": case["case_name"] if case else None,
+                "date_filed": case["date_filed"] if case else None,
+                "url": case["absolute_url"] if case else None,
+            }
+        )
+
+    resolved_count = sum(
+        1 for outcome in resolved.outcomes.values() if outcome.status in (200, 300)
+    )
+    return {
+        "summary": {
+            "citations_found": len(extracted),
+            "authorities": len(authorities),
+            "case_authorities": len(case_authorities),
+            "resolved": resolved_count,
+            "unresolved": len(case_authorities) - resolved_count,
+            "cached": resolved.cached,
+            "offline": len(resolved.offline_keys),
+            "lookup_requests": resolved.requests,
+            "clusters_hydrated": hydrated,
+        },
+        "authorities": authority_rows,
+        "citations": citation_rows,
+    }
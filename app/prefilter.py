@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Literal prefilter for citeurl citation templates.
+
+Every citeurl template regex contains fragments that *must* appear in any text
+it matches: reporter abbreviations such as ``U.S.`` or ``F.3d``, section
+markers such as ``§`` or ``Stat``, and digits for volumes and pages. This
+module extracts those required fragments from the loaded templates (including
+``custom_citation_templates.yaml``) by walking the parsed regexes, and uses
+them to:
+
+1. reject text spans with a single combined regex when no template could
+   possibly match them, and
+2. narrow the remaining spans down to the templates whose required fragments
+   are all present.
+
+The analysis is conservative: a fragment is only recorded when every match of
+the template regex must contain it, so the prefilter never hides a citation
+that the full templates would have found.
+"""
+
+from collections.abc import Iterable, Sequence
+import re
+import re._constants as sre_constants  # type: ignore[import-not-found]
+import re._parser as sre_parse  # type: ignore[import-not-found]
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from citeurl import Citator, Template  # type: ignore[import-untyped]
+
+# Marker atom meaning "some decimal digit must be present"
+DIGIT = r"\d"
+
+_DIGIT_RE = re.compile(r"\d")
+
+# An atom set is satisfied when at least one of its atoms is present
+AtomSet = frozenset[str]
+
+
+def _is_digit_class(items: Sequence[tuple[Any, Any]]) -> bool:
+    """Check whether a character class only matches decimal digits."""
+    for op, av in items:
+        if op is sre_constants.CATEGORY and av is sre_constants.CATEGORY_DIGIT:
+            continue
+        if op is sre_constants.RANGE and 48 <= av[0] <= av[1] <= 57:
+            continue
+        if op is sre_constants.LITERAL and 48 <= av <= 57:
+            continue
+        return False
+    return True
+
+
+def _selectivity(atoms: AtomSet) -> tuple[float, int]:
+    """Rank an atom set: longer shortest-literal first, then fewer atoms."""
+    shortest = min(1.5 if atom == DIGIT else len(atom) for atom in atoms)
+    return (shortest, -len(atoms))
+
+
+def _best(candidates: Iterable[AtomSet]) -> AtomSet | None:
+    """Pick the most selective atom set, or None if there are none."""
+    return max(candidates, key=_selectivity, default=None)
+
+
+def _required(subpattern: Sequence[tuple[Any, Any]], ignorecase: bool) -> list[AtomSet]:
+    """Collect atom sets that every match of a parsed regex sequence must satisfy.
+
+    Args:
+        subpattern: A parsed regex sequence (list of opcode/argument pairs).
+        ignorecase: Whether the sequence is matched case-insensitively, in which
+            case literal fragments are not recorded.
+
+    Returns:
+        A list of atom sets; all of them must be satisfied by any match.
+
+    """
+    required: list[AtomSet] = []
+    run: list[str] = []
+
+    def flush() -> None:
+        if run and not ignorecase:
+            required.append(frozenset(["".join(run)]))
+        run.clear()
+
+    for op, av in subpattern:
+        if op is sre_constants.LITERAL and not 48 <= av <= 57:
+            run.append(chr(av))
+            continue
+        if (
+            op is sre_constants.IN
+            and len(av) == 1
+            and av[0][0] is sre_constants.LITERAL
+            and not 48 <= av[0][1] <= 57
+        ):
+            run.append(chr(av[0][1]))
+            continue
+        flush()
+
+        if op is sre_constants.LITERAL or (
+            op is sre_constants.IN and _is_digit_class(av)
+        ):
+            required.append(frozenset([DIGIT]))
+        elif op is sre_constants.IN:
+            if not ignorecase and all(o is sre_constants.LITERAL for o, _ in av):
+                required.append(frozenset(chr(a) for _, a in av))
+        elif op is sre_constants.SUBPATTERN:
+            _, add_flags, del_flags, inner = av
+            inner_ignorecase = (
+                ignorecase or bool(add_flags & sre_constants.SRE_FLAG_IGNORECASE)
+            ) and not del_flags & sre_constants.SRE_FLAG_IGNORECASE
+            required.extend(_required(inner, inner_ignorecase))
+        elif op is sre_constants.BRANCH:
+            branches = [_best(_required(branch, ignorecase)) for branch in av[1]]
+            if all(branches):
+                required.append(frozenset().union(*branches))  # type: ignore[arg-type]
+        elif op in (
+            sre_constants.MAX_REPEAT,
+            sre_constants.MIN_REPEAT,
+            sre_constants.POSSESSIVE_REPEAT,
+        ):
+            minimum, _, item = av
+            if minimum >= 1:
+                required.extend(_required(item, ignorecase))
+        elif op is sre_constants.ATOMIC_GROUP:
+            required.extend(_required(av, ignorecase))
+        # Anchors, lookarounds, backreferences and wildcards require nothing
+
+    flush()
+    return required
+
+
+def required_atoms(regex: re.Pattern[str]) -> list[AtomSet]:
+    """Get the atom sets that any match of a compiled regex must satisfy.
+
+    Args:
+        regex: A compiled citeurl template regex.
+
+    Returns:
+        A list of atom sets; all of them must be satisfied by any match.
+
+    """
+    parsed = sre_parse.parse(regex.pattern, regex.flags)
+    ignorecase = bool(parsed.state.flags & sre_constants.SRE_FLAG_IGNORECASE)
+    return _required(parsed, ignorecase)
+
+
+class CitationPrefilter:
+    """Cheap rejection of text spans that cannot contain a citation.
+
+    Built once per citator. ``gate`` is a single regex combining the most
+    selective required fragment of every template regex; a span that does not
+    match it cannot contain any long-form citation. ``candidate_templates``
+    then narrows a span down to the templates whose required fragments are all
+    present.
+    """
+
+    def __init__(self, citator: "Citator") -> None:
+        """Analyze the citator's strict template regexes.
+
+        Args:
+            citator: The citeurl Citator whose templates should be prefiltered.
+
+        """
+        # Each template maps to one requirement list per regex; a template can
+        # match a span if any of its regexes has all requirements satisfied.
+        self._templates: list[tuple["Template", list[list[AtomSet]]]] = []
+        gate_atoms: set[str] = set()
+        always = False
+        for template in citator.templates.values():
+            # Check the most selective requirement first so misses fail fast
+            per_regex = [
+                sorted(set(required_atoms(regex)), key=_selectivity, reverse=True)
+                for regex in template.regexes
+            ]
+            self._templates.append((template, per_regex))
+            for requirements in per_regex:
+                best = _best(requirements)
+                if best is None:
+                    always = True
+                else:
+                    gate_atoms |= best
+
+        self.atoms = frozenset(
+            atom
+            for _, per_regex in self._templates
+            for requirements in per_regex
+            for atoms in requirements
+            for atom in atoms
+        )
+        self._literals = tuple(atom for atom in self.atoms if atom != DIGIT)
+        self.always_match = always
+        alternatives = sorted(
+            (DIGIT if atom == DIGIT else re.escape(atom) for atom in gate_atoms),
+            key=len,
+            reverse=True,
+        )
+        self.gate = re.compile("|".join(alternatives) if alternatives else "(?!)")
+
+    def may_contain_citation(
+        self, text: str, start: int = 0, end: int | None = None
+    ) -> bool:
+        """Check whether a span could contain a long-form citation.
+
+        Args:
+            text: The full text.
+            start: Start offset of the span.
+            end: End offset of the span (defaults to the end of the text).
+
+        Returns:
+            False only if no template can match inside the span.
+
+        """
+        if self.always_match:
+            return True
+        return (
+            self.gate.search(text, start, len(text) if end is None else end) is not None
+        )
+
+    def candidate_templates(self, span_text: str) -> list["Template"]:
+        """Get the templates that could match somewhere in a span.
+
+        Args:
+            span_text: The text of the span.
+
+        Returns:
+            Templates in citator order whose required fragments all appear.
+
+        """
+        present = {atom for atom in self._literals if atom in span_text}
+        if _DIGIT_RE.search(span_text):
+            present.add(DIGIT)
+
+        return [
+            template
+            for template, per_regex in self._templates
+            if any(
+                all(not atoms.isdisjoint(present) for atoms in requirements)
+                for requirements in per_regex
+            )
+        ]
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""On-demand CPU profiling and memory growth tracking for a live server.
+
+``run_profile`` profiles the running server for a number of seconds, or until a
+number of tool calls have completed, in one of two modes:
+
+- "collapsed": a sampling profiler. A background thread samples the event loop
+  thread's stack every few milliseconds and aggregates the samples as folded
+  stacks (one ``frame;frame;frame count`` line per distinct stack), the input
+  format of flamegraph.pl, speedscope and inferno. Samples are attributed to
+  the running tool, so a profile can be limited to one tool.
+- "pstats": a deterministic cProfile of the event loop thread, saved as a
+  pstats file for ``python -m pstats``, snakeviz or gprof2dot.
+
+``start_memory_tracking``, ``memory_diff`` and ``stop_memory_tracking`` wrap
+tracemalloc: take a baseline snapshot, then compare later snapshots against
+it to see which allocation sites grew (e.g. caches or response buffers).
+
+Both write their artifacts to ``PROFILE_DIR``.
+"""
+
+import asyncio
+from collections import Counter
+import cProfile
+from datetime import UTC, datetime
+import io
+import os
+from pathlib import Path
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from types import FrameType
+from typing import Any
+
+from loguru import logger
+
+from app.cache import get_cache_stats
+from app.config import config
+from app.loop_monitor import completed_calls, tool_for_task
+
+# How often run_profile checks whether enough tool calls have completed
+_POLL_SECONDS = 0.05
+
+# tracemalloc frames that only describe the tracker or the import system
+_MEMORY_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+def profile_dir() -> Path:
+    """Get the directory profiling artifacts are written to, creating it."""
+    path = (
+        Path(config.profile_dir)
+        if config.profile_dir
+        else Path(tempfile.gettempdir()) / "courtlistener-mcp-profiles"
+    )
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _artifact_path(kind: str, suffix: str) -> Path:
+    """Build a unique artifact path, e.g. profile-20250101T120000Z-1234.folded."""
+    stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
+    return profile_dir() / f"{kind}-{stamp}-{os.getpid()}{suffix}"
+
+
+def _fold(frame: FrameType | None) -> list[str]:
+    """Describe a stack as frame names, outermost first."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(
+            f"{code.co_qualname} ({os.path.basename(code.co_filename)}:"
+            f"{code.co_firstlineno})"
+        )
+        frame = frame.f_back
+    names.reverse()
+    return names
+
+
+class StackSampler:
+    """Samples the event loop thread's stack from a background thread."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        interval: float,
+        tool: str | None = None,
+    ) -> None:
+        """Create a sampler for the given loop, which must run in this thread.
+
+        Args:
+            loop: The event loop to sample.
+            interval: Seconds between samples.
+            tool: Only keep samples taken while this tool is running.
+
+        """
+        self.loop = loop
+        self.interval = interval
+        self.tool = tool
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._loop_thread = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def sample(self) -> None:
+        """Take one sample of the event loop thread."""
+        self.samples += 1
+        tool = tool_for_task(asyncio.current_task(self.loop))
+        if self.tool is not None and tool != self.tool:
+            return
+        frame = sys._current_frames().get(self._loop_thread)
+        root = f"tool:{tool}" if tool else "event loop"
+        self.stacks[";".join([root, *_fold(frame)])] += 1
+
+    def _run(self) -> None:
+        """Sample until stopped."""
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """Render the samples as folded stacks, most frequent first."""
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+# Only one profile runs at a time; they would distort each other
+_profiling = False
+
+
+async def _wait(duration: float, max_calls: int | None, tool: str | None) -> int:
+    """Wait for the duration, or until max_calls tool calls have completed.
+
+    Returns:
+        int: The number of (matching) tool calls completed while waiting.
+
+    """
+    start_calls = completed_calls(tool)
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        if max_calls is not None and completed_calls(tool) - start_calls >= max_calls:
+            break
+        await asyncio.sleep(
+            min(_POLL_SECONDS, max(0.0, deadline - time.perf_counter()))
+        )
+    return completed_calls(tool) - start_calls
+
+
+async def run_profile(
+    duration: float,
+    max_calls: int | None = None,
+    tool: str | None = None,
+    mode: str = "collapsed",
+    interval: float = 0.005,
+    top: int = 50,
+) -> dict[str, Any]:
+    """Profile the running server.
+
+    Args:
+        duration: Maximum number of seconds to profile for.
+        max_calls: Stop early once this many tool calls have completed.
+        tool: Only profile this tool (collapsed mode) and only count its
+            calls towards max_calls.
+        mode: "collapsed" for sampled folded stacks, "pstats" for cProfile.
+        interval: Seconds between samples in collapsed mode.
+        top: Number of stacks or functions to include in the response.
+
+    Returns:
+        dict[str, Any]: The artifact path, what was profiled, and a summary of
+        the hottest stacks (collapsed) or functions (pstats).
+
+    Raises:
+        ValueError: If mode is not "collapsed" or "pstats".
+        RuntimeError: If another profile is already running.
+
+    """
+    global _profiling
+    if mode not in ("collapsed", "pstats"):
+        raise ValueError(f"Unknown profile mode: {mode}. Use 'collapsed' or 'pstats'")
+    if _profiling:
+        raise RuntimeError("A profile is already running")
+
+    _profiling = True
+    started = time.perf_counter()
+    logger.info(f"Profiling ({mode}) for up to {duration}s, tool filter: {tool}")
+    try:
+        result: dict[str, Any] = {"mode": mode, "tool": tool}
+        if mode == "collapsed":
+            sampler = StackSampler(asyncio.get_running_loop(), interval, tool)
+            sampler.start()
+            try:
+                calls = await _wait(duration, max_calls, tool)
+            finally:
+                sampler.stop()
+            path = _artifact_path("profile", ".folded")
+            path.write_text(sampler.collapsed(), encoding="utf-8")
+            result.update(
+                samples=sampler.samples,
+                matched_samples=sum(sampler.stacks.values()),
+                top_stacks=[
+                    {"stack": stack, "samples": n}
+                    for stack, n in sampler.stacks.most_common(top)
+                ],
+            )
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                calls = await _wait(duration, max_calls, tool)
+            finally:
+                profiler.disable()
+            path = _artifact_path("profile", ".pstats")
+            profiler.dump_stats(path)
+            summary = io.StringIO()
+            stats = pstats.Stats(profiler, stream=summary)
+            stats.sort_stats("cumulative").print_stats(top)
+            result["summary"] = summary.getvalue()
+        result.update(
+            artifact=str(path),
+            duration_seconds=round(time.perf_counter() - started, 3),
+            tool_calls=calls,
+        )
+        return result
+    finally:
+        _profiling = False
+
+
+# Baseline snapshot that memory_diff compares against
+_baseline: tracemalloc.Snapshot | None = None
+
+
+def _traced_mb() -> dict[str, float]:
+    """Current and peak traced memory in MB."""
+    current, peak = tracemalloc.get_traced_memory()
+    return {"traced_mb": round(current / 2**20, 2), "peak_mb": round(peak / 2**20, 2)}
+
+
+def start_memory_tracking(frames: int = 10) -> dict[str, Any]:
+    """Start tracemalloc (if needed) and take a baseline snapshot.
+
+    Only allocations made after tracing starts are seen, so start tracking
+    before the workload whose memory growth should be explained.
+
+    Args:
+        frames: Stack frames to record per allocation.
+
+    Returns:
+        dict[str, Any]: Tracing state and traced memory.
+
+    """
+    global _baseline
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    _baseline = tracemalloc.take_snapshot().filter_traces(_MEMORY_FILTERS)
+    return {"tracing": True, **_traced_mb()}
+
+
+def memory_diff(
+    top: int = 25, group_by: str = "lineno", reset_baseline: bool = False
+) -> dict[str, Any]:
+    """Compare a new snapshot with the baseline.
+
+    Args:
+        top: Number of allocation sites to report.
+        group_by: "lineno", "filename" or "traceback".
+        reset_baseline: Make the new snapshot the baseline for the next diff.
+
+    Returns:
+        dict[str, Any]: The largest growths by allocation site, totals, cache
+        sizes, and the path of the saved snapshot.
+
+    Raises:
+        RuntimeError: If memory tracking has not been started.
+
+    """
+    global _baseline
+    if _baseline is None or not tracemalloc.is_tracing():
+        raise RuntimeError("Memory tracking is not running; start it first")
+
+    snapshot = tracemalloc.take_snapshot().filter_traces(_MEMORY_FILTERS)
+    diff = snapshot.compare_to(_baseline, group_by)
+    path = _artifact_path("memory", ".tracemalloc")
+    snapshot.dump(str(path))
+    if reset_baseline:
+        _baseline = snapshot
+
+    return {
+        **_traced_mb(),
+        "growth_kb": round(sum(stat.size_diff for stat in diff) / 1024, 1),
+        "top": [
+            {
+                "location": stat.traceback.format(limit=1)[0].strip()
+                if group_by != "traceback"
+                else stat.traceback.format(),
+                "size_kb": round(stat.size / 1024, 1),
+                "size_diff_kb": round(stat.size_diff / 1024, 1),
+                "count_diff": stat.count_diff,
+            }
+            for stat in diff[:top]
+        ],
+        "caches": {name: stats["size"] for name, stats in get_cache_stats().items()},
+        "artifact": str(path),
+    }
+
+
+def stop_memory_tracking() -> dict[str, Any]:
+    """Stop tracemalloc and drop the baseline.
+
+    Returns:
+        dict[str, Any]: The tracing state.
+
+    """
+    global _baseline
+    _baseline = None
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return {"tracing": False}
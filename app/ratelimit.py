@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Upstream rate limiting for CourtListener API requests.
+
+Every request to the CourtListener API goes through the shared ``rate_limiter``,
+which caps the number of requests in flight and optionally spaces request start
+times to stay under a requests-per-second budget.
+
+When the server runs several HTTP worker processes, ``RateLimiter.share``
+splits the concurrency cap between them, so their requests in flight add up
+to at most the cap, and moves the request start times into a
+``SharedSchedule``, a SQLite file all workers reserve slots from, so a
+requests-per-second budget holds for the server as a whole.
+"""
+
+import asyncio
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from types import TracebackType
+import weakref
+
+from app.config import config
+from app.timing import phase
+from app.tracing import span
+
+
+class SharedSchedule:
+    """Request start times shared between processes through a SQLite file."""
+
+    def __init__(self, path: str | Path, name: str = "courtlistener") -> None:
+        """Open (creating if needed) the schedule at path.
+
+        Args:
+            path: Path to the SQLite database file, shared by all processes.
+            name: Name of the budget, for files shared by several limiters.
+
+        """
+        self.path = Path(path)
+        self.name = name
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode; reserve() manages its own transaction
+        self._conn = sqlite3.connect(
+            self.path, timeout=10.0, isolation_level=None, check_same_thread=False
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_schedule ("
+                "name TEXT PRIMARY KEY, next_start REAL NOT NULL)"
+            )
+
+    def reserve(self, interval: float) -> float:
+        """Reserve the next request start time.
+
+        Args:
+            interval: Seconds until the start time after this one.
+
+        Returns:
+            float: Seconds to wait before starting the request.
+
+        """
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front, so concurrent
+            # reservations from other processes are serialized
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute(
+                    "SELECT next_start FROM rate_limit_schedule WHERE name = ?",
+                    (self.name,),
+                ).fetchone()
+                start = max(now, row[0]) if row else now
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_limit_schedule VALUES (?, ?)",
+                    (self.name, start + interval),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return start - now
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class RateLimiter:
+    """Async context manager limiting concurrency and request rate.
+
+    The limiter is safe to share across event loops (e.g. between test runs):
+    a separate semaphore is kept for each running loop.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_second: float = 0.0) -> None:
+        """Create a limiter.
+
+        Args:
+            max_concurrency: Maximum number of requests in flight at once.
+            requests_per_second: Maximum request start rate; 0 disables pacing.
+
+        Raises:
+            ValueError: If max_concurrency is not positive.
+
+        """
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+        self._next_start = 0.0
+        self.schedule: SharedSchedule | None = None
+        self.waiting = 0
+        self.in_flight = 0
+
+    def share(self, schedule: SharedSchedule, processes: int) -> None:
+        """Share this limit with other processes.
+
+        Call before the first request. Each process gets an equal share of
+        the concurrency cap (at least one slot, so the shares only add up to
+        the cap for at most that many processes) and request start times are
+        reserved from the shared schedule.
+
+        Args:
+            schedule: The schedule shared by all processes.
+            processes: Number of processes sharing the limit.
+
+        """
+        self.schedule = schedule
+        self.max_concurrency = max(1, self.max_concurrency // processes)
+
+    async def _reserve(self, interval: float) -> float:
+        """Reserve the next start time; returns the seconds to wait for it."""
+        if self.schedule is not None:
+            # The shared schedule may wait on another process's write lock
+            return await asyncio.to_thread(self.schedule.reserve, interval)
+        now = time.monotonic()
+        start = max(now, self._next_start)
+        self._next_start = start + interval
+        return start - now
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def __aenter__(self) -> None:
+        """Wait for a free slot and, if pacing is enabled, for the next start time."""
+        with (
+            span("rate_limiter.acquire", {"rate_limiter.waiting": self.waiting}),
+            phase("queue_wait"),
+        ):
+            self.waiting += 1
+            try:
+                await self._semaphore().acquire()
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+
+            if self.requests_per_second > 0:
+                try:
+                    delay = await self._reserve(1.0 / self.requests_per_second)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                except BaseException:
+                    # __aexit__ will not run; give the slot back
+                    self.in_flight -= 1
+                    self._semaphore().release()
+                    raise
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Release the slot."""
+        self.in_flight -= 1
+        self._semaphore().release()
+
+
+# Shared limiter for all CourtListener API requests
+rate_limiter = RateLimiter(
+    max_concurrency=config.courtlistener_max_concurrency,
+    requests_per_second=config.courtlistener_requests_per_second,
+)
@@ -3,10 +3,11 @@
 
 import argparse
 import asyncio
-from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator, Iterator
+from contextlib import ExitStack, asynccontextmanager, contextmanager
 from dataclasses import dataclass
 from datetime import UTC, datetime
+import os
 from pathlib import Path
 import sys
 from typing import Any, Literal
@@ -14,11 +15,23 @@ from typing import Any, Literal
 from fastmcp import FastMCP
 import httpx
 from loguru import logger
-import psutil
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
 from app import __version__
-from app.config import config
-from app.tools import citation_server, get_server, search_server
+from app.cache import get_cache_stats
+from app.cache_backend import close_cache_backend, get_shared_cache_stats
+from app.citator import template_watcher, warm_up
+from app.config import config, is_debug_enabled
+from app.log_pipeline import CallLogMiddleware, configure_file_logging
+from app.loop_monitor import ToolTaskMiddleware, monitor, monitoring
+from app.metrics import MetricsMiddleware, instrument_http_client, render
+from app.speedups import active, run
+from app.system import sampler, sampling, static_info
+from app.timing import TimingMiddleware, serialize, time_http_client
+from app.tracing import TracingMiddleware, configure_tracing, shutdown_tracing
+from app.tools import admin_server, citation_server, get_server, search_server
+from app.workers import run_workers, supports_reuse_port
 
 
 @dataclass
@@ -36,6 +49,54 @@ class AppContext:
     http_client: httpx.AsyncClient
 
 
+# Set by HTTP workers (see app/workers.py): their stateless requests each run
+# the lifespan, so they share one client instead of reconnecting per request
+process_http_client: httpx.AsyncClient | None = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create an instrumented client for CourtListener API requests.
+
+    Returns:
+        httpx.AsyncClient: A new client; the caller closes it.
+
+    """
+    client = httpx.AsyncClient(
+        timeout=config.courtlistener_timeout,
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+    )
+    if config.metrics_enabled:
+        instrument_http_client(client)
+    if is_debug_enabled():
+        time_http_client(client)
+    return client
+
+
+@contextmanager
+def background_tasks() -> Iterator[None]:
+    """Hold the enabled process-wide background tasks for the block.
+
+    Every session lifespan holds them, and so do the HTTP transports for the
+    whole run, so stateless requests do not restart them each time and a
+    session ending does not stop them for the others.
+    """
+    with ExitStack() as stack:
+        if config.citation_templates_watch_interval > 0:
+            if template_watcher.task is None:
+                logger.info("Watching custom citation templates for changes")
+            stack.enter_context(template_watcher.hold())
+        if config.status_sample_interval > 0:
+            stack.enter_context(sampling.hold())
+        if config.loop_monitor_enabled:
+            if monitoring.task is None:
+                logger.info(
+                    f"Monitoring the event loop (slow callback threshold "
+                    f"{config.loop_slow_callback_threshold * 1000:.0f}ms)"
+                )
+            stack.enter_context(monitoring.hold())
+        yield
+
+
 @asynccontextmanager
 async def app_lifespan(server: FastMCP[Any]) -> AsyncIterator[AppContext]:
     """Manage application lifecycle and shared resources.
@@ -50,16 +111,25 @@ async def app_lifespan(server: FastMCP[Any]) -> AsyncIterator[AppContext]:
         AppContext containing shared resources for tools to use.
 
     """
-    logger.info("Initializing shared HTTP client")
-    client = httpx.AsyncClient(
-        timeout=config.courtlistener_timeout,
-        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
-    )
+    client = process_http_client
+    owns_client = client is None
+    if client is None:
+        logger.info("Initializing shared HTTP client")
+        client = create_http_client()
+    # citeurl is loaded lazily; build the citator in the background so the
+    # handshake is not delayed and the first citation call is still fast
+    warmup = asyncio.create_task(warm_up()) if config.citation_warmup else None
+    static_info()  # computed once, before the first status call
     try:
-        yield AppContext(http_client=client)
+        with background_tasks():
+            yield AppContext(http_client=client)
     finally:
-        logger.info("Closing shared HTTP client")
-        await client.aclose()
+        if warmup is not None:
+            warmup.cancel()
+        if owns_client:
+            logger.info("Closing shared HTTP client")
+            await client.aclose()
+
 
 # Valid transport types
 TransportType = Literal["stdio", "http", "sse"]
@@ -67,8 +137,7 @@ VALID_TRANSPORTS: list[str] = ["stdio", "http", "sse"]
 
 # Configure logging
 log_path = Path(__file__).parent / "logs" / "server.log"
-log_path.parent.mkdir(exist_ok=True)
-logger.add(log_path, rotation="1 MB", retention="1 week")
+configure_file_logging(log_path)
 
 
 def get_version() -> str:
@@ -81,21 +150,6 @@ def get_version() -> str:
     return __version__
 
 
-def is_docker() -> bool:
-    """Check if running inside a Docker container.
-
-    Returns:
-        True if running inside Docker, False otherwise.
-
-    """
-    return Path("/.dockerenv").exists() or (
-        Path("/proc/1/cgroup").exists()
-        and any(
-            "docker" in line for line in Path("/proc/1/cgroup").open(encoding="utf-8")
-        )
-    )
-
-
 # Create main server instance with lifespan for shared resources
 mcp: FastMCP[Any] = FastMCP(
     name="CourtListener MCP Server",
@@ -105,37 +159,62 @@ mcp: FastMCP[Any] = FastMCP(
     "Available tools include: search operations for opinions/cases/audio/dockets/people, get operations for specific records by ID, "
     "and comprehensive citation tools for parsing, validating, and looking up legal citations.",
     lifespan=app_lifespan,
+    tool_serializer=serialize,
 )
 
+mcp.add_middleware(CallLogMiddleware())
+
+# Debug mode: add a per-phase timing block to every tool result
+if is_debug_enabled():
+    mcp.add_middleware(TimingMiddleware())
+
+if config.tracing_enabled:
+    mcp.add_middleware(TracingMiddleware())
+
+# Attributes loop stalls and profiler samples to tools; a dict update per call
+mcp.add_middleware(ToolTaskMiddleware())
+
+if config.metrics_enabled:
+    mcp.add_middleware(MetricsMiddleware())
+
+    @mcp.custom_route("/metrics", methods=["GET"], include_in_schema=False)
+    async def metrics(request: Request) -> PlainTextResponse:
+        """Serve Prometheus metrics (HTTP and SSE transports only).
+
+        Args:
+            request: The incoming HTTP request.
+
+        Returns:
+            The metrics in the Prometheus text exposition format.
+
+        """
+        return PlainTextResponse(
+            render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
 
 @mcp.tool()
-def status() -> dict[str, Any]:
+async def status() -> dict[str, Any]:
     """Check the status of the CourtListener MCP server.
 
+    System metrics are sampled in the background; with STATUS_SAMPLE_INTERVAL=0
+    they are sampled on each call instead, in a worker thread.
+
     Returns:
-        A dictionary containing server status, system metrics, and service information.
+        A dictionary containing server status, the latest system metrics,
+        cache statistics, and service information.
 
     """
+    if config.status_sample_interval <= 0:
+        await asyncio.to_thread(sampler.sample)
     logger.info("Status check requested")
 
-    # Get system info using psutil
-    process = psutil.Process()
-    process_start = datetime.fromtimestamp(process.create_time(), tz=UTC)
-    uptime_seconds = (datetime.now(UTC) - process_start).total_seconds()
-
-    # Format uptime as human readable
-    hours, remainder = divmod(int(uptime_seconds), 3600)
-    minutes, seconds = divmod(remainder, 60)
-    uptime = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-
-    # Docker and environment info
-    docker_info = is_docker()
-    environment = "docker" if docker_info else "native"
-
     # Build server info based on transport
     server_info: dict[str, Any] = {
         "tools_available": ["search", "get", "citation"],
         "transport": config.mcp_transport,
+        "pid": os.getpid(),
+        "speedups": active(),
         "api_base": "https://www.courtlistener.com/api/rest/v4/",
     }
 
@@ -150,20 +229,31 @@ def status() -> dict[str, Any]:
         "service": "CourtListener MCP Server",
         "version": get_version(),
         "timestamp": datetime.now(UTC).isoformat(),
-        "environment": {
-            "runtime": environment,
-            "docker": docker_info,
-            "python_version": sys.version.split()[0],
-        },
-        "system": {
-            "process_uptime": uptime,
-            "memory_mb": round(process.memory_info().rss / 1024 / 1024, 1),
-            "cpu_percent": round(process.cpu_percent(interval=0.1), 1),
-        },
+        "environment": static_info(),
+        # Already sampled, so this never blocks the event loop
+        "system": sampler.snapshot(),
         "server": server_info,
+        "caches": get_cache_stats(),
+        "shared_cache": get_shared_cache_stats(),
     }
 
 
+@mcp.tool()
+def event_loop_diagnostics() -> dict[str, Any]:
+    """Report event loop lag and recent slow callbacks.
+
+    Only collects data when the server runs with LOOP_MONITOR_ENABLED=true.
+    Each slow callback records how long the loop was blocked, the tool that was
+    running, and the stack of the event loop thread when the stall was seen.
+
+    Returns:
+        A dictionary containing whether monitoring is enabled, the lag
+        statistics in milliseconds, and the recent slow callbacks.
+
+    """
+    return {"enabled": config.loop_monitor_enabled, **monitor.report()}
+
+
 async def setup() -> None:
     """Set up the server by importing subservers."""
     logger.info("Setting up CourtListener MCP server")
@@ -180,6 +270,11 @@ async def setup() -> None:
     await mcp.import_server(citation_server, "citation")
     logger.info("Imported citation server tools")
 
+    # Import admin (profiling) tools only where operators opted in
+    if config.admin_tools_enabled:
+        await mcp.import_server(admin_server, "admin")
+        logger.info("Imported admin server tools")
+
     logger.info("Server setup complete")
 
 
@@ -236,12 +331,14 @@ Examples:
   %(prog)s --transport http         # Run HTTP server on default port
   %(prog)s -t http -p 9000          # Run HTTP server on port 9000
   %(prog)s -t sse --host 127.0.0.1  # Run SSE server on localhost only
+  %(prog)s -t http -w 4             # Run HTTP server with 4 worker processes
 
 Environment variables:
   MCP_TRANSPORT  - Set default transport (stdio, http, sse)
   MCP_PORT       - Set default port for HTTP/SSE transports
   MCP_PATH       - Set URL path for HTTP/SSE transports (default: /mcp/)
   HOST           - Set host to bind to (default: 0.0.0.0)
+  HTTP_WORKERS   - Set worker processes for the HTTP transport (default: 1)
         """,
     )
     parser.add_argument(
@@ -270,6 +367,13 @@ Environment variables:
         default=None,
         help="URL path for HTTP/SSE transports (default: from MCP_PATH env or /mcp/)",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for the HTTP transport (default: from HTTP_WORKERS env or 1)",
+    )
     parser.add_argument(
         "--log-level",
         choices=["debug", "info", "warning", "error"],
@@ -285,6 +389,7 @@ async def run_server(
     port: int,
     path: str,
     log_level: str,
+    workers: int = 1,
 ) -> None:
     """Run the MCP server with the specified transport.
 
@@ -294,33 +399,59 @@ async def run_server(
         port: Port to listen on (for http/sse).
         path: URL path (for http/sse).
         log_level: Logging level.
+        workers: Worker processes for the http transport.
 
     """
+    if workers > 1 and transport == "sse":
+        # An SSE stream and the messages posted for it must reach one process
+        logger.warning("The SSE transport runs in a single process; ignoring workers")
+        workers = 1
+    if workers > 1 and not supports_reuse_port():
+        logger.warning("SO_REUSEPORT is not available; running a single HTTP worker")
+        workers = 1
+    if workers > config.courtlistener_max_concurrency:
+        # Workers split the upstream concurrency cap, at least one slot each
+        logger.warning(
+            f"{workers} HTTP workers would exceed COURTLISTENER_MAX_CONCURRENCY; "
+            f"running {config.courtlistener_max_concurrency}"
+        )
+        workers = config.courtlistener_max_concurrency
+
     if transport == "stdio":
         logger.info("Starting CourtListener MCP server with stdio transport")
         await mcp.run_async(transport="stdio")
+    elif transport == "http" and workers > 1:
+        logger.info(
+            f"Starting CourtListener MCP server with HTTP transport ({workers} workers)"
+        )
+        logger.info(f"Listening on http://{host}:{port}{path}")
+        await run_workers(workers, host, port, path, log_level)
     elif transport == "http":
         logger.info("Starting CourtListener MCP server with HTTP transport")
         logger.info(f"Listening on http://{host}:{port}{path}")
-        await mcp.run_async(
-            transport="http",
-            host=host,
-            port=port,
-            path=path,
-            log_level=log_level,
-        )
+        with background_tasks():
+            await mcp.run_async(
+                transport="http",
+                host=host,
+                port=port,
+                path=path,
+                log_level=log_level,
+            )
     elif transport == "sse":
         logger.info("Starting CourtListener MCP server with SSE transport (legacy)")
         logger.info(f"Listening on http://{host}:{port}{path}")
-        await mcp.run_async(
-            transport="sse",
-            host=host,
-            port=port,
-            path=path,
-            log_level=log_level,
-        )
+        with background_tasks():
+            await mcp.run_async(
+                transport="sse",
+                host=host,
+                port=port,
+                path=path,
+                log_level=log_level,
+            )
     else:
-        raise ValueError(f"Invalid transport: {transport}. Must be one of {VALID_TRANSPORTS}")
+        raise ValueError(
+            f"Invalid transport: {transport}. Must be one of {VALID_TRANSPORTS}"
+        )
 
 
 def _is_broken_pipe_error(exc: BaseException) -> bool:
@@ -348,18 +479,22 @@ async def main() -> None:
     port = args.port or config.mcp_port
     path = args.path or config.mcp_path
     log_level = args.log_level or config.courtlistener_log_level.lower()
+    workers = args.workers or config.http_workers
 
     # Validate transport
     if transport not in VALID_TRANSPORTS:
-        logger.error(f"Invalid transport: {transport}. Must be one of {VALID_TRANSPORTS}")
+        logger.error(
+            f"Invalid transport: {transport}. Must be one of {VALID_TRANSPORTS}"
+        )
         sys.exit(1)
 
     logger.info(f"Server configuration: transport={transport}, log_level={log_level}")
     if transport in ("http", "sse"):
         logger.info(f"Network configuration: host={host}, port={port}, path={path}")
 
+    configure_tracing()
     try:
-        await run_server(transport, host, port, path, log_level)
+        await run_server(transport, host, port, path, log_level, workers)
     except BaseException as e:
         # Handle BrokenPipeError gracefully - this is expected when client disconnects
         if _is_broken_pipe_error(e):
@@ -367,8 +502,12 @@ async def main() -> None:
             return
         logger.error(f"Server error: {e}")
         raise
+    finally:
+        await close_cache_backend()
+        shutdown_tracing()
+        await logger.complete()
 
 
 if __name__ == "__main__":
     logger.info("Starting CourtListener MCP server")
-    asyncio.run(main())
+    run(main())
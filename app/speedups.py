@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Optional fast paths for the event loop and JSON.
+
+Install the ``speedups`` extra to enable them; everything falls back to the
+standard library when they are missing or turned off:
+
+- ``run`` runs the server on uvloop when it is installed and
+  ``UVLOOP_ENABLED`` is true, otherwise on the default asyncio loop;
+- ``json_loads`` decodes CourtListener response bodies with orjson when it is
+  installed and ``ORJSON_ENABLED`` is true, otherwise with ``json``;
+- ``json_dumps`` encodes tool results the same way, falling back to FastMCP's
+  pydantic-based encoder for values orjson cannot encode.
+"""
+
+import asyncio
+from collections.abc import Callable, Coroutine
+import json
+from typing import Any, TypeVar
+
+import pydantic_core
+
+from app.config import config
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
+# The orjson module when it is installed and enabled
+_orjson = orjson if config.orjson_enabled else None
+
+
+def _default(value: Any) -> Any:
+    """Convert values orjson does not know (e.g. pydantic models) to JSON types."""
+    return pydantic_core.to_jsonable_python(value, fallback=str)
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Decode a JSON document.
+
+    Args:
+        data: The JSON text, e.g. an HTTP response body.
+
+    Returns:
+        Any: The decoded value.
+
+    Raises:
+        ValueError: If data is not valid JSON.
+
+    """
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any) -> str:
+    """Encode a value as compact JSON text.
+
+    Args:
+        data: The value, e.g. a tool result.
+
+    Returns:
+        str: The JSON text, as FastMCP's default tool serializer would produce.
+
+    """
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(
+                data, default=_default, option=_orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except _orjson.JSONEncodeError:
+            pass  # e.g. integers wider than 64 bits
+    return pydantic_core.to_json(data, fallback=str).decode()
+
+
+def loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """Get the uvloop loop factory, if uvloop is installed and enabled.
+
+    Returns:
+        The factory, or None to use the default asyncio loop.
+
+    """
+    if not config.uvloop_enabled:
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the fastest available event loop.
+
+    Args:
+        main: The coroutine to run, e.g. the server's ``main()``.
+
+    Returns:
+        The coroutine's result.
+
+    """
+    return asyncio.run(main, loop_factory=loop_factory())
+
+
+def active() -> dict[str, str]:
+    """Report which implementations are in use.
+
+    Returns:
+        dict[str, str]: The running event loop and the JSON codec.
+
+    """
+    try:
+        loop = type(asyncio.get_running_loop()).__module__.split(".")[0]
+    except RuntimeError:
+        loop = "none"
+    return {"event_loop": loop, "json": "orjson" if _orjson is not None else "json"}
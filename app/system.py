@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Background-sampled system statistics for the status tool.
+
+Facts that cannot change while the server runs (Docker detection, Python
+version, process start time) are computed once. Everything else is sampled
+by ``SystemSampler.run`` on a fixed interval and kept in short rolling
+windows, so ``status`` can return the latest snapshot without blocking the
+event loop:
+
+- CPU percent since the previous sample (psutil's non-blocking mode);
+- resident memory;
+- event loop lag, measured as how late the sampler's own sleep wakes up;
+- open CourtListener connections and the process's TCP connections.
+"""
+
+import asyncio
+from collections import deque
+from datetime import UTC, datetime
+from functools import cache
+from pathlib import Path
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from app.background import SharedTask
+from app.config import config
+from app.metrics import http_pool_usage
+
+if TYPE_CHECKING:
+    import psutil
+
+
+def is_docker() -> bool:
+    """Check if running inside a Docker container.
+
+    Returns:
+        True if running inside Docker, False otherwise.
+
+    """
+    return Path("/.dockerenv").exists() or (
+        Path("/proc/1/cgroup").exists()
+        and any(
+            "docker" in line for line in Path("/proc/1/cgroup").open(encoding="utf-8")
+        )
+    )
+
+
+@cache
+def static_info() -> dict[str, Any]:
+    """Get facts about the runtime that do not change while the server runs.
+
+    Returns:
+        dict[str, Any]: Runtime ("docker" or "native"), Docker flag and
+        Python version.
+
+    """
+    docker = is_docker()
+    return {
+        "runtime": "docker" if docker else "native",
+        "docker": docker,
+        "python_version": sys.version.split()[0],
+    }
+
+
+def _format_uptime(seconds: float) -> str:
+    """Format seconds as HH:MM:SS."""
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+class SystemSampler:
+    """Keeps rolling windows of process and event loop statistics."""
+
+    def __init__(self, window: int = 12) -> None:
+        """Create a sampler.
+
+        Args:
+            window: Number of recent samples to keep for averages and maxima.
+
+        """
+        self._cpu: deque[float] = deque(maxlen=window)
+        self._memory: deque[int] = deque(maxlen=window)
+        self._lag: deque[float] = deque(maxlen=window)
+        self._connections: dict[str, int] = {}
+        self._sampled_at: float | None = None
+        self._process: psutil.Process | None = None
+        self._started_at = 0.0
+        self._lock = threading.Lock()
+
+    def _get_process(self) -> "psutil.Process":
+        """Get the psutil handle for this process, importing psutil on first use."""
+        if self._process is None:
+            import psutil
+
+            process = psutil.Process()
+            self._started_at = process.create_time()
+            # The first call only primes the counters; later calls are
+            # non-blocking and measure CPU use since the previous call
+            process.cpu_percent(interval=None)
+            self._process = process
+        return self._process
+
+    def sample(self) -> None:
+        """Take one sample of CPU, memory and connection counts."""
+        import psutil
+
+        process = self._get_process()
+        with process.oneshot():
+            cpu = process.cpu_percent(interval=None)
+            memory = process.memory_info().rss
+        try:
+            tcp = len(process.net_connections(kind="tcp"))
+        except psutil.AccessDenied:  # on some platforms
+            tcp = -1
+        connections = {**http_pool_usage(), "tcp": tcp}
+        with self._lock:
+            self._cpu.append(cpu)
+            self._memory.append(memory)
+            self._connections = connections
+            self._sampled_at = time.time()
+
+    def record_lag(self, seconds: float) -> None:
+        """Record how late the event loop ran a scheduled wakeup."""
+        with self._lock:
+            self._lag.append(max(0.0, seconds))
+
+    async def run(self, interval: float) -> None:
+        """Sample every interval seconds until cancelled.
+
+        Sampling runs in a worker thread; the wakeup delay of the sleep in
+        between is recorded as event loop lag.
+
+        Args:
+            interval: Seconds between samples.
+
+        """
+        import psutil
+
+        while True:
+            try:
+                await asyncio.to_thread(self.sample)
+            except (OSError, psutil.Error) as e:
+                logger.warning(f"System sampling failed: {e}")
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.record_lag(time.perf_counter() - start - interval)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get the latest statistics without blocking.
+
+        Takes a first sample synchronously if the background task has not
+        produced one yet; its CPU figure is 0.0, as in psutil.
+
+        Returns:
+            dict[str, Any]: Uptime, CPU, memory, event loop lag and connection
+            statistics, with rolling averages and maxima.
+
+        """
+        if self._sampled_at is None:
+            self.sample()
+        with self._lock:
+            cpu = list(self._cpu)
+            memory = list(self._memory)
+            lag = list(self._lag)
+            connections = dict(self._connections)
+            sampled_at = self._sampled_at or time.time()
+        mb = 1024 * 1024
+        return {
+            "process_uptime": _format_uptime(time.time() - self._started_at),
+            "memory_mb": round(memory[-1] / mb, 1),
+            "memory_peak_mb": round(max(memory) / mb, 1),
+            "cpu_percent": round(cpu[-1], 1),
+            "cpu_percent_avg": round(sum(cpu) / len(cpu), 1),
+            "loop_lag_ms": round(lag[-1] * 1000, 2) if lag else None,
+            "loop_lag_max_ms": round(max(lag) * 1000, 2) if lag else None,
+            "connections": connections,
+            "sampled_at": datetime.fromtimestamp(sampled_at, tz=UTC).isoformat(),
+        }
+
+
+# Shared sampler, run once per process while the server is up
+sampler = SystemSampler()
+sampling = SharedTask(
+    "system-sampler", lambda: sampler.run(config.status_sample_interval)
+)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Per-call timing breakdown for tool responses in debug mode.
+
+When debug mode is on, ``TimingMiddleware`` starts a collector for each tool
+call in a context variable, and the code on the request path adds the time it
+spends in each phase to it:
+
+- ``queue_wait``: waiting for the shared CourtListener rate limiter;
+- ``cache_lookup``: response, citation lookup and parse cache lookups;
+- ``upstream_ttfb``: from sending a request until its response headers arrive;
+- ``body_download``: reading the response body;
+- ``json_decode``: decoding CourtListener JSON responses;
+- ``citeurl``: citeurl parsing and extraction;
+- ``serialization``: encoding the tool result as JSON text.
+
+The totals (in milliseconds) are appended to the tool result as an extra text
+block and, for structured results, a ``_timing`` key. Phases of concurrent
+requests (batch tools) are summed, so they can add up to more than the call.
+
+Outside a collected call each hook is a single context variable read.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import time
+from typing import Any
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+import httpx
+from mcp.types import TextContent
+import mcp.types as mt
+
+from app.speedups import json_dumps
+
+# Phases reported for every call, in request path order
+PHASES = (
+    "queue_wait",
+    "cache_lookup",
+    "upstream_ttfb",
+    "body_download",
+    "json_decode",
+    "citeurl",
+    "serialization",
+)
+
+# Seconds spent per phase in the current tool call; None outside a call
+_collector: ContextVar[dict[str, float] | None] = ContextVar(
+    "timing_collector", default=None
+)
+
+
+def add(name: str, seconds: float) -> None:
+    """Add time to a phase of the current tool call, if it is collected.
+
+    Args:
+        name: The phase, one of ``PHASES``.
+        seconds: Time spent in the phase.
+
+    """
+    collector = _collector.get()
+    if collector is not None:
+        collector[name] = collector.get(name, 0.0) + seconds
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the wall time of the block to a phase of the current tool call.
+
+    Args:
+        name: The phase, one of ``PHASES``.
+
+    """
+    collector = _collector.get()
+    if collector is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        collector[name] = collector.get(name, 0.0) + time.perf_counter() - start
+
+
+def serialize(data: Any) -> str:
+    """FastMCP tool serializer that records the time spent encoding results.
+
+    Args:
+        data: A tool's return value.
+
+    Returns:
+        str: The value as JSON text.
+
+    """
+    with phase("serialization"):
+        return json_dumps(data)
+
+
+async def _on_request(request: httpx.Request) -> None:
+    """httpx request hook: note when the request was sent."""
+    if _collector.get() is not None:
+        request.extensions["timing_start"] = time.perf_counter()
+
+
+async def _on_response(response: httpx.Response) -> None:
+    """httpx response hook: record time to first byte and body download."""
+    start = response.request.extensions.get("timing_start")
+    if start is None:
+        return
+    headers_at = time.perf_counter()
+    add("upstream_ttfb", headers_at - start)
+    # httpx would read the body right after this hook; reading it here
+    # instead lets the download be timed separately
+    await response.aread()
+    add("body_download", time.perf_counter() - headers_at)
+
+
+def time_http_client(client: httpx.AsyncClient) -> httpx.AsyncClient:
+    """Record upstream time to first byte and body download for a client.
+
+    Args:
+        client: A client used for CourtListener API requests.
+
+    Returns:
+        httpx.AsyncClient: The same client, for chaining.
+
+    """
+    client.event_hooks["request"].append(_on_request)
+    client.event_hooks["response"].append(_on_response)
+    return client
+
+
+class TimingMiddleware(Middleware):
+    """FastMCP middleware adding a timing breakdown to each tool result."""
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mt.CallToolRequestParams],
+        call_next: CallNext[mt.CallToolRequestParams, ToolResult],
+    ) -> ToolResult:
+        """Collect phase timings during the call and attach them to the result."""
+        collector: dict[str, float] = {}
+        token = _collector.set(collector)
+        start = time.perf_counter()
+        try:
+            result = await call_next(context)
+        finally:
+            _collector.reset(token)
+        total = time.perf_counter() - start
+
+        timing = {"total_ms": round(total * 1000, 2)}
+        for name in PHASES:
+            timing[f"{name}_ms"] = round(collector.get(name, 0.0) * 1000, 2)
+        result.content.append(
+            TextContent(type="text", text=json.dumps({"_timing": timing}))
+        )
+        if isinstance(result.structured_content, dict):
+            result.structured_content["_timing"] = timing
+        return result
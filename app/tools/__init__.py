@@ -1,7 +1,8 @@
 """Tools package for CourtListener MCP server."""
 
+from app.tools.admin import admin_server
 from app.tools.citation import citation_server
 from app.tools.get import get_server
 from app.tools.search import search_server
 
-__all__ = ["citation_server", "get_server", "search_server"]
+__all__ = ["admin_server", "citation_server", "get_server", "search_server"]
@@ -0,0 +1,190 @@
+"""Admin tools for CourtListener MCP server.
+
+Profiling, memory diagnostics and citation template reloads for a live
+server. These tools are only imported (with the ``admin_`` prefix) when
+``ADMIN_TOOLS_ENABLED`` is set, since they expose internals, add overhead
+while they run, or change process-wide state.
+"""
+
+import asyncio
+from typing import Annotated, Any, Literal
+
+from fastmcp import Context, FastMCP
+from loguru import logger
+from pydantic import Field
+
+from app.citator import TemplateError, get_template_set, reload_templates
+from app.profiling import (
+    memory_diff,
+    run_profile,
+    start_memory_tracking,
+    stop_memory_tracking,
+)
+from app.timing import serialize
+
+# Create the admin server
+admin_server: FastMCP[Any] = FastMCP(
+    name="CourtListener Admin Server",
+    instructions="Diagnostics server for operators of the CourtListener MCP server. "
+    "Provides on-demand CPU profiling (flamegraph-compatible folded stacks or pstats) "
+    "and tracemalloc snapshot diffs for investigating latency regressions and memory growth.",
+    tool_serializer=serialize,
+)
+
+
+@admin_server.tool()
+async def profile(
+    ctx: Context,
+    duration_seconds: Annotated[
+        float,
+        Field(description="Maximum seconds to profile for", gt=0, le=300),
+    ] = 10.0,
+    max_calls: Annotated[
+        int | None,
+        Field(description="Stop early after this many tool calls complete", ge=1),
+    ] = None,
+    tool: Annotated[
+        str | None,
+        Field(
+            description="Only profile this tool, e.g. 'citation_extract_citations_from_text'"
+        ),
+    ] = None,
+    mode: Annotated[
+        Literal["collapsed", "pstats"],
+        Field(
+            description="'collapsed' for sampled folded stacks (flamegraphs), "
+            "'pstats' for a cProfile of the event loop thread"
+        ),
+    ] = "collapsed",
+    interval_ms: Annotated[
+        float,
+        Field(description="Sampling interval in collapsed mode", ge=1, le=1000),
+    ] = 5.0,
+    top: Annotated[
+        int,
+        Field(description="Stacks or functions to include in the response", ge=1),
+    ] = 50,
+) -> dict[str, Any]:
+    """Profile the running server for a while or for a number of tool calls.
+
+    In collapsed mode the event loop thread is sampled and samples are
+    attributed to the running tool; the artifact is a folded-stacks file for
+    flamegraph.pl, speedscope or inferno. In pstats mode everything on the event
+    loop thread is profiled with cProfile (the tool filter then only selects
+    which calls count towards max_calls) and the artifact is a pstats file.
+
+    Args:
+        ctx: The FastMCP context for logging.
+        duration_seconds: Maximum number of seconds to profile for.
+        max_calls: Stop early once this many (matching) tool calls complete.
+        tool: Only profile this tool.
+        mode: "collapsed" or "pstats".
+        interval_ms: Milliseconds between samples in collapsed mode.
+        top: Number of stacks or functions to include in the response.
+
+    Returns:
+        dict[str, Any]: The artifact path, the duration and number of tool calls
+            profiled, and the hottest stacks or a pstats summary.
+
+    Raises:
+        RuntimeError: If another profile is already running.
+
+    """
+    await ctx.info(f"Profiling for up to {duration_seconds}s ({mode})")
+    try:
+        return await run_profile(
+            duration_seconds, max_calls, tool, mode, interval_ms / 1000, top
+        )
+    except Exception as e:
+        await ctx.error(f"Profiling failed: {e}")
+        raise
+
+
+@admin_server.tool()
+async def memory_snapshot(
+    ctx: Context,
+    action: Annotated[
+        Literal["start", "diff", "stop"],
+        Field(
+            description="'start' traces allocations and takes a baseline, 'diff' "
+            "compares a new snapshot with it, 'stop' ends tracing"
+        ),
+    ] = "diff",
+    top: Annotated[
+        int, Field(description="Allocation sites to report", ge=1, le=500)
+    ] = 25,
+    group_by: Annotated[
+        Literal["lineno", "filename", "traceback"],
+        Field(description="How to group allocations"),
+    ] = "lineno",
+    reset_baseline: Annotated[
+        bool,
+        Field(description="Use this snapshot as the baseline for the next diff"),
+    ] = False,
+) -> dict[str, Any]:
+    """Track memory growth with tracemalloc snapshot diffs.
+
+    Call with action "start" before the workload, then "diff" to see which
+    allocation sites grew since the baseline, alongside cache sizes. Tracing
+    slows allocations down, so "stop" it when done.
+
+    Args:
+        ctx: The FastMCP context for logging.
+        action: "start", "diff" or "stop".
+        top: Number of allocation sites to report.
+        group_by: "lineno", "filename" or "traceback".
+        reset_baseline: Make this snapshot the baseline for the next diff.
+
+    Returns:
+        dict[str, Any]: Traced memory and, for "diff", the largest growths by
+            allocation site, cache sizes and the saved snapshot path.
+
+    Raises:
+        RuntimeError: If "diff" is requested before "start".
+
+    """
+    await ctx.info(f"Memory snapshot: {action}")
+    # Snapshots walk every traced allocation; keep that off the event loop
+    if action == "start":
+        return await asyncio.to_thread(start_memory_tracking)
+    if action == "stop":
+        return stop_memory_tracking()
+    try:
+        return await asyncio.to_thread(memory_diff, top, group_by, reset_baseline)
+    except Exception as e:
+        await ctx.error(f"Memory snapshot diff failed: {e}")
+        raise
+
+
+@admin_server.tool()
+async def reload_citation_templates(
+    force: Annotated[
+        bool,
+        Field(description="Rebuild and swap in the citator even if unchanged"),
+    ] = False,
+) -> dict[str, Any]:
+    """Reload the custom citation templates without restarting the server.
+
+    Builds a new citator from tools/custom_citation_templates.yaml in the
+    background and swaps it in once it is ready. Cached parse results from the
+    previous template version are dropped; all other caches stay warm.
+
+    Args:
+        force: Rebuild and swap in the citator even if the file is unchanged.
+
+    Returns:
+        dict[str, Any]: Whether the templates were reloaded, the previous and
+            current template versions, the template count, and the number of
+            parse results invalidated.
+
+    """
+    logger.info("Citation template reload requested")
+    try:
+        return await asyncio.to_thread(reload_templates, force)
+    except (OSError, TemplateError) as e:
+        logger.error(f"Citation template reload failed: {e}")
+        return {
+            "reloaded": False,
+            "version": get_template_set().version,
+            "error": f"Failed to load citation templates: {e}",
+        }
@@ -6,18 +6,30 @@ citation lookup, citation format verification, parsing, extraction from text, an
 enhanced lookups combining citeurl and CourtListener data.
 """
 
-from functools import lru_cache
-from pathlib import Path
+import asyncio
 import re
 from typing import Annotated, Any
 
-from citeurl import Citator, cite as citeurl_cite, list_cites  # type: ignore[import-untyped]
 from fastmcp import Context, FastMCP
 import httpx
 from loguru import logger
 from pydantic import Field
 
-from app.config import config, get_auth_headers, get_http_client
+from app.citator import (
+    ParsedCitation,
+    TemplateError,
+    cached_citation_key,
+    citation_key,
+    list_citations,
+    match_citation,
+    normalize_citation_text,
+    parse_citation,
+)
+from app.config import get_http_client
+from app.lookup import LookupOutcome, cache_outcomes, resolve_citations
+from app.network import build_network
+from app.pipeline import resolve_document
+from app.timing import serialize
 
 # Create the citation server
 citation_server: FastMCP[Any] = FastMCP(
@@ -28,9 +40,24 @@ citation_server: FastMCP[Any] = FastMCP(
     "citation parsing and normalization, citation extraction from text, and enhanced lookups combining multiple data sources. "
     "Supports various citation formats including U.S. Reporter, Federal Reporter, WestLaw, and state reporter citations. "
     "Use this server for all citation-related tasks including validation, parsing, and data retrieval.",
+    tool_serializer=serialize,
 )
 
 
+async def _citation_keys(citations: list[str]) -> list[str]:
+    """Get the deduplication keys of citations without blocking the event loop.
+
+    Keys whose parse is already cached are read directly; if any citation
+    still needs citeurl, the keys are computed in a worker thread.
+    """
+    keys = [cached_citation_key(citation) for citation in citations]
+    if all(key is not None for key in keys):
+        return [key for key in keys if key is not None]
+    return await asyncio.to_thread(
+        lambda: [citation_key(citation) for citation in citations]
+    )
+
+
 @citation_server.tool()
 async def lookup_citation(
     citation: Annotated[
@@ -43,6 +70,10 @@ async def lookup_citation(
 ) -> dict[str, Any]:
     """Look up a legal citation to find the opinion it references in CourtListener.
 
+    Results are cached on the normalized citation, so repeated lookups of the
+    same citation do not call the API again, and citations in the offline
+    citation index (if configured) are resolved without calling it at all.
+
     This tool accepts various citation formats including:
     - U.S. Reporter citations (e.g., "410 U.S. 113")
     - Federal Reporter citations (e.g., "123 F.3d 456")
@@ -54,7 +85,8 @@ async def lookup_citation(
         ctx: The FastMCP context for logging and accessing shared resources.
 
     Returns:
-        dict[str, Any]: The opinion(s) that match the citation, or an error dict if the lookup fails.
+        dict[str, Any]: The opinion(s) that match the citation, with the lookup
+            status and whether the result came from the cache or offline index.
 
     Raises:
         ValueError: If COURT_LISTENER_API_KEY is not found in environment variables.
@@ -63,27 +95,22 @@ async def lookup_citation(
     """
     await ctx.info(f"Looking up citation: {citation}")
 
-    headers = get_auth_headers()
-
     try:
+        [key] = await _citation_keys([citation])
+        key = key or citation
         async with get_http_client(ctx) as http_client:
-            response = await http_client.post(
-                f"{config.courtlistener_base_url}citation-lookup/",
-                headers=headers,
-                data={"text": citation},
-            )
-            response.raise_for_status()
-            data = response.json()
+            resolved = await resolve_citations(http_client, [key])
+        outcome = resolved.outcomes[key]
 
-        # Wrap list responses in a dict for MCP compatibility
-        if isinstance(data, list):
-            result: dict[str, Any] = {
-                "citation": citation,
-                "count": len(data),
-                "results": data,
-            }
-        else:
-            result = data
+        result: dict[str, Any] = {
+            "citation": citation,
+            "normalized": key,
+            "status": outcome.status,
+            "cached": resolved.cached == 1,
+            "offline": key in resolved.offline_keys,
+            "count": len(outcome.results),
+            "results": outcome.results,
+        }
 
         await ctx.info(f"Successfully looked up citation: {citation}")
         return result
@@ -101,60 +128,77 @@ async def batch_lookup_citations(
     citations: Annotated[
         list[str],
         Field(
-            description="List of citations to look up (max 100)",
+            description="List of citations to look up (any length)",
             min_length=1,
-            max_length=100,
         ),
     ],
     ctx: Context,
 ) -> dict[str, Any]:
-    """Look up multiple legal citations in a single request.
+    """Look up many legal citations with as few requests as possible.
 
-    This is more efficient than making individual requests for each citation.
-    Accepts up to 100 citations at once.
+    Citations are deduplicated on their normalized form and answered from the
+    lookup cache where possible. The remaining citations are packed into chunks
+    that respect CourtListener's per-request text and citation limits, and the
+    chunks are sent concurrently under the shared rate limiter. Results are
+    merged back in input order with a status for every citation.
 
     Args:
-        citations: List of citation strings to look up (max 100).
+        citations: List of citation strings to look up.
         ctx: The FastMCP context for logging and accessing shared resources.
 
     Returns:
-        dict[str, Any]: A dictionary mapping each citation to its corresponding opinion(s).
+        dict[str, Any]: A dictionary containing:
+            - citations_requested: The citations as submitted
+            - unique_citations: Number of distinct citations looked up
+            - cached: Number of distinct citations answered from the cache
+            - offline: Number answered from the offline citation index
+            - chunks: Number of upstream requests made
+            - count: Total number of upstream results
+            - results: All upstream results, in input order
+            - citations: One entry per submitted citation with its normalized
+              form, status, matching results and any error
 
     Raises:
         ValueError: If COURT_LISTENER_API_KEY is not found in environment variables.
-        httpx.HTTPStatusError: If the API request fails.
+        httpx.HTTPStatusError: If every upstream request fails.
 
     """
     await ctx.info(f"Looking up {len(citations)} citations")
 
-    headers = get_auth_headers()
-
     try:
-        # Use POST with form data for the citation text
-        # Join all citations into one text block separated by spaces
-        citation_text = " ".join(citations)
+        keys = await _citation_keys(citations)
+        unique = [key for key in dict.fromkeys(keys) if key]
+
         async with get_http_client(ctx) as http_client:
-            response = await http_client.post(
-                f"{config.courtlistener_base_url}citation-lookup/",
-                headers=headers,
-                data={"text": citation_text},
-                timeout=config.courtlistener_timeout * 2,  # Longer timeout for batch requests
-            )
-            response.raise_for_status()
-            data = response.json()
-
-        # Wrap list responses in a dict for MCP compatibility
-        if isinstance(data, list):
-            result: dict[str, Any] = {
-                "citations_requested": citations,
-                "count": len(data),
-                "results": data,
-            }
-        else:
-            result = data
+            resolved = await resolve_citations(http_client, unique)
+        outcomes = resolved.outcomes
 
-        await ctx.info(f"Successfully looked up {len(citations)} citations")
-        return result
+        empty = LookupOutcome(status=400, error="Citation is empty")
+        entries = [
+            {
+                "citation": citation,
+                "normalized": key,
+                **outcomes.get(key, empty).to_dict(),
+            }
+            for citation, key in zip(citations, keys, strict=True)
+        ]
+        results = [item for key in unique for item in outcomes[key].results]
+
+        await ctx.info(
+            f"Successfully looked up {len(citations)} citations "
+            f"({len(unique)} unique, {resolved.cached} cached, "
+            f"{resolved.requests} requests)"
+        )
+        return {
+            "citations_requested": citations,
+            "unique_citations": len(unique),
+            "cached": resolved.cached,
+            "offline": len(resolved.offline_keys),
+            "chunks": resolved.requests,
+            "count": len(results),
+            "results": results,
+            "citations": entries,
+        }
 
     except httpx.HTTPStatusError as e:
         await ctx.error(f"HTTP error in batch citation lookup: {e}")
@@ -164,37 +208,33 @@ async def batch_lookup_citations(
         raise
 
 
-@citation_server.tool()
-async def verify_citation_format(
-    citation: Annotated[
-        str,
-        Field(description="The citation to verify"),
-    ],
-    ctx: Context,
-) -> dict[str, Any]:
-    """Verify if a citation string is in a valid format using citeurl's advanced parsing.
+# Basic patterns used when citeurl itself fails, compiled once at import
+_BASIC_PATTERNS: dict[str, re.Pattern[str]] = {
+    "U.S. Reporter": re.compile(r"^\d+\s+U\.S\.\s+\d+", re.IGNORECASE),
+    "Federal Reporter": re.compile(r"^\d+\s+F\.(2d|3d|4th)?\s+\d+", re.IGNORECASE),
+    "Federal Supplement": re.compile(
+        r"^\d+\s+F\.\s*Supp\.(2d|3d)?\s+\d+", re.IGNORECASE
+    ),
+    "State Reporter": re.compile(
+        r"^\d+\s+[A-Z][a-z]+\.(\s*(2d|3d|4th))?\s+\d+", re.IGNORECASE
+    ),
+}
 
-    This tool performs validation using citeurl's comprehensive citation templates
-    to check if a citation appears to be in a recognized legal citation format.
-    This is much more accurate than simple regex matching.
 
-    Returns information about the citation format and any detected issues.
+def _verify_citation(citation: str) -> dict[str, Any]:
+    """Verify the format of a single citation.
+
+    Strict patterns are tried first; broad patterns only run when the strict
+    match misses. Both passes share the citator's compiled templates and the
+    citation parse cache.
 
     Args:
         citation: The citation string to verify.
-        ctx: The FastMCP context for logging.
 
     Returns:
-        dict[str, str | bool | list[str] | None]: A dictionary containing validation results with:
-            - valid: Whether the citation is in a valid format
-            - format: The recognized citation format type (if valid)
-            - template: The citation template matched (if valid)
-            - issues: List of any validation issues found
-            - citation: The original citation string
+        dict[str, Any]: The validation result for the citation.
 
     """
-    await ctx.info(f"Verifying citation format: {citation}")
-
     citation_stripped = citation.strip()
 
     # Check if citation is empty
@@ -208,53 +248,47 @@ async def verify_citation_format(
         }
 
     try:
-        citator = get_citator()
+        parsed, matching_mode = match_citation(citation_stripped)
 
-        # Try broad matching first
-        parsed_broad = citeurl_cite(citation_stripped, broad=True, citator=citator)
-        # Try strict matching
-        parsed_strict = citeurl_cite(citation_stripped, broad=False, citator=citator)
-
-        if parsed_strict:
+        if parsed and matching_mode == "strict":
             # Citation is valid in strict mode
-            result = {
+            return {
                 "valid": True,
                 "format": "Recognized legal citation",
-                "template": str(parsed_strict.template),
+                "template": parsed.template,
                 "matching_mode": "strict",
                 "citation": citation,
-                "normalized": parsed_strict.text,
-                "tokens": parsed_strict.tokens,
+                "normalized": parsed.text,
+                "tokens": parsed.tokens_dict(),
                 "issues": [],
             }
-        elif parsed_broad:
+        if parsed:
             # Citation is valid only in broad mode
-            result = {
+            return {
                 "valid": True,
                 "format": "Recognized legal citation (broad matching)",
-                "template": str(parsed_broad.template),
+                "template": parsed.template,
                 "matching_mode": "broad",
                 "citation": citation,
-                "normalized": parsed_broad.text,
-                "tokens": parsed_broad.tokens,
+                "normalized": parsed.text,
+                "tokens": parsed.tokens_dict(),
                 "issues": [
                     "Citation recognized only with broad matching - may be informal format"
                 ],
             }
-        else:
-            # Citation not recognized by citeurl
-            result = {
-                "valid": False,
-                "format": None,
-                "template": None,
-                "matching_mode": None,
-                "citation": citation,
-                "normalized": citation_stripped,
-                "issues": [
-                    "Citation does not match any recognized legal citation format in citeurl's templates",
-                    "Consider checking the citation format against standard legal citation styles (Bluebook, etc.)",
-                ],
-            }
+        # Citation not recognized by citeurl
+        return {
+            "valid": False,
+            "format": None,
+            "template": None,
+            "matching_mode": None,
+            "citation": citation,
+            "normalized": citation_stripped,
+            "issues": [
+                "Citation does not match any recognized legal citation format in citeurl's templates",
+                "Consider checking the citation format against standard legal citation styles (Bluebook, etc.)",
+            ],
+        }
 
     except Exception as e:
         # Fallback to basic validation if citeurl fails
@@ -262,21 +296,13 @@ async def verify_citation_format(
             f"citeurl verification failed, falling back to basic patterns: {e}"
         )
 
-        # Basic patterns for fallback
-        basic_patterns = {
-            "U.S. Reporter": r"^\d+\s+U\.S\.\s+\d+",
-            "Federal Reporter": r"^\d+\s+F\.(2d|3d|4th)?\s+\d+",
-            "Federal Supplement": r"^\d+\s+F\.\s*Supp\.(2d|3d)?\s+\d+",
-            "State Reporter": r"^\d+\s+[A-Z][a-z]+\.(\s*(2d|3d|4th))?\s+\d+",
-        }
-
         matched_format = None
-        for format_name, pattern in basic_patterns.items():
-            if re.match(pattern, citation_stripped, re.IGNORECASE):
+        for format_name, pattern in _BASIC_PATTERNS.items():
+            if pattern.match(citation_stripped):
                 matched_format = format_name
                 break
 
-        result = {
+        return {
             "valid": matched_format is not None,
             "format": matched_format,
             "template": "Basic regex fallback",
@@ -292,32 +318,82 @@ async def verify_citation_format(
             ],
         }
 
-    await ctx.info(f"Citation format verification complete: {result['valid']}")
-    return result
 
+@citation_server.tool()
+async def verify_citation_format(
+    citation: Annotated[
+        str,
+        Field(description="The citation to verify"),
+    ],
+    ctx: Context,
+) -> dict[str, Any]:
+    """Verify if a citation string is in a valid format using citeurl's advanced parsing.
+
+    This tool performs validation using citeurl's comprehensive citation templates
+    to check if a citation appears to be in a recognized legal citation format.
+    This is much more accurate than simple regex matching.
 
-def get_citator() -> Citator:
-    """Get or create the citeurl citator instance with custom citation templates.
+    Returns information about the citation format and any detected issues.
+
+    Args:
+        citation: The citation string to verify.
+        ctx: The FastMCP context for logging.
 
     Returns:
-        Citator: The singleton citeurl Citator instance with custom citation support.
+        dict[str, str | bool | list[str] | None]: A dictionary containing validation results with:
+            - valid: Whether the citation is in a valid format
+            - format: The recognized citation format type (if valid)
+            - template: The citation template matched (if valid)
+            - issues: List of any validation issues found
+            - citation: The original citation string
 
     """
-    return _get_citator_singleton()
+    await ctx.info(f"Verifying citation format: {citation}")
+
+    result = _verify_citation(citation)
+
+    await ctx.info(f"Citation format verification complete: {result['valid']}")
+    return result
+
+
+@citation_server.tool()
+async def batch_verify_citation_formats(
+    citations: Annotated[
+        list[str],
+        Field(description="List of citations to verify", min_length=1),
+    ],
+    ctx: Context,
+) -> dict[str, Any]:
+    """Verify the format of many citations in a single call.
 
+    Each citation is validated exactly as verify_citation_format would, sharing
+    the same compiled templates and parse cache, so bulk validation runs cost
+    one strict match per citation plus a broad match only for strict misses.
 
-@lru_cache(maxsize=1)
-def _get_citator_singleton() -> Citator:
-    """Get or create the citeurl citator instance with custom citation templates.
+    Args:
+        citations: List of citation strings to verify.
+        ctx: The FastMCP context for logging.
 
     Returns:
-        Citator: The singleton citeurl Citator instance with custom citation support.
+        dict[str, Any]: A dictionary containing:
+            - total: Number of citations verified
+            - valid_count: Number of citations in a recognized format
+            - results: Per-citation validation results, in input order
 
     """
-    template_path = Path(__file__).parent / "custom_citation_templates.yaml"
-    citator = Citator(yaml_paths=[str(template_path)])
-    logger.info(f"Created citator with custom citation templates from {template_path}")
-    return citator
+    await ctx.info(f"Verifying format of {len(citations)} citations")
+
+    results = [_verify_citation(citation) for citation in citations]
+    valid_count = sum(1 for result in results if result["valid"])
+
+    await ctx.info(
+        f"Batch format verification complete: {valid_count}/{len(citations)} valid"
+    )
+    return {
+        "total": len(results),
+        "valid_count": valid_count,
+        "results": results,
+    }
 
 
 @citation_server.tool()
@@ -358,8 +434,7 @@ async def parse_citation_with_citeurl(
     await ctx.info(f"Parsing citation with citeurl: {citation}")
 
     try:
-        citator = get_citator()
-        parsed_citation = citeurl_cite(citation, broad=broad, citator=citator)
+        parsed_citation = parse_citation(citation, broad=broad)
 
         if not parsed_citation:
             return {
@@ -372,13 +447,7 @@ async def parse_citation_with_citeurl(
         result = {
             "success": True,
             "citation": citation,
-            "parsed": {
-                "text": parsed_citation.text,
-                "tokens": parsed_citation.tokens,
-                "template": str(parsed_citation.template),
-                "URL": getattr(parsed_citation, "URL", None),
-                "canonical_name": getattr(parsed_citation, "name", None),
-            },
+            "parsed": parsed_citation.to_dict(),
         }
 
         await ctx.info(f"Successfully parsed citation: {parsed_citation.text}")
@@ -396,15 +465,27 @@ async def extract_citations_from_text(
         Field(description="Text containing legal citations to extract"),
     ],
     ctx: Context,
+    incremental: Annotated[
+        bool,
+        Field(
+            description="Reuse results for paragraphs unchanged since an earlier "
+            "call (faster when re-extracting an edited document)",
+            default=False,
+        ),
+    ] = False,
 ) -> dict[str, Any]:
     """Extract all legal citations from a block of text using citeurl.
 
     This tool finds and parses all legal citations within a given text,
     including both long-form and short-form citations (like 'id.' references).
+    In incremental mode only paragraphs that changed since an earlier call are
+    scanned for long-form citations; short-form and 'id.' citations are always
+    resolved over the whole text.
 
     Args:
         text: The text containing legal citations to extract.
         ctx: The FastMCP context for logging.
+        incremental: Whether to reuse results for unchanged paragraphs.
 
     Returns:
         dict[str, list | int]: A dictionary containing:
@@ -417,8 +498,7 @@ async def extract_citations_from_text(
     await ctx.info(f"Extracting citations from text ({len(text)} characters)")
 
     try:
-        citator = get_citator()
-        citations = list_cites(text, citator=citator)
+        citations = list_citations(text, incremental=incremental)
 
         parsed_citations = []
         for citation in citations:
@@ -446,131 +526,368 @@ async def extract_citations_from_text(
 
 
 @citation_server.tool()
-async def enhanced_citation_lookup(
-    citation: Annotated[
+async def resolve_citations_in_text(
+    text: Annotated[
         str,
-        Field(description="The citation to look up and analyze"),
+        Field(
+            description="Document text (opinion, brief, memo) to resolve citations in"
+        ),
     ],
     ctx: Context,
-    include_courtlistener: Annotated[
+    hydrate_clusters: Annotated[
         bool,
         Field(
-            description="Whether to also perform CourtListener API lookup", default=True
+            description="Fetch case name and date for clusters the lookup returned only as IDs",
+            default=True,
         ),
     ] = True,
+    max_hydrated_clusters: Annotated[
+        int,
+        Field(
+            description="Maximum number of clusters to fetch metadata for",
+            default=100,
+            ge=0,
+            le=1000,
+        ),
+    ] = 100,
 ) -> dict[str, Any]:
-    """Enhanced citation lookup combining citeurl parsing with CourtListener data.
+    """Extract, resolve and annotate every citation in a document in one call.
 
-    This tool first uses citeurl to parse and validate the citation format,
-    then optionally queries the CourtListener API for additional case information.
+    Replaces the extract_citations_from_text -> batch_lookup_citations ->
+    get_cluster sequence: citations (including short and "id." forms) are
+    extracted, grouped by authority, resolved with one batched and cached
+    lookup, and optionally hydrated with cluster metadata, all server-side.
+
+    Args:
+        text: The document text.
+        ctx: The FastMCP context for logging and accessing shared resources.
+        hydrate_clusters: Whether to fetch metadata for clusters returned only as IDs.
+        max_hydrated_clusters: Maximum number of clusters to fetch metadata for.
 
     Returns:
-        dict: Comprehensive citation information from both sources, containing:
-            - citation: The original citation string
-            - citeurl_analysis: Parsing results from citeurl
-            - courtlistener_data: Lookup results from CourtListener API
-            - combined_info: Summary of available information from both sources
+        dict[str, Any]: A dictionary containing:
+            - summary: Counts for each stage of the pipeline
+            - authorities: One entry per cited authority with status and clusters
+            - citations: One row per citation occurrence with start/end offsets,
+              form (full, short or id), authority, status and matched case
+
+    Raises:
+        ValueError: If COURT_LISTENER_API_KEY is not found in environment variables.
+        httpx.HTTPStatusError: If every citation lookup request fails.
+
+    """
+    await ctx.info(f"Resolving citations in {len(text)} characters of text")
+
+    try:
+        async with get_http_client(ctx) as http_client:
+            result = await resolve_document(
+                http_client,
+                text,
+                hydrate_clusters=hydrate_clusters,
+                max_hydrated_clusters=max_hydrated_clusters,
+            )
+
+        summary = result["summary"]
+        await ctx.info(
+            f"Resolved {summary['resolved']} of {summary['case_authorities']} cases "
+            f"from {summary['citations_found']} citations"
+        )
+        return result
+
+    except httpx.HTTPStatusError as e:
+        await ctx.error(f"HTTP error resolving citations in text: {e}")
+        raise
+    except Exception as e:
+        await ctx.error(f"Error resolving citations in text: {e}")
+        raise
+
+
+@citation_server.tool()
+async def build_citation_network(
+    ctx: Context,
+    opinion_ids: Annotated[
+        list[int] | None,
+        Field(description="Opinion IDs to start from", default=None),
+    ] = None,
+    cluster_ids: Annotated[
+        list[int] | None,
+        Field(description="Cluster IDs whose opinions to start from", default=None),
+    ] = None,
+    depth: Annotated[
+        int,
+        Field(description="Number of citation hops to follow", default=1, ge=1, le=4),
+    ] = 1,
+    max_nodes: Annotated[
+        int,
+        Field(description="Maximum opinions in the graph", default=200, ge=1, le=2000),
+    ] = 200,
+    max_concurrency: Annotated[
+        int,
+        Field(description="Maximum opinions fetched at once", default=8, ge=1, le=32),
+    ] = 8,
+) -> dict[str, Any]:
+    """Build the citation network around opinions or clusters in one call.
+
+    Walks the citation graph breadth-first ("what does this opinion cite, and
+    what do those cite") to the requested depth. Opinions are deduplicated,
+    expanded opinions are cached across calls, and the node budget and
+    concurrency cap keep large graphs bounded.
 
     Args:
-        citation: The citation string to look up and analyze.
         ctx: The FastMCP context for logging and accessing shared resources.
-        include_courtlistener: Whether to include CourtListener API lookup.
+        opinion_ids: Opinion IDs to start from.
+        cluster_ids: Cluster IDs whose opinions to start from.
+        depth: Number of citation hops to follow.
+        max_nodes: Maximum number of opinions in the graph.
+        max_concurrency: Maximum number of opinions fetched at once.
 
     Returns:
-        dict[str, dict | str | bool]: A dictionary containing the enhanced citation information.
+        dict[str, Any]: A dictionary containing:
+            - roots: The starting opinion IDs
+            - summary: Node, edge, truncation and error counts
+            - nodes: One entry per opinion with its cluster ID and depth
+            - adjacency: Citing opinion ID -> cited opinion IDs within the graph
+            - errors: Opinions that could not be expanded
+
+    Raises:
+        ValueError: If no starting IDs are given, or COURT_LISTENER_API_KEY is
+            not found in environment variables.
+        httpx.HTTPStatusError: If fetching a starting cluster fails.
 
     """
-    await ctx.info(f"Enhanced lookup for citation: {citation}")
+    if not opinion_ids and not cluster_ids:
+        raise ValueError("Provide at least one opinion_id or cluster_id")
 
-    result = {
-        "citation": citation,
-        "citeurl_analysis": {},
-        "courtlistener_data": {},
-        "combined_info": {},
-    }
+    await ctx.info(
+        f"Building citation network from {len(opinion_ids or [])} opinions and "
+        f"{len(cluster_ids or [])} clusters (depth {depth})"
+    )
 
-    # First, parse with citeurl
     try:
-        citator = get_citator()
-        parsed = citeurl_cite(citation, broad=True, citator=citator)
+        async with get_http_client(ctx) as http_client:
+            result = await build_network(
+                http_client,
+                opinion_ids or [],
+                cluster_ids or [],
+                depth=depth,
+                max_nodes=max_nodes,
+                max_concurrency=max_concurrency,
+            )
 
-        if parsed:
-            result["citeurl_analysis"] = {
-                "success": True,
-                "text": parsed.text,
-                "tokens": parsed.tokens,
-                "template": str(parsed.template),
-                "URL": getattr(parsed, "URL", None),
-                "canonical_name": getattr(parsed, "name", None),
-            }
-        else:
-            result["citeurl_analysis"] = {
-                "success": False,
-                "error": "Citation not recognized by citeurl",
-            }
+        summary = result["summary"]
+        await ctx.info(
+            f"Citation network has {summary['nodes']} opinions and "
+            f"{summary['edges']} citations"
+        )
+        return result
+
+    except httpx.HTTPStatusError as e:
+        await ctx.error(f"HTTP error building citation network: {e}")
+        raise
     except Exception as e:
-        result["citeurl_analysis"] = {
-            "success": False,
-            "error": f"citeurl parsing error: {e}",
-        }
+        await ctx.error(f"Error building citation network: {e}")
+        raise
 
-    # Then, lookup in CourtListener if requested and API key available
-    if include_courtlistener:
+
+def _parse_all(citations: list[str]) -> list[ParsedCitation | Exception | None]:
+    """Parse citations with citeurl, capturing errors per citation."""
+    results: list[ParsedCitation | Exception | None] = []
+    for citation in citations:
         try:
-            headers = get_auth_headers()
-            async with get_http_client(ctx) as http_client:
-                response = await http_client.post(
-                    f"{config.courtlistener_base_url}citation-lookup/",
-                    headers=headers,
-                    data={"text": citation},
-                )
-                if response.status_code == 200:
-                    result["courtlistener_data"] = {
-                        "success": True,
-                        "data": response.json(),
-                    }
-                else:
-                    result["courtlistener_data"] = {
-                        "success": False,
-                        "error": f"HTTP {response.status_code}: {response.text}",
-                    }
-        except ValueError:
-            result["courtlistener_data"] = {
-                "success": False,
-                "error": "COURT_LISTENER_API_KEY not found",
-            }
-        except Exception as e:
-            result["courtlistener_data"] = {
-                "success": False,
-                "error": f"CourtListener API error: {e}",
-            }
+            results.append(parse_citation(citation, broad=True))
+        except (OSError, TemplateError) as e:
+            results.append(e)
+    return results
+
+
+def _citeurl_analysis(parsed: ParsedCitation | Exception | None) -> dict[str, Any]:
+    """Summarize a citeurl parse result for enhanced lookups."""
+    if isinstance(parsed, Exception):
+        return {"success": False, "error": f"citeurl parsing error: {parsed}"}
+    if parsed is None:
+        return {"success": False, "error": "Citation not recognized by citeurl"}
+    return {"success": True, **parsed.to_dict()}
 
-    # Combine information
-    citeurl_analysis = result.get("citeurl_analysis", {})
-    courtlistener_data = result.get("courtlistener_data", {})
-    if (
-        isinstance(citeurl_analysis, dict)
-        and citeurl_analysis.get("success")
-        and isinstance(courtlistener_data, dict)
-        and courtlistener_data.get("success")
-    ):
-        result["combined_info"] = {
+
+def _courtlistener_data(
+    outcome: LookupOutcome | None, cached: bool, error: Exception | None
+) -> dict[str, Any]:
+    """Summarize a CourtListener lookup outcome for enhanced lookups."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return {
+            "success": False,
+            "error": f"HTTP {error.response.status_code}: {error.response.text}",
+        }
+    if isinstance(error, ValueError):
+        return {"success": False, "error": "COURT_LISTENER_API_KEY not found"}
+    if error is not None:
+        return {"success": False, "error": f"CourtListener API error: {error}"}
+    if outcome is None:
+        return {"success": False, "error": "Citation is empty"}
+    if outcome.request_failed:
+        return {"success": False, "error": f"CourtListener API error: {outcome.error}"}
+    return {"success": True, "data": outcome.results, "cached": cached}
+
+
+def _combined_info(
+    citeurl_analysis: dict[str, Any], courtlistener_data: dict[str, Any]
+) -> dict[str, Any]:
+    """Summarize which sources produced information for a citation."""
+    if citeurl_analysis.get("success") and courtlistener_data.get("success"):
+        return {
             "has_both_sources": True,
             "citeurl_url": citeurl_analysis.get("URL"),
             "canonical_citation": citeurl_analysis.get("canonical_name"),
             "tokens": citeurl_analysis.get("tokens"),
             "courtlistener_matches": len(courtlistener_data.get("data", [])),
         }
-    else:
-        available_sources = []
-        if isinstance(citeurl_analysis, dict) and citeurl_analysis.get("success"):
-            available_sources.append("citeurl")
-        if isinstance(courtlistener_data, dict) and courtlistener_data.get("success"):
-            available_sources.append("courtlistener")
-        result["combined_info"] = {
-            "has_both_sources": False,
-            "available_sources": available_sources,
-        }
+
+    available_sources = []
+    if citeurl_analysis.get("success"):
+        available_sources.append("citeurl")
+    if courtlistener_data.get("success"):
+        available_sources.append("courtlistener")
+    return {"has_both_sources": False, "available_sources": available_sources}
+
+
+async def _enhance_citations(
+    citations: list[str], include_courtlistener: bool, ctx: Context
+) -> list[dict[str, Any]]:
+    """Parse citations and look them up in CourtListener at the same time.
+
+    citeurl parsing runs in a worker thread while the lookup is in flight.
+    Citations whose parse is already cached are looked up under their
+    canonical key; the rest use their normalized text, and the outcome is
+    also cached under the canonical key once the parse finishes.
+    """
+    parse_task = asyncio.create_task(asyncio.to_thread(_parse_all, citations))
+
+    keys = [
+        cached_citation_key(citation) or normalize_citation_text(citation)
+        for citation in citations
+    ]
+    outcomes: dict[str, LookupOutcome] = {}
+    cached: frozenset[str] = frozenset()
+    lookup_error: Exception | None = None
+    if include_courtlistener:
+        unique = [key for key in dict.fromkeys(keys) if key]
+        try:
+            async with get_http_client(ctx) as http_client:
+                resolved = await resolve_citations(http_client, unique)
+            outcomes = resolved.outcomes
+            cached = resolved.cached_keys
+        except (httpx.HTTPError, ValueError) as e:
+            lookup_error = e
+
+    parsed_citations = await parse_task
+
+    if outcomes:
+        # Make later lookups of equivalent spellings hit the cache
+        await cache_outcomes(
+            {
+                canonical: outcomes[key]
+                for parsed, key in zip(parsed_citations, keys, strict=True)
+                if isinstance(parsed, ParsedCitation)
+                and (canonical := parsed.authority or parsed.name)
+                and canonical != key
+                and key in outcomes
+            }
+        )
+
+    results = []
+    for citation, key, parsed in zip(citations, keys, parsed_citations, strict=True):
+        citeurl_analysis = _citeurl_analysis(parsed)
+        courtlistener_data: dict[str, Any] = {}
+        if include_courtlistener:
+            courtlistener_data = _courtlistener_data(
+                outcomes.get(key), key in cached, lookup_error
+            )
+        results.append(
+            {
+                "citation": citation,
+                "citeurl_analysis": citeurl_analysis,
+                "courtlistener_data": courtlistener_data,
+                "combined_info": _combined_info(citeurl_analysis, courtlistener_data),
+            }
+        )
+    return results
+
+
+@citation_server.tool()
+async def enhanced_citation_lookup(
+    citation: Annotated[
+        str,
+        Field(description="The citation to look up and analyze"),
+    ],
+    ctx: Context,
+    include_courtlistener: Annotated[
+        bool,
+        Field(
+            description="Whether to also perform CourtListener API lookup", default=True
+        ),
+    ] = True,
+) -> dict[str, Any]:
+    """Enhanced citation lookup combining citeurl parsing with CourtListener data.
+
+    This tool parses and validates the citation format with citeurl and,
+    optionally, queries the CourtListener API for case information. Both run
+    concurrently, with parsing kept off the event loop.
+
+    Args:
+        citation: The citation string to look up and analyze.
+        ctx: The FastMCP context for logging and accessing shared resources.
+        include_courtlistener: Whether to include CourtListener API lookup.
+
+    Returns:
+        dict[str, Any]: Comprehensive citation information from both sources, containing:
+            - citation: The original citation string
+            - citeurl_analysis: Parsing results from citeurl
+            - courtlistener_data: Lookup results from CourtListener API
+            - combined_info: Summary of available information from both sources
+
+    """
+    await ctx.info(f"Enhanced lookup for citation: {citation}")
+
+    (result,) = await _enhance_citations([citation], include_courtlistener, ctx)
 
     await ctx.info(f"Enhanced lookup complete for: {citation}")
     return result
+
+
+@citation_server.tool()
+async def batch_enhanced_citation_lookup(
+    citations: Annotated[
+        list[str],
+        Field(description="List of citations to look up and analyze", min_length=1),
+    ],
+    ctx: Context,
+    include_courtlistener: Annotated[
+        bool,
+        Field(
+            description="Whether to also perform CourtListener API lookup", default=True
+        ),
+    ] = True,
+) -> dict[str, Any]:
+    """Enhanced lookup for many citations in one concurrent pass.
+
+    All citations are parsed with citeurl in a worker thread while a single
+    batched CourtListener lookup runs, so a whole document's citations are
+    enhanced at roughly the cost of one lookup.
+
+    Args:
+        citations: The citation strings to look up and analyze.
+        ctx: The FastMCP context for logging and accessing shared resources.
+        include_courtlistener: Whether to include CourtListener API lookup.
+
+    Returns:
+        dict[str, Any]: A dictionary containing:
+            - total: Number of citations analyzed
+            - results: One enhanced_citation_lookup result per citation, in input order
+
+    """
+    await ctx.info(f"Enhanced lookup for {len(citations)} citations")
+
+    results = await _enhance_citations(citations, include_courtlistener, ctx)
+
+    await ctx.info(f"Enhanced lookup complete for {len(citations)} citations")
+    return {"total": len(results), "results": results}
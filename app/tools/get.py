@@ -6,7 +6,9 @@ from fastmcp import Context, FastMCP
 import httpx
 from pydantic import Field
 
-from app.config import config, get_auth_headers, get_http_client
+from app.api import get_resource
+from app.config import config, get_http_client
+from app.timing import serialize
 
 # Create the get server
 get_server: FastMCP[Any] = FastMCP(
@@ -16,6 +18,7 @@ get_server: FastMCP[Any] = FastMCP(
     "dockets, oral argument audio recordings, and judge/legal professional profiles. "
     "Each tool requires the specific ID of the record to retrieve and returns detailed information about that record. "
     "Use this server when you have a specific ID and need complete details about a particular legal entity.",
+    tool_serializer=serialize,
 )
 
 
@@ -43,17 +46,13 @@ async def _fetch_resource(
     """
     await ctx.info(f"Getting {resource_type} with ID: {resource_id}")
 
-    headers = get_auth_headers()
-
     try:
         async with get_http_client(ctx) as http_client:
-            response = await http_client.get(
-                f"{config.courtlistener_base_url}{endpoint}/{resource_id}/",
-                headers=headers,
+            data = await get_resource(
+                http_client, endpoint, resource_id, use_cache=config.get_cache_enabled
             )
-            response.raise_for_status()
-            await ctx.info(f"Successfully retrieved {resource_type} {resource_id}")
-            return response.json()
+        await ctx.info(f"Successfully retrieved {resource_type} {resource_id}")
+        return data
 
     except httpx.HTTPStatusError as e:
         await ctx.error(f"HTTP error getting {resource_type}: {e}")
@@ -1,12 +1,19 @@
 """Search tools for CourtListener MCP server."""
 
+import hashlib
 from typing import Annotated, Any
 
 from fastmcp import Context, FastMCP
 import httpx
 from pydantic import Field
 
+from app.cache import LRUCache, register_cache
+from app.cache_backend import SharedCache
 from app.config import config, get_auth_headers, get_http_client
+from app.ratelimit import rate_limiter
+from app.speedups import json_dumps, json_loads
+from app.timing import phase, serialize
+from app.tracing import record_response, span
 
 # Create the search server
 search_server: FastMCP[Any] = FastMCP(
@@ -17,8 +24,17 @@ search_server: FastMCP[Any] = FastMCP(
     "RECAP filing documents, and judges/legal professionals. "
     "Search parameters include date ranges, court filters, case names, judge names, and full-text queries. "
     "Results are returned with detailed metadata and can be sorted by relevance or date.",
+    tool_serializer=serialize,
 )
 
+# Search responses keyed on a hash of the request parameters; only used when
+# SEARCH_CACHE_TTL is set, since results change as new filings are indexed
+search_cache: LRUCache[str, dict[str, Any]] = LRUCache(
+    config.search_cache_size, ttl=max(config.search_cache_ttl, 1)
+)
+register_cache("search_responses", search_cache)
+shared_searches = SharedCache("search_responses")
+
 
 async def _search_courtlistener(
     ctx: Context,
@@ -68,14 +84,40 @@ async def _search_courtlistener(
             params[key] = value
 
     try:
-        async with get_http_client(ctx) as http_client:
-            response = await http_client.get(
-                f"{config.courtlistener_base_url}search/",
-                params=params,
-                headers=headers,
-            )
-            response.raise_for_status()
-            data = response.json()
+        with span(
+            "courtlistener.search",
+            {"courtlistener.search_type": search_type, "courtlistener.limit": limit},
+        ) as current:
+
+            async def fetch() -> dict[str, Any]:
+                async with get_http_client(ctx) as http_client, rate_limiter:
+                    response = await http_client.get(
+                        f"{config.courtlistener_base_url}search/",
+                        params=params,
+                        headers=headers,
+                    )
+                    record_response(current, response)
+                    response.raise_for_status()
+                    with span("json.decode"), phase("json_decode"):
+                        data: dict[str, Any] = json_loads(response.content)
+                return data
+
+            if config.search_cache_ttl > 0:
+                key = hashlib.sha256(
+                    json_dumps(sorted(params.items())).encode()
+                ).hexdigest()
+                with phase("cache_lookup"):
+                    data = search_cache.get(key)
+                current.set_attribute(
+                    "cache.outcome", "miss" if data is None else "hit"
+                )
+                if data is None:
+                    data = await shared_searches.get_or_fetch(
+                        key, fetch, config.search_cache_ttl
+                    )
+                    search_cache.put(key, data)
+            else:
+                data = await fetch()
 
         await ctx.info(f"Found {data.get('count', 0)} {resource_type}")
         return data
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Optional OpenTelemetry tracing for CourtListener MCP Server.
+
+When ``TRACING_ENABLED`` is set and the OpenTelemetry SDK is installed
+(``uv sync --extra tracing``), ``configure_tracing`` installs a tracer
+provider with the configured exporter, and spans are recorded for tool calls,
+CourtListener requests (including rate limiter waits and JSON decoding),
+cache lookups and citeurl calls.
+
+Otherwise ``span`` returns a shared no-op context manager, so instrumented code
+pays only for a function call and a ``None`` check.
+"""
+
+from contextlib import AbstractContextManager, nullcontext
+from typing import TYPE_CHECKING, Any
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+import httpx
+from loguru import logger
+import mcp.types as mt
+
+from app.config import config
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.trace import Tracer
+
+EXPORTERS = ("otlp", "console")
+
+Attributes = dict[str, str | bool | int | float]
+
+
+class _NoopSpan:
+    """Stand-in for a span while tracing is disabled."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Ignore the attribute."""
+
+    def set_attributes(self, attributes: Attributes) -> None:
+        """Ignore the attributes."""
+
+
+_NOOP = nullcontext(_NoopSpan())
+
+_tracer: "Tracer | None" = None
+_provider: "TracerProvider | None" = None
+
+
+def span(
+    name: str, attributes: Attributes | None = None
+) -> AbstractContextManager[Any]:
+    """Start a span as the current span, or do nothing if tracing is off.
+
+    Args:
+        name: The span name, e.g. "courtlistener.search".
+        attributes: Attributes known when the span starts.
+
+    Returns:
+        A context manager yielding the span; attributes learned later (sizes,
+        status codes, cache outcomes) can be added with ``set_attribute``.
+
+    """
+    if _tracer is None:
+        return _NOOP
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def record_response(current: Any, response: httpx.Response) -> None:
+    """Add the status code and body size of an API response to a span.
+
+    Args:
+        current: The span yielded by ``span``.
+        response: The CourtListener API response.
+
+    """
+    if _tracer is None:
+        return
+    current.set_attributes(
+        {
+            "http.response.status_code": response.status_code,
+            "http.response.body.size": len(response.content),
+        }
+    )
+
+
+def is_enabled() -> bool:
+    """Check whether spans are being recorded.
+
+    Returns:
+        True once configure_tracing has installed a tracer provider.
+
+    """
+    return _tracer is not None
+
+
+def configure_tracing() -> bool:
+    """Install a tracer provider and exporter if tracing is enabled.
+
+    Safe to call more than once; only the first successful call has an effect.
+    Missing OpenTelemetry packages or an unknown exporter are logged and leave
+    tracing disabled rather than stopping the server.
+
+    Returns:
+        True if tracing is enabled after the call.
+
+    """
+    global _tracer, _provider
+    if _tracer is not None or not config.tracing_enabled:
+        return _tracer is not None
+    if config.tracing_exporter not in EXPORTERS:
+        logger.warning(
+            f"Unknown TRACING_EXPORTER {config.tracing_exporter!r} "
+            f"(expected one of {EXPORTERS}); tracing disabled"
+        )
+        return False
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+            SpanExporter,
+        )
+
+        exporter: SpanExporter
+        if config.tracing_exporter == "otlp":
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+
+            # With no endpoint the exporter reads OTEL_EXPORTER_OTLP_* variables
+            exporter = OTLPSpanExporter(endpoint=config.tracing_endpoint)
+        else:
+            exporter = ConsoleSpanExporter()
+    except ImportError as e:
+        logger.warning(
+            f"Tracing is enabled but OpenTelemetry is not installed ({e}); "
+            "install the 'tracing' extra"
+        )
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": config.tracing_service_name})
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _provider = provider
+    _tracer = provider.get_tracer("app")
+    logger.info(f"Tracing enabled with the {config.tracing_exporter} exporter")
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and disable tracing."""
+    global _tracer, _provider
+    if _provider is not None:
+        _provider.shutdown()
+    _tracer = _provider = None
+
+
+class TracingMiddleware(Middleware):
+    """FastMCP middleware wrapping each tool call in a span."""
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mt.CallToolRequestParams],
+        call_next: CallNext[mt.CallToolRequestParams, Any],
+    ) -> Any:
+        """Run the tool call inside a span named after the tool."""
+        tool = context.message.name
+        arguments = context.message.arguments or {}
+        with span(
+            f"tools/call {tool}",
+            {"mcp.tool.name": tool, "mcp.tool.arguments": len(arguments)},
+        ) as current:
+            result = await call_next(context)
+            content = getattr(result, "content", None)
+            if content is not None:
+                current.set_attribute("mcp.tool.result.items", len(content))
+            return result
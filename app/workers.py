@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Multi-process HTTP transport.
+
+With ``HTTP_WORKERS`` > 1 the HTTP transport runs that many worker processes
+instead of one, so citeurl parsing and JSON encoding use more than one core:
+
+- each worker binds the port with ``SO_REUSEPORT`` and the kernel spreads
+  incoming connections over them (pre-forked workers, no proxy process);
+- workers serve stateless streamable HTTP, since consecutive requests of one
+  client can reach different workers;
+- workers share the citation lookup and API response caches through the
+  "sqlite" cache backend in ``SHARED_STATE_PATH`` (unless ``CACHE_BACKEND``
+  names another shared backend);
+- each worker gets an equal share of ``COURTLISTENER_MAX_CONCURRENCY``, so
+  the server as a whole never has more requests in flight upstream than one
+  process would (the server runs at most that many workers), and with
+  ``COURTLISTENER_REQUESTS_PER_SECOND`` set, workers reserve request start
+  times from one ``SharedSchedule`` in the same file, so the budget holds for
+  the server rather than per worker;
+- the supervisor (the original process) restarts workers that die and stops
+  all of them on shutdown.
+
+Everything else stays per process: ``/metrics`` and the ``status`` tool report
+only the worker that handled the request and are not aggregated across workers.
+"""
+
+import asyncio
+import multiprocessing
+from multiprocessing.process import BaseProcess
+import signal
+import socket
+import tempfile
+import time
+
+from loguru import logger
+
+from app.config import config
+from app.speedups import run
+
+# Seconds between checks that every worker is still alive
+_SUPERVISE_INTERVAL = 1.0
+# Workers that exit sooner than this after starting are not restarted
+_MIN_UPTIME = 5.0
+# Seconds workers get to shut down before they are killed
+_STOP_TIMEOUT = 10.0
+
+
+def supports_reuse_port() -> bool:
+    """Check whether this platform can run several workers on one port."""
+    return hasattr(socket, "SO_REUSEPORT")
+
+
+def shared_state_path(port: int) -> str:
+    """Get the SQLite file workers share state through.
+
+    Args:
+        port: The port the workers listen on, to keep servers apart.
+
+    Returns:
+        str: SHARED_STATE_PATH, or a per-port file in the temp directory.
+
+    """
+    if config.shared_state_path:
+        return config.shared_state_path
+    return f"{tempfile.gettempdir()}/courtlistener-mcp-{port}.sqlite3"
+
+
+def configure_worker(processes: int, state_path: str) -> None:
+    """Share caches and the upstream rate limit with the other workers.
+
+    Must run in the worker before it serves its first request.
+
+    Args:
+        processes: Total number of worker processes.
+        state_path: SQLite file shared by all workers.
+
+    """
+    from app.ratelimit import SharedSchedule, rate_limiter
+
+    config.shared_state_path = state_path
+    if config.cache_backend.lower() == "local":
+        config.cache_backend = "sqlite"
+    rate_limiter.share(SharedSchedule(state_path), processes)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """Bind a listening socket that other workers can bind too.
+
+    Args:
+        host: Host to bind to.
+        port: Port to bind to.
+
+    Returns:
+        socket.socket: The bound socket; uvicorn starts listening on it.
+
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+async def _serve(
+    index: int,
+    processes: int,
+    host: str,
+    port: int,
+    path: str,
+    log_level: str,
+    state_path: str,
+) -> None:
+    """Serve the MCP server over stateless HTTP in this worker process."""
+    import uvicorn
+
+    from app import server
+    from app.cache_backend import close_cache_backend
+    from app.tracing import configure_tracing, shutdown_tracing
+
+    configure_worker(processes, state_path)
+    configure_tracing()
+    await server.ensure_setup_async()
+    sock = bind_socket(host, port)
+    app = server.mcp.http_app(path=path, transport="http", stateless_http=True)
+    client = server.process_http_client = server.create_http_client()
+    logger.info(f"HTTP worker {index} serving on http://{host}:{port}{path}")
+    try:
+        with server.background_tasks():
+            await uvicorn.Server(
+                uvicorn.Config(
+                    app, log_level=log_level, lifespan="on", timeout_graceful_shutdown=0
+                )
+            ).serve(sockets=[sock])
+    finally:
+        server.process_http_client = None
+        await client.aclose()
+        await close_cache_backend()
+        shutdown_tracing()
+        sock.close()
+
+
+def worker_main(
+    index: int,
+    processes: int,
+    host: str,
+    port: int,
+    path: str,
+    log_level: str,
+    state_path: str,
+) -> None:
+    """Entry point of a worker process.
+
+    Args:
+        index: Worker number, for logs.
+        processes: Total number of worker processes.
+        host: Host to bind to.
+        port: Port to bind to.
+        path: URL path of the MCP endpoint.
+        log_level: uvicorn log level.
+        state_path: SQLite file shared by all workers.
+
+    """
+    try:
+        run(_serve(index, processes, host, port, path, log_level, state_path))
+    except KeyboardInterrupt:
+        pass
+
+
+async def run_workers(
+    processes: int, host: str, port: int, path: str, log_level: str
+) -> None:
+    """Run the HTTP transport in several worker processes until cancelled.
+
+    Args:
+        processes: Number of worker processes.
+        host: Host to bind to.
+        port: Port to listen on.
+        path: URL path of the MCP endpoint.
+        log_level: uvicorn log level.
+
+    Raises:
+        RuntimeError: If the platform lacks SO_REUSEPORT, or a worker exits
+            right after starting (e.g. because the port is in use).
+
+    """
+    if not supports_reuse_port():
+        raise RuntimeError("Multiple HTTP workers need SO_REUSEPORT support")
+
+    state_path = shared_state_path(port)
+    logger.info(f"Workers share caches and the rate limit through {state_path}")
+    # Spawned rather than forked: the supervisor's event loop and threads
+    # must not leak into the workers
+    context = multiprocessing.get_context("spawn")
+    started: dict[int, tuple[BaseProcess, float]] = {}
+
+    def start(index: int) -> None:
+        process = context.Process(
+            target=worker_main,
+            args=(index, processes, host, port, path, log_level, state_path),
+            name=f"mcp-http-worker-{index}",
+        )
+        process.start()
+        started[index] = (process, time.monotonic())
+
+    # Stop the workers on SIGTERM too, not just on Ctrl-C
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    if task is not None:
+        loop.add_signal_handler(signal.SIGTERM, task.cancel)
+    try:
+        for index in range(processes):
+            start(index)
+        while True:
+            await asyncio.sleep(_SUPERVISE_INTERVAL)
+            for index, (process, started_at) in list(started.items()):
+                if process.is_alive():
+                    continue
+                if time.monotonic() - started_at < _MIN_UPTIME:
+                    raise RuntimeError(
+                        f"HTTP worker {index} exited during startup "
+                        f"(exit code {process.exitcode})"
+                    )
+                logger.warning(
+                    f"HTTP worker {index} exited with code {process.exitcode}; "
+                    "restarting it"
+                )
+                start(index)
+    finally:
+        loop.remove_signal_handler(signal.SIGTERM)
+        for process, _ in started.values():
+            process.terminate()
+        for process, _ in started.values():
+            await asyncio.to_thread(process.join, _STOP_TIMEOUT)
+            if process.is_alive():
+                process.kill()
+        logger.info("HTTP workers stopped")
@@ -0,0 +1 @@
+"""Benchmarks for CourtListener MCP server."""
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the CPU-bound citation path, with stored baselines.
+
+Measures the functions behind ``verify_citation_format``,
+``parse_citation_with_citeurl`` and ``extract_citations_from_text`` on the
+opinions and briefs in ``benchmarks/corpus/`` at several document sizes:
+
+- verify / parse: citations per second with a cold parse cache, using every
+  citation found in the corpus plus case and spacing variants;
+- extract: MB and citations per second over each document, repeated to get
+  small, medium and large inputs.
+
+Each case also records its peak traced memory. Results are compared against
+``benchmarks/baselines/citations.json`` and the run fails when a case is
+slower (or uses more memory) than its baseline by more than the threshold.
+Baselines are machine-specific; re-record them with ``--save-baseline`` when
+moving to new hardware or after an intentional change.
+
+Usage:
+    uv run python -m benchmarks.bench_citations
+    uv run python -m benchmarks.bench_citations --threshold 0.15 --rounds 7
+    uv run python -m benchmarks.bench_citations --save-baseline
+"""
+
+import argparse
+from collections.abc import Callable
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+from app.citator import get_template_set, list_citations, parse_cache, parse_citation
+from app.tools.citation import _verify_citation
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+BASELINE_PATH = Path(__file__).parent / "baselines" / "citations.json"
+
+# Times each document is repeated for the small, medium and large inputs
+SIZES = {"1x": 1, "5x": 5, "25x": 25}
+
+
+@dataclass
+class Case:
+    """One benchmark case.
+
+    Attributes:
+        name: Stable identifier used in the baseline file.
+        run: Runs the workload once and returns the number of citations.
+        size_bytes: Input size for MB/s, or 0 for per-citation cases.
+        setup: Runs before every timed round (e.g. to clear caches).
+
+    """
+
+    name: str
+    run: Callable[[], int]
+    size_bytes: int = 0
+    setup: Callable[[], None] = lambda: None
+
+
+def _citations(documents: dict[str, str]) -> list[str]:
+    """Collect distinct citation strings from the corpus, with variants."""
+    found = dict.fromkeys(
+        citation.text
+        for text in documents.values()
+        for citation in list_citations(text)
+        if citation.parent is None
+    )
+    variants = [
+        variant
+        for citation in found
+        for variant in (citation, citation.lower(), citation.replace(" ", "  "))
+    ]
+    return list(dict.fromkeys(variants))
+
+
+def build_cases() -> list[Case]:
+    """Build the benchmark cases from the corpus."""
+    documents = {
+        path.stem: path.read_text(encoding="utf-8")
+        for path in sorted(CORPUS_DIR.glob("*.txt"))
+    }
+    citations = _citations(documents)
+
+    def verify() -> int:
+        for citation in citations:
+            _verify_citation(citation)
+        return len(citations)
+
+    def parse() -> int:
+        for citation in citations:
+            parsed = parse_citation(citation, broad=True)
+            if parsed is not None:
+                parsed.to_dict()
+        return len(citations)
+
+    cases = [
+        Case("verify_citation_format", verify, setup=parse_cache.clear),
+        Case("parse_citation_with_citeurl", parse, setup=parse_cache.clear),
+    ]
+    for stem, text in documents.items():
+        for label, repeat in SIZES.items():
+            document = "\n\n".join([text] * repeat)
+            cases.append(
+                Case(
+                    f"extract_citations_from_text:{stem}:{label}",
+                    lambda document=document: len(list_citations(document)),  # type: ignore[misc]
+                    size_bytes=len(document.encode()),
+                )
+            )
+    return cases
+
+
+def measure(case: Case, rounds: int) -> dict[str, Any]:
+    """Time a case and record its peak memory.
+
+    Args:
+        case: The case to run.
+        rounds: Timed rounds; the fastest is reported.
+
+    Returns:
+        dict[str, Any]: Citations, best time, throughput and peak memory.
+
+    """
+    best = float("inf")
+    citations = 0
+    for _ in range(rounds):
+        case.setup()
+        start = time.perf_counter()
+        citations = case.run()
+        best = min(best, time.perf_counter() - start)
+
+    case.setup()
+    tracemalloc.start()
+    try:
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = {
+        "citations": citations,
+        "seconds": round(best, 6),
+        "citations_per_second": round(citations / best, 1),
+        "peak_kb": round(peak / 1024, 1),
+    }
+    if case.size_bytes:
+        result["mb_per_second"] = round(case.size_bytes / best / 1_000_000, 3)
+    return result
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float,
+) -> list[str]:
+    """Find cases that regressed against the baseline.
+
+    Args:
+        results: Results of this run, by case name.
+        baseline: Stored results, by case name.
+        threshold: Allowed fractional slowdown or memory growth.
+
+    Returns:
+        list[str]: One description per regression.
+
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result["citations"] != expected["citations"]:
+            regressions.append(
+                f"{name}: found {result['citations']} citations, "
+                f"baseline found {expected['citations']}"
+            )
+        floor = expected["citations_per_second"] * (1 - threshold)
+        if result["citations_per_second"] < floor:
+            regressions.append(
+                f"{name}: {result['citations_per_second']} citations/s, "
+                f"baseline {expected['citations_per_second']}"
+            )
+        ceiling = expected["peak_kb"] * (1 + threshold)
+        if result["peak_kb"] > ceiling:
+            regressions.append(
+                f"{name}: peak {result['peak_kb']}KB, baseline {expected['peak_kb']}KB"
+            )
+    return regressions
+
+
+def main() -> None:
+    """Run the citation benchmarks and check them against the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5, help="Timing rounds per case")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown or memory growth versus the baseline (0.25 = 25%%)",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store this run as the baseline"
+    )
+    parser.add_argument("--filter", default="", help="Only run cases containing this")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON")
+    args = parser.parse_args()
+
+    get_template_set()  # build the citator outside the timed region
+    results = {}
+    print(
+        f"{'case':<58} {'cites':>6} {'time':>10} {'cites/s':>10} {'MB/s':>7} {'peak':>9}"
+    )
+    for case in build_cases():
+        if args.filter not in case.name:
+            continue
+        result = measure(case, args.rounds)
+        results[case.name] = result
+        print(
+            f"{case.name:<58} {result['citations']:>6} {result['seconds'] * 1000:>8.1f}ms "
+            f"{result['citations_per_second']:>10.0f} "
+            f"{result.get('mb_per_second', 0):>7.2f} {result['peak_kb']:>7.0f}KB"
+        )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["cases"]
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
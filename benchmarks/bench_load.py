@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""End-to-end load test of the MCP server over streamable HTTP.
+
+Starts the mock CourtListener API (``benchmarks/mock_courtlistener.py``) and
+the server pointed at it, then drives the server with many concurrent MCP
+clients running a weighted mix of search, get and citation tool calls. Reports
+p50/p95/p99 latency per operation and overall throughput, plus the request and
+injected-failure counts seen by the mock API.
+
+Usage:
+    uv run python -m benchmarks.bench_load
+    uv run python -m benchmarks.bench_load --clients 50 --duration 60 \\
+        --mix search=2,get=3,citation=5 --error-rate 0.01 --rate-limit-rate 0.02
+    uv run python -m benchmarks.bench_load --mcp-url http://127.0.0.1:8000/mcp/
+"""
+
+import argparse
+import asyncio
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import random
+import subprocess
+import sys
+import time
+from typing import Any
+
+from fastmcp import Client
+import httpx
+from mcp import McpError
+
+from benchmarks.bench_startup import _free_port
+
+ROOT = Path(__file__).parent.parent
+CORPUS_DIR = Path(__file__).parent / "corpus"
+
+QUERIES = [
+    "fourth amendment search",
+    "qualified immunity",
+    "attorney fees 1988",
+    "due process",
+    "summary judgment standard",
+    "habeas corpus",
+]
+
+Operation = tuple[str, dict[str, Any]]
+
+
+@dataclass
+class Results:
+    """Latencies and failures recorded by the workers."""
+
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def record(self, op: str, seconds: float, ok: bool) -> None:
+        """Record one call."""
+        self.latencies.setdefault(op, []).append(seconds)
+        if not ok:
+            self.errors[op] = self.errors.get(op, 0) + 1
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    index = max(0, min(len(values) - 1, round(q / 100 * len(values) + 0.5) - 1))
+    return values[index]
+
+
+def _summary(values: list[float], errors: int) -> dict[str, Any]:
+    """Summarize latencies in milliseconds."""
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+        "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(_percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+def _paragraphs() -> list[str]:
+    """Paragraphs with citations from the corpus, for extraction workloads."""
+    text = "\n\n".join(p.read_text(encoding="utf-8") for p in CORPUS_DIR.glob("*.txt"))
+    paragraphs = [p for p in text.split("\n\n") if any(c.isdigit() for c in p)]
+    return paragraphs or ["See Roe v. Wade, 410 U.S. 113 (1973). Id. at 120."]
+
+
+def _workloads(
+    paragraphs: list[str],
+) -> dict[str, Callable[[random.Random], Operation]]:
+    """Tool calls for each workload class."""
+
+    def search(rng: random.Random) -> Operation:
+        return "search_opinions", {"q": rng.choice(QUERIES), "limit": 20}
+
+    def get(rng: random.Random) -> Operation:
+        record_id = str(rng.randint(1, 200_000))
+        return rng.choice(
+            [
+                ("get_opinion", {"opinion_id": record_id}),
+                ("get_cluster", {"cluster_id": record_id}),
+                ("get_docket", {"docket_id": record_id}),
+            ]
+        )
+
+    def citation(rng: random.Random) -> Operation:
+        # A few hundred distinct citations, so the lookup cache sees both
+        # hits and misses
+        cite = f"{rng.randint(300, 600)} U.S. {rng.randint(1, 500)}"
+        excerpt = "\n\n".join(rng.sample(paragraphs, min(3, len(paragraphs))))
+        return rng.choice(
+            [
+                ("citation_lookup_citation", {"citation": cite}),
+                ("citation_verify_citation_format", {"citation": cite}),
+                ("citation_extract_citations_from_text", {"text": excerpt}),
+                ("citation_resolve_citations_in_text", {"text": excerpt}),
+            ]
+        )
+
+    return {"search": search, "get": get, "citation": citation}
+
+
+async def _discard_log(message: Any) -> None:
+    """Drop server log notifications instead of printing them."""
+
+
+def _parse_mix(mix: str) -> dict[str, int]:
+    """Parse "search=3,get=4,citation=3" into weights."""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = int(weight or 1)
+    return weights
+
+
+async def _worker(
+    url: str,
+    deadline: float,
+    max_requests: int | None,
+    weights: dict[str, int],
+    workloads: dict[str, Callable[[random.Random], Operation]],
+    results: Results,
+    seed: int,
+) -> None:
+    """Run tool calls on one MCP session until the deadline."""
+    rng = random.Random(seed)
+    names = list(weights)
+    counts = [weights[name] for name in names]
+    done = 0
+    async with Client(url, timeout=120, log_handler=_discard_log) as client:
+        while time.perf_counter() < deadline and (
+            max_requests is None or done < max_requests
+        ):
+            workload = rng.choices(names, counts)[0]
+            tool, arguments = workloads[workload](rng)
+            start = time.perf_counter()
+            try:
+                result = await client.call_tool(tool, arguments, raise_on_error=False)
+                ok = not result.is_error
+            except (httpx.HTTPError, McpError, RuntimeError):
+                ok = False
+            results.record(workload, time.perf_counter() - start, ok)
+            done += 1
+
+
+@contextmanager
+def _process(args: list[str], env: dict[str, str]) -> Iterator[subprocess.Popen[bytes]]:
+    """Run a background process for the duration of the block."""
+    process = subprocess.Popen(
+        args, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        yield process
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+async def _wait_until_ready(check: Callable[[], Any], timeout: float) -> None:
+    """Retry an async readiness check until it succeeds."""
+    start = time.perf_counter()
+    while True:
+        try:
+            await check()
+            return
+        except Exception:
+            if time.perf_counter() - start > timeout:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run_load(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the load test against a server at args.mcp_url."""
+    weights = _parse_mix(args.mix)
+    workloads = _workloads(_paragraphs())
+    unknown = set(weights) - set(workloads)
+    if unknown:
+        raise SystemExit(f"Unknown workloads in --mix: {', '.join(sorted(unknown))}")
+
+    async def connect() -> None:
+        async with Client(args.mcp_url) as client:
+            await client.ping()
+
+    await _wait_until_ready(connect, args.timeout)
+
+    # Warm up the server (citator build, connection pool) outside the timing
+    async with Client(args.mcp_url, timeout=120, log_handler=_discard_log) as client:
+        await client.call_tool(
+            "citation_verify_citation_format", {"citation": "410 U.S. 113"}
+        )
+
+    results = Results()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    per_client = (
+        None if args.requests is None else max(1, args.requests // args.clients)
+    )
+    await asyncio.gather(
+        *(
+            _worker(
+                args.mcp_url, deadline, per_client, weights, workloads, results, seed
+            )
+            for seed in range(args.clients)
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    every = [latency for values in results.latencies.values() for latency in values]
+    total_errors = sum(results.errors.values())
+    return {
+        "clients": args.clients,
+        "duration_s": round(elapsed, 2),
+        "mix": weights,
+        "requests": len(every),
+        "requests_per_second": round(len(every) / elapsed, 2),
+        "error_rate": round(total_errors / len(every), 4) if every else 0.0,
+        "overall": _summary(every, total_errors) if every else None,
+        "operations": {
+            op: _summary(values, results.errors.get(op, 0))
+            for op, values in sorted(results.latencies.items())
+        },
+    }
+
+
+async def _mock_stats(base_url: str) -> dict[str, Any]:
+    """Get the mock API's request counters."""
+    async with httpx.AsyncClient() as client:
+        response = await client.get(f"{base_url}/__mock__/stats")
+        response.raise_for_status()
+        return response.json()["stats"]
+
+
+def _print_summary(report: dict[str, Any]) -> None:
+    """Print a latency table to stderr."""
+    out = sys.stderr
+    print(
+        f"{report['requests']} requests from {report['clients']} clients in "
+        f"{report['duration_s']}s: {report['requests_per_second']} req/s, "
+        f"error rate {report['error_rate']:.2%}",
+        file=out,
+    )
+    print(
+        f"{'operation':<10} {'count':>7} {'errors':>7} {'p50':>9} {'p95':>9} {'p99':>9}",
+        file=out,
+    )
+    rows = {**report["operations"], "overall": report["overall"]}
+    for op, row in rows.items():
+        if row:
+            print(
+                f"{op:<10} {row['count']:>7} {row['errors']:>7} {row['p50_ms']:>7.1f}ms "
+                f"{row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms",
+                file=out,
+            )
+    if "mock_api" in report:
+        print(f"mock API: {report['mock_api']}", file=out)
+
+
+def main() -> None:
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--clients", type=int, default=20, help="Concurrent MCP sessions"
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--requests", type=int, help="Stop after about this many calls")
+    parser.add_argument(
+        "--mix", default="search=3,get=4,citation=3", help="Workload weights"
+    )
+    parser.add_argument(
+        "--mcp-url", help="Use an already running server instead of starting one"
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=50.0, help="Mock API latency"
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=20.0, help="Mock API latency tail"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Mock API 500 rate"
+    )
+    parser.add_argument(
+        "--rate-limit-rate", type=float, default=0.0, help="Mock API 429 rate"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=60.0, help="Seconds to wait for startup"
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Write JSON results here instead of stdout"
+    )
+    args = parser.parse_args()
+
+    if args.mcp_url:
+        report = asyncio.run(run_load(args))
+    else:
+        mock_port, mcp_port = _free_port(), _free_port()
+        mock_url = f"http://127.0.0.1:{mock_port}"
+        env = {
+            **os.environ,
+            "COURT_LISTENER_API_KEY": os.environ.get(
+                "COURT_LISTENER_API_KEY", "benchmark"
+            ),
+            "COURTLISTENER_BASE_URL": f"{mock_url}/api/rest/v4/",
+        }
+        mock_args = [
+            sys.executable,
+            "-m",
+            "benchmarks.mock_courtlistener",
+            "--port",
+            str(mock_port),
+            "--latency-ms",
+            str(args.latency_ms),
+            "--jitter-ms",
+            str(args.jitter_ms),
+            "--error-rate",
+            str(args.error_rate),
+            "--rate-limit-rate",
+            str(args.rate_limit_rate),
+        ]
+        server_args = [
+            sys.executable,
+            "-m",
+            "app",
+            "--transport",
+            "http",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(mcp_port),
+            "--log-level",
+            "warning",
+        ]
+        args.mcp_url = f"http://127.0.0.1:{mcp_port}/mcp/"
+        with _process(mock_args, env), _process(server_args, env):
+            report = asyncio.run(run_load(args))
+            report["mock_api"] = asyncio.run(_mock_stats(mock_url))
+
+    _print_summary(report)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark citation extraction with and without the literal prefilter.
+
+Compares citeurl's ``list_cites`` against ``app.citator.list_citations`` on the
+opinion and brief texts in ``benchmarks/corpus/``, checks that both return the
+same citations, and reports throughput.
+
+Usage:
+    uv run python -m benchmarks.bench_prefilter
+    uv run python -m benchmarks.bench_prefilter --repeat 50 --rounds 5
+"""
+
+import argparse
+from collections.abc import Callable
+from pathlib import Path
+import time
+from typing import Any
+
+from citeurl import list_cites  # type: ignore[import-untyped]
+
+from app.citator import get_citator, get_prefilter, list_citations
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+
+
+def _best_time(func: Callable[[], Any], rounds: int) -> float:
+    """Return the fastest wall-clock time of several runs, in seconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the prefilter benchmark over every corpus file."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="Times to concatenate each document"
+    )
+    parser.add_argument("--rounds", type=int, default=3, help="Timing rounds per case")
+    args = parser.parse_args()
+
+    citator = get_citator()
+    get_prefilter()  # build outside the timed region
+
+    print(
+        f"{'document':<34} {'KB':>7} {'cites':>6} {'citeurl':>10} {'prefilter':>10} {'speedup':>8}"
+    )
+    for path in sorted(CORPUS_DIR.glob("*.txt")):
+        text = path.read_text(encoding="utf-8") * args.repeat
+
+        expected = [(c.span, c.text) for c in list_cites(text, citator=citator)]
+        actual = [(c.span, c.text) for c in list_citations(text)]
+        if expected != actual:
+            raise SystemExit(
+                f"{path.name}: prefiltered extraction differs from citeurl"
+            )
+
+        baseline = _best_time(
+            lambda text=text: list_cites(text, citator=citator), args.rounds
+        )
+        filtered = _best_time(lambda text=text: list_citations(text), args.rounds)
+        print(
+            f"{path.name:<34} {len(text) / 1024:>7.1f} {len(actual):>6} "
+            f"{baseline * 1000:>8.1f}ms {filtered * 1000:>8.1f}ms {baseline / filtered:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
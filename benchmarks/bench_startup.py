@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""Benchmark server cold start.
+
+Starts the server in fresh interpreters and measures:
+
+- the ``-X importtime`` breakdown of ``import app.server``;
+- each ``import_server`` step of ``setup()``, and the citator build (citeurl
+  import plus template compilation);
+- time from process start to a completed MCP handshake, and to the first
+  citation tool response, over stdio and streamable HTTP.
+
+Results are printed as a summary table on stderr and written as JSON, so runs
+on different commits can be compared.
+
+Usage:
+    uv run python -m benchmarks.bench_startup
+    uv run python -m benchmarks.bench_startup --runs 10 --output startup.json
+    uv run python -m benchmarks.bench_startup --transport stdio
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+import platform
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from fastmcp import Client
+
+# fastmcp is imported inside the measurements, so that the --probe
+# interpreter starts as cold as the server does
+ROOT = Path(__file__).parent.parent
+
+# A citation tool that needs no network access but does need the citator
+FIRST_TOOL = "citation_verify_citation_format"
+FIRST_TOOL_ARGS = {"citation": "410 U.S. 113"}
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def _env() -> dict[str, str]:
+    """Environment for server processes (the API key is never used)."""
+    return {
+        **os.environ,
+        "COURT_LISTENER_API_KEY": os.environ.get("COURT_LISTENER_API_KEY", "benchmark"),
+    }
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    """Summarize timings in milliseconds."""
+    return {
+        "min_ms": round(min(values) * 1000, 2),
+        "median_ms": round(statistics.median(values) * 1000, 2),
+        "max_ms": round(max(values) * 1000, 2),
+    }
+
+
+def measure_importtime(top: int) -> dict[str, Any]:
+    """Import the server once with ``-X importtime`` and rank the modules.
+
+    Args:
+        top: Number of modules and packages to report.
+
+    Returns:
+        dict[str, Any]: Total import time, the slowest modules by cumulative
+        time, and self time summed per top-level package.
+
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.server"],
+        cwd=ROOT,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us), len(indent)))
+
+    per_package: dict[str, int] = {}
+    for name, self_us, _, _ in modules:
+        package = name.split(".")[0]
+        per_package[package] = per_package.get(package, 0) + self_us
+    root = next((m for m in modules if m[0] == "app.server"), None)
+
+    return {
+        "total_ms": round(root[2] / 1000, 2) if root else None,
+        "slowest_modules": [
+            {
+                "module": name,
+                "self_ms": round(s / 1000, 2),
+                "cumulative_ms": round(c / 1000, 2),
+            }
+            for name, s, c, _ in sorted(modules, key=lambda m: -m[2])[:top]
+        ],
+        "packages": [
+            {"package": package, "self_ms": round(us / 1000, 2)}
+            for package, us in sorted(per_package.items(), key=lambda p: -p[1])[:top]
+        ],
+    }
+
+
+def _probe() -> None:
+    """Time server setup steps in this (fresh) interpreter and print JSON."""
+    timings: dict[str, float] = {}
+
+    start = time.perf_counter()
+    from app import server
+
+    timings["import_app_server"] = time.perf_counter() - start
+
+    import_server = server.mcp.import_server
+
+    async def timed_import_server(subserver: Any, prefix: str | None = None) -> None:
+        step = time.perf_counter()
+        await import_server(subserver, prefix)
+        timings[f"import_server:{prefix}"] = time.perf_counter() - step
+
+    server.mcp.import_server = timed_import_server  # type: ignore[method-assign,assignment]
+    start = time.perf_counter()
+    asyncio.run(server.setup())
+    timings["setup"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    import citeurl  # type: ignore[import-untyped] # noqa: F401
+
+    timings["import_citeurl"] = time.perf_counter() - start
+
+    from app.citator import get_template_set
+
+    start = time.perf_counter()
+    get_template_set()
+    timings["citator_build"] = time.perf_counter() - start
+
+    print(json.dumps(timings))
+
+
+def measure_setup(runs: int) -> dict[str, dict[str, float]]:
+    """Run the setup probe in fresh interpreters.
+
+    Args:
+        runs: Number of cold starts.
+
+    Returns:
+        dict[str, dict[str, float]]: Timing summary per setup step.
+
+    """
+    samples: dict[str, list[float]] = {}
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_startup", "--probe"],
+            cwd=ROOT,
+            env=_env(),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        for step, seconds in timings.items():
+            samples.setdefault(step, []).append(seconds)
+    return {step: _summary(values) for step, values in samples.items()}
+
+
+async def _first_tool(client: "Client[Any]") -> float:
+    """Call the benchmark tool and return how long it took."""
+    start = time.perf_counter()
+    await client.call_tool(FIRST_TOOL, FIRST_TOOL_ARGS)
+    return time.perf_counter() - start
+
+
+async def measure_stdio(runs: int) -> dict[str, dict[str, float]]:
+    """Cold-start the server over stdio.
+
+    Args:
+        runs: Number of cold starts.
+
+    Returns:
+        dict[str, dict[str, float]]: Handshake and first-tool timing summaries.
+
+    """
+    from fastmcp import Client
+    from fastmcp.client.transports import StdioTransport
+
+    handshake, first_tool = [], []
+    for _ in range(runs):
+        transport = StdioTransport(
+            sys.executable,
+            ["-m", "app", "--transport", "stdio"],
+            env=_env(),
+            cwd=str(ROOT),
+            keep_alive=False,
+        )
+        start = time.perf_counter()
+        async with Client(transport) as client:
+            handshake.append(time.perf_counter() - start)
+            first_tool.append(await _first_tool(client))
+    return {"handshake": _summary(handshake), "first_tool": _summary(first_tool)}
+
+
+def _free_port() -> int:
+    """Get a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+async def measure_http(runs: int, timeout: float) -> dict[str, dict[str, float]]:
+    """Cold-start the server over streamable HTTP.
+
+    The handshake time runs from process start until an MCP session can be
+    initialized, so it includes binding the port.
+
+    Args:
+        runs: Number of cold starts.
+        timeout: Seconds to wait for each server to accept connections.
+
+    Returns:
+        dict[str, dict[str, float]]: Handshake and first-tool timing summaries.
+
+    """
+    from fastmcp import Client
+    import httpx
+
+    handshake, first_tool = [], []
+    for _ in range(runs):
+        port = _free_port()
+        start = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "app",
+            "--transport",
+            "http",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            cwd=ROOT,
+            env=_env(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            while True:
+                try:
+                    client: Client[Any] = Client(f"http://127.0.0.1:{port}/mcp/")
+                    async with client:
+                        handshake.append(time.perf_counter() - start)
+                        first_tool.append(await _first_tool(client))
+                    break
+                except (httpx.HTTPError, RuntimeError):
+                    # fastmcp reports a refused connection as a RuntimeError
+                    if process.returncode is not None:
+                        raise SystemExit(
+                            f"HTTP server exited with code {process.returncode}"
+                        ) from None
+                    if time.perf_counter() - start > timeout:
+                        raise SystemExit("HTTP server did not start in time") from None
+                    await asyncio.sleep(0.02)
+        finally:
+            if process.returncode is None:
+                process.terminate()
+            await asyncio.wait_for(process.wait(), 10)
+    return {"handshake": _summary(handshake), "first_tool": _summary(first_tool)}
+
+
+def _commit() -> str | None:
+    """Get the current git commit, if available."""
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return result.stdout.strip() or None
+
+
+def _print_summary(results: dict[str, Any]) -> None:
+    """Print a human-readable summary to stderr."""
+    out = sys.stderr
+    print(f"import app.server: {results['importtime']['total_ms']}ms", file=out)
+    for package in results["importtime"]["packages"]:
+        print(f"  {package['package']:<28} {package['self_ms']:>9.1f}ms self", file=out)
+    print("setup steps (median):", file=out)
+    for step, summary in results["setup"].items():
+        print(f"  {step:<28} {summary['median_ms']:>9.1f}ms", file=out)
+    for transport in ("stdio", "http"):
+        if transport in results:
+            timings = results[transport]
+            print(
+                f"{transport}: handshake {timings['handshake']['median_ms']:.1f}ms, "
+                f"first tool {timings['first_tool']['median_ms']:.1f}ms (median)",
+                file=out,
+            )
+
+
+def main() -> None:
+    """Run the startup benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Cold starts per measurement"
+    )
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "http", "both", "none"],
+        default="both",
+        help="Transports to measure handshake and first tool call on",
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="Modules and packages to report"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="Seconds to wait for an HTTP server"
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Write JSON results here instead of stdout"
+    )
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        _probe()
+        return
+
+    results: dict[str, Any] = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "importtime": measure_importtime(args.top),
+        "setup": measure_setup(args.runs),
+    }
+    if args.transport in ("stdio", "both"):
+        results["stdio"] = asyncio.run(measure_stdio(args.runs))
+    if args.transport in ("http", "both"):
+        results["http"] = asyncio.run(measure_http(args.runs, args.timeout))
+
+    _print_summary(results)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
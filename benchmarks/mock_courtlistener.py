@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""Local stand-in for the CourtListener REST API, for load testing.
+
+Serves the endpoints the server uses (``search/``, ``citation-lookup/`` and
+record GETs such as ``opinions/<id>/``) with deterministic, realistically
+sized payloads: opinions carry tens of KB of text, clusters and search hits
+carry the fields CourtListener returns. Latency, server errors and 429
+rate-limit responses can be injected to see how the MCP stack behaves under
+a slow or unreliable upstream.
+
+Usage:
+    uv run python -m benchmarks.mock_courtlistener --port 8800
+    uv run python -m benchmarks.mock_courtlistener --latency-ms 80 --jitter-ms 40 \\
+        --error-rate 0.01 --rate-limit-rate 0.02
+
+Point the server at it with
+``COURTLISTENER_BASE_URL=http://127.0.0.1:8800/api/rest/v4/``.
+``GET /__mock__/stats`` reports request and injected-failure counts.
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import asdict, dataclass
+import hashlib
+from pathlib import Path
+import random
+import re
+from typing import Any
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+API_PREFIX = "/api/rest/v4"
+CORPUS_DIR = Path(__file__).parent / "corpus"
+
+# Reporters recognized by the mock citation lookup
+_CITATION = re.compile(
+    r"\b(\d{1,4})\s+"
+    r"(U\.\s?S\.|S\.\s?Ct\.|L\.\s?Ed\.(?:\s?2d)?|F\.(?:\s?(?:2d|3d|4th))?"
+    r"|F\.\s?Supp\.(?:\s?(?:2d|3d))?|F\.\s?App'x)"
+    r"\s+(\d{1,5})\b"
+)
+
+_WORDS = (
+    "court plaintiff defendant appeal judgment motion evidence statute "
+    "constitutional review standard district circuit claim rights counsel "
+    "jurisdiction remand reverse affirm summary trial jury officer search"
+).split()
+
+
+@dataclass
+class MockSettings:
+    """Behaviour of the mock API.
+
+    Attributes:
+        latency_ms: Base latency added to every response.
+        jitter_ms: Mean of an exponentially distributed extra delay, giving
+            a long latency tail.
+        error_rate: Fraction of requests answered with HTTP 500.
+        rate_limit_rate: Fraction of requests answered with HTTP 429.
+        retry_after: Retry-After seconds sent with 429 responses.
+        opinion_kb: Approximate size of each opinion's plain text.
+        search_results: Results per search page.
+        not_found_rate: Fraction of looked-up citations reported as 404.
+        seed: Seed for the injected delays and failures.
+
+    """
+
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: int = 1
+    opinion_kb: int = 40
+    search_results: int = 20
+    not_found_rate: float = 0.1
+    seed: int | None = None
+
+
+def _rng(*parts: Any) -> random.Random:
+    """Get a random generator seeded from the request, for stable payloads."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).digest()
+    return random.Random(int.from_bytes(digest))
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    """Build filler text."""
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _load_corpus() -> str:
+    """Read the benchmark corpus used as opinion text."""
+    texts = [p.read_text(encoding="utf-8") for p in sorted(CORPUS_DIR.glob("*.txt"))]
+    return "\n\n".join(texts) or "See Roe v. Wade, 410 U.S. 113 (1973)."
+
+
+class MockCourtListener:
+    """Request handlers and counters for one mock API instance."""
+
+    def __init__(self, settings: MockSettings) -> None:
+        """Create the handlers.
+
+        Args:
+            settings: Latency, failure and payload settings.
+
+        """
+        self.settings = settings
+        self.stats: Counter[str] = Counter()
+        self._rng = random.Random(settings.seed)
+        corpus = _load_corpus()
+        size = settings.opinion_kb * 1024
+        self._opinion_text = (corpus * (size // len(corpus) + 1))[:size]
+
+    def _url(self, request: Request, endpoint: str, record_id: int) -> str:
+        """Build an API URL for a record."""
+        return f"{request.base_url}{API_PREFIX[1:]}/{endpoint}/{record_id}/"
+
+    async def _inject(self) -> Response | None:
+        """Delay the response and maybe replace it with a failure."""
+        settings = self.settings
+        delay = settings.latency_ms
+        if settings.jitter_ms > 0:
+            delay += self._rng.expovariate(1 / settings.jitter_ms)
+        await asyncio.sleep(delay / 1000)
+
+        roll = self._rng.random()
+        if roll < settings.rate_limit_rate:
+            self.stats["rate_limited"] += 1
+            return JSONResponse(
+                {"detail": "Request was throttled."},
+                status_code=429,
+                headers={"Retry-After": str(settings.retry_after)},
+            )
+        if roll < settings.rate_limit_rate + settings.error_rate:
+            self.stats["errors"] += 1
+            return JSONResponse({"detail": "Internal server error"}, status_code=500)
+        return None
+
+    def _cluster(self, request: Request, cluster_id: int) -> dict[str, Any]:
+        """Build a cluster record."""
+        rng = _rng("cluster", cluster_id)
+        opinion_id = cluster_id * 10
+        volume, page = rng.randint(300, 600), rng.randint(1, 1200)
+        return {
+            "id": cluster_id,
+            "resource_uri": self._url(request, "clusters", cluster_id),
+            "absolute_url": f"/opinion/{cluster_id}/mock-case-{cluster_id}/",
+            "case_name": f"{rng.choice(_WORDS).title()} v. {rng.choice(_WORDS).title()}",
+            "case_name_full": _sentence(rng, 12),
+            "date_filed": f"{rng.randint(1950, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "judges": ", ".join(rng.choice(_WORDS).title() for _ in range(3)),
+            "citation_count": rng.randint(0, 5000),
+            "precedential_status": "Published",
+            "citations": [
+                {"volume": volume, "reporter": "U.S.", "page": page, "type": 1}
+            ],
+            "syllabus": " ".join(_sentence(rng, 20) for _ in range(8)),
+            "sub_opinions": [self._url(request, "opinions", opinion_id)],
+            "docket": self._url(request, "dockets", cluster_id),
+        }
+
+    def _opinion(self, request: Request, opinion_id: int) -> dict[str, Any]:
+        """Build an opinion record with a long plain text."""
+        rng = _rng("opinion", opinion_id)
+        cited = rng.sample(range(1, 1_000_000), rng.randint(5, 30))
+        return {
+            "id": opinion_id,
+            "resource_uri": self._url(request, "opinions", opinion_id),
+            "absolute_url": f"/opinion/{opinion_id // 10}/mock/",
+            "cluster": self._url(request, "clusters", max(opinion_id // 10, 1)),
+            "author_str": rng.choice(_WORDS).title(),
+            "type": "010combined",
+            "date_created": "2024-01-01T00:00:00Z",
+            "plain_text": self._opinion_text,
+            "html_with_citations": "",
+            "opinions_cited": [self._url(request, "opinions", i) for i in cited],
+        }
+
+    def _record(
+        self, request: Request, endpoint: str, record_id: int
+    ) -> dict[str, Any]:
+        """Build a record for any other endpoint."""
+        rng = _rng(endpoint, record_id)
+        return {
+            "id": record_id,
+            "resource_uri": self._url(request, endpoint, record_id),
+            "name": _sentence(rng, 6),
+            "description": " ".join(_sentence(rng, 20) for _ in range(5)),
+            "date_created": "2024-01-01T00:00:00Z",
+        }
+
+    async def get_record(self, request: Request) -> Response:
+        """Handle GET <endpoint>/<id>/, honouring the fields parameter."""
+        self.stats["requests"] += 1
+        self.stats[f"get:{request.path_params['endpoint']}"] += 1
+        if failure := await self._inject():
+            return failure
+
+        endpoint = request.path_params["endpoint"]
+        record_id = request.path_params["record_id"]
+        if endpoint == "opinions":
+            record = self._opinion(request, record_id)
+        elif endpoint == "clusters":
+            record = self._cluster(request, record_id)
+        else:
+            record = self._record(request, endpoint, record_id)
+
+        if fields := request.query_params.get("fields"):
+            wanted = set(fields.split(","))
+            record = {k: v for k, v in record.items() if k in wanted}
+        return JSONResponse(record)
+
+    async def search(self, request: Request) -> Response:
+        """Handle GET search/ with a page of search hits."""
+        self.stats["requests"] += 1
+        self.stats["search"] += 1
+        if failure := await self._inject():
+            return failure
+
+        query = request.query_params.get("q", "")
+        limit = int(request.query_params.get("hit") or self.settings.search_results)
+        rng = _rng("search", query)
+        results = []
+        for _ in range(min(limit, self.settings.search_results)):
+            cluster_id = rng.randint(1, 10_000_000)
+            results.append(
+                {
+                    "caseName": f"{rng.choice(_WORDS).title()} v. {rng.choice(_WORDS).title()}",
+                    "court": "Supreme Court of the United States",
+                    "court_id": "scotus",
+                    "dateFiled": f"{rng.randint(1950, 2024)}-01-01",
+                    "cluster_id": cluster_id,
+                    "docket_id": cluster_id + 7,
+                    "docketNumber": f"{rng.randint(10, 99)}-{rng.randint(100, 9999)}",
+                    "citation": [
+                        f"{rng.randint(300, 600)} U.S. {rng.randint(1, 1200)}"
+                    ],
+                    "citeCount": rng.randint(0, 5000),
+                    "judge": ", ".join(rng.choice(_WORDS).title() for _ in range(3)),
+                    "absolute_url": f"/opinion/{cluster_id}/mock/",
+                    "opinions": [
+                        {
+                            "id": cluster_id * 10,
+                            "snippet": " ".join(_sentence(rng, 15) for _ in range(4)),
+                            "type": "010combined",
+                        }
+                    ],
+                }
+            )
+        return JSONResponse(
+            {
+                "count": rng.randint(limit, 50_000),
+                "next": f"{request.base_url}{API_PREFIX[1:]}/search/?cursor=mock",
+                "previous": None,
+                "results": results,
+            }
+        )
+
+    async def citation_lookup(self, request: Request) -> Response:
+        """Handle POST citation-lookup/ for the common federal reporters."""
+        self.stats["requests"] += 1
+        self.stats["citation_lookup"] += 1
+        if failure := await self._inject():
+            return failure
+
+        form = await request.form()
+        text = str(form.get("text") or "")
+        items = []
+        for match in _CITATION.finditer(text):
+            volume, reporter, page = match.groups()
+            citation = f"{volume} {reporter} {page}"
+            rng = _rng("citation", citation)
+            found = rng.random() >= self.settings.not_found_rate
+            items.append(
+                {
+                    "citation": match.group(0),
+                    "normalized_citations": [citation],
+                    "start_index": match.start(),
+                    "end_index": match.end(),
+                    "status": 200 if found else 404,
+                    "error_message": "" if found else "Citation not found.",
+                    "clusters": (
+                        [self._cluster(request, rng.randint(1, 10_000_000))]
+                        if found
+                        else []
+                    ),
+                }
+            )
+        self.stats["citations"] += len(items)
+        return JSONResponse(items)
+
+    async def get_stats(self, request: Request) -> Response:
+        """Report request counts and the active settings."""
+        return JSONResponse(
+            {"stats": dict(self.stats), "settings": asdict(self.settings)}
+        )
+
+
+def create_app(settings: MockSettings | None = None) -> Starlette:
+    """Create the mock API application.
+
+    Args:
+        settings: Latency, failure and payload settings (defaults if omitted).
+
+    Returns:
+        Starlette: The ASGI application.
+
+    """
+    mock = MockCourtListener(settings or MockSettings())
+    return Starlette(
+        routes=[
+            Route(f"{API_PREFIX}/search/", mock.search),
+            Route(
+                f"{API_PREFIX}/citation-lookup/", mock.citation_lookup, methods=["POST"]
+            ),
+            Route(f"{API_PREFIX}/{{endpoint:str}}/{{record_id:int}}/", mock.get_record),
+            Route("/__mock__/stats", mock.get_stats),
+        ]
+    )
+
+
+def main() -> None:
+    """Run the mock API with uvicorn."""
+    import uvicorn
+
+    defaults = MockSettings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument(
+        "--rate-limit-rate", type=float, default=defaults.rate_limit_rate
+    )
+    parser.add_argument("--retry-after", type=int, default=defaults.retry_after)
+    parser.add_argument("--opinion-kb", type=int, default=defaults.opinion_kb)
+    parser.add_argument("--search-results", type=int, default=defaults.search_results)
+    parser.add_argument("--not-found-rate", type=float, default=defaults.not_found_rate)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        opinion_kb=args.opinion_kb,
+        search_results=args.search_results,
+        not_found_rate=args.not_found_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(
+        create_app(settings), host=args.host, port=args.port, log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
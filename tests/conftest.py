@@ -8,6 +8,9 @@ from fastmcp import Client
 from loguru import logger
 import pytest
 
+from app.api import response_cache
+from app.lookup import lookup_cache
+from app.network import edges_cache
 from app.server import ensure_setup, mcp
 
 # Configure test logging
@@ -30,6 +33,14 @@ def client() -> Client[Any]:
     return Client(mcp)
 
 
+@pytest.fixture(autouse=True)
+def clear_api_caches() -> None:
+    """Start every test with empty caches of API results."""
+    lookup_cache.clear()
+    response_cache.clear()
+    edges_cache.clear()
+
+
 def pytest_configure(config: Config) -> None:
     """Configure pytest with custom markers."""
     config.addinivalue_line(
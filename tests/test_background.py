@@ -0,0 +1,55 @@
+"""Tests for process-wide background tasks shared by sessions."""
+
+import asyncio
+from typing import Any
+
+from fastmcp import Client
+import pytest
+
+from app.background import SharedTask
+from app.citator import template_watcher
+from app.config import config
+from app.server import mcp
+
+
+@pytest.mark.asyncio
+async def test_shared_task_runs_until_last_holder_leaves() -> None:
+    """Test that the task starts once and only stops with its last holder."""
+    starts = 0
+
+    async def run() -> None:
+        nonlocal starts
+        starts += 1
+        await asyncio.Event().wait()
+
+    shared = SharedTask("test", run)
+    with shared.hold():
+        with shared.hold():
+            task = shared.task
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert task is not None and not task.done()
+    await asyncio.sleep(0)
+
+    assert task.cancelled()
+    assert shared.task is None
+    assert starts == 1
+
+
+@pytest.mark.asyncio
+async def test_watcher_outlives_first_session(
+    client: Client[Any], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that one session ending does not stop the watcher for another."""
+    monkeypatch.setattr(config, "citation_templates_watch_interval", 60.0)
+    other = Client(mcp)
+
+    async with client:
+        watcher = template_watcher.task
+        async with other:
+            assert template_watcher.task is watcher
+        await asyncio.sleep(0)
+        assert watcher is not None and not watcher.done()
+    await asyncio.sleep(0)
+
+    assert watcher.cancelled()
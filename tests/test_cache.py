@@ -0,0 +1,151 @@
+"""Tests for caching primitives and the memoized citation parser."""
+
+from pathlib import Path
+from typing import Any
+
+from fastmcp import Client
+import pytest
+
+from app.cache import LRUCache, PersistentStore, get_cache_stats
+from app.citator import ParsedCitation, citation_key, parse_cache, parse_citation
+
+
+class TestLRUCache:
+    """Tests for the bounded LRU cache."""
+
+    def test_get_put_and_stats(self) -> None:
+        """Test hits, misses and hit rate accounting."""
+        cache: LRUCache[str, int] = LRUCache(maxsize=2)
+        assert cache.get("a") is None
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+
+        stats = cache.stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+        assert stats.hit_rate == 0.5
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test that the oldest untouched entry is evicted first."""
+        cache: LRUCache[str, int] = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.stats().evictions == 1
+
+    def test_discard_where(self) -> None:
+        """Test predicate-based invalidation."""
+        cache: LRUCache[tuple[str, int], str] = LRUCache(maxsize=10)
+        cache.put(("x", 1), "old")
+        cache.put(("y", 2), "new")
+
+        assert cache.discard_where(lambda key: key[1] == 1) == 1
+        assert len(cache) == 1
+
+    def test_expired_entries_are_misses(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that entries past their time-to-live are dropped."""
+        now = [1000.0]
+        monkeypatch.setattr("app.cache.time.monotonic", lambda: now[0])
+        cache: LRUCache[str, int] = LRUCache(maxsize=10, ttl=60)
+        cache.put("a", 1)
+        cache.put("b", 2, ttl=5)
+
+        now[0] += 10
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert "b" not in cache
+
+    def test_rejects_non_positive_size(self) -> None:
+        """Test that a zero-sized cache is refused."""
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+
+
+class TestPersistentStore:
+    """Tests for the SQLite-backed store."""
+
+    def test_round_trip_and_namespaces(self, tmp_path: Path) -> None:
+        """Test that values persist across connections, per namespace."""
+        path = tmp_path / "cache.sqlite3"
+        store = PersistentStore(path, "one")
+        store.put("410 U.S. 113", {"status": 200, "results": [{"id": 1}]})
+        store.close()
+
+        reopened = PersistentStore(path, "one")
+        assert reopened.get("410 U.S. 113") == {"status": 200, "results": [{"id": 1}]}
+        assert PersistentStore(path, "two").get("410 U.S. 113") is None
+
+    def test_expired_values_are_ignored(self, tmp_path: Path) -> None:
+        """Test that expired entries are not returned."""
+        store = PersistentStore(tmp_path / "cache.sqlite3", "test")
+        store.put("stale", 1, ttl=-1)
+        store.put("fresh", 2, ttl=60)
+
+        assert store.get("stale") is None
+        assert store.get("fresh") == 2
+
+    def test_get_many_skips_missing_and_expired(self, tmp_path: Path) -> None:
+        """Test that a batch read returns only live entries of its namespace."""
+        path = tmp_path / "cache.sqlite3"
+        store = PersistentStore(path, "test")
+        store.put_many([("stale", 1, -1), ("fresh", 2, 60), ("forever", 3, None)])
+        PersistentStore(path, "other").put("absent", 4)
+
+        assert store.get_many(["stale", "fresh", "forever", "absent"]) == {
+            "fresh": 2,
+            "forever": 3,
+        }
+
+
+class TestParseCache:
+    """Tests for memoized citeurl parsing."""
+
+    def test_parse_is_memoized_on_normalized_text(self) -> None:
+        """Test that whitespace variants share one cache entry."""
+        parse_cache.clear()
+        first = parse_citation("410 U.S. 113")
+        second = parse_citation("  410   U.S.  113 ")
+
+        assert isinstance(first, ParsedCitation)
+        assert first is second
+        assert parse_cache.stats().hits == 1
+
+    def test_negative_results_are_cached(self) -> None:
+        """Test that unrecognized citations are cached as misses."""
+        parse_cache.clear()
+        assert parse_citation("not a citation", broad=False) is None
+        assert parse_citation("not a citation", broad=False) is None
+        assert parse_cache.stats().hits == 1
+
+    def test_parsed_citation_is_immutable(self) -> None:
+        """Test that cached results cannot be mutated by callers."""
+        parsed = parse_citation("410 U.S. 113")
+        assert parsed is not None
+        with pytest.raises(AttributeError):
+            parsed.text = "changed"  # type: ignore[misc]
+        parsed.tokens_dict()["volume"] = "1"
+        assert parsed.tokens_dict()["volume"] == "410"
+
+    def test_pincites_share_a_key(self) -> None:
+        """Test that pinpoint cites of one authority share its lookup key."""
+        keys = {
+            citation_key(text)
+            for text in ("410 U.S. 113", "410 U.S. 113, 120", "410 u.s. 113, 150")
+        }
+
+        assert keys == {"410 U.S. 113"}
+        assert citation_key("123 F.3d 456, 460 n.4") == "123 F.3d 456"
+        assert citation_key("5 U.S.C. § 552(a)") != citation_key("5 U.S.C. § 552")
+
+    @pytest.mark.asyncio
+    async def test_status_reports_parse_cache(self, client: Client[Any]) -> None:
+        """Test that cache hit rates are exposed through the status tool."""
+        async with client:
+            result = await client.call_tool("status", {})
+
+        assert "citation_parse" in result.data["caches"]
+        assert "hit_rate" in get_cache_stats()["citation_parse"]
@@ -0,0 +1,323 @@
+"""Tests for the shared cache backends, against a local Redis stand-in."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+import time
+
+import httpx
+import pytest
+import respx
+
+from app.api import get_resource, response_cache
+from app.cache_backend import (
+    CacheBackend,
+    RedisBackend,
+    SharedCache,
+    SQLiteBackend,
+    decode_value,
+    encode_value,
+    get_cache_backend,
+)
+from app.config import config
+
+
+async def _read_command(reader: asyncio.StreamReader) -> list[bytes]:
+    """Read one command, a RESP array of bulk strings."""
+    count = int((await reader.readuntil(b"\r\n"))[1:-2])
+    args = []
+    for _ in range(count):
+        length = int((await reader.readuntil(b"\r\n"))[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+def _bulk(value: bytes | None) -> bytes:
+    """Encode a RESP bulk string reply."""
+    return b"$-1\r\n" if value is None else b"$%d\r\n%b\r\n" % (len(value), value)
+
+
+class RedisStandIn:
+    """An in-process server speaking the subset of Redis the backend uses."""
+
+    def __init__(self, password: str | None = None) -> None:
+        """Create an empty server, optionally requiring a password."""
+        self.password = password
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.commands: list[list[bytes]] = []
+
+    def _get(self, key: bytes) -> bytes | None:
+        entry = self.data.get(key)
+        if entry is None or (entry[1] is not None and entry[1] <= time.monotonic()):
+            return None
+        return entry[0]
+
+    def _set(self, args: list[bytes]) -> bytes:
+        key, value, *options = args
+        expires_at = None
+        words = [option.upper() for option in options]
+        if b"PX" in words:
+            expires_at = time.monotonic() + int(words[words.index(b"PX") + 1]) / 1000
+        if b"NX" in words and self._get(key) is not None:
+            return _bulk(None)
+        self.data[key] = (value, expires_at)
+        return b"+OK\r\n"
+
+    def reply(self, args: list[bytes]) -> bytes:
+        """Run a command and encode its reply."""
+        self.commands.append(args)
+        name, rest = args[0].upper(), args[1:]
+        if name == b"AUTH":
+            ok = rest[-1].decode() == self.password
+            return b"+OK\r\n" if ok else b"-WRONGPASS invalid password\r\n"
+        if name in (b"PING", b"SELECT"):
+            return b"+OK\r\n"
+        if name == b"GET":
+            return _bulk(self._get(rest[0]))
+        if name == b"MGET":
+            return b"*%d\r\n" % len(rest) + b"".join(_bulk(self._get(k)) for k in rest)
+        if name == b"SET":
+            return self._set(rest)
+        if name == b"DEL":
+            removed = sum(self.data.pop(key, None) is not None for key in rest)
+            return b":%d\r\n" % removed
+        if name == b"EVAL":
+            # Only the backend's compare-and-delete script
+            key, value = rest[2], rest[3]
+            if self._get(key) != value:
+                return b":0\r\n"
+            del self.data[key]
+            return b":1\r\n"
+        return b"-ERR unknown command\r\n"
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one client connection."""
+        try:
+            while True:
+                writer.write(self.reply(await _read_command(reader)))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+@asynccontextmanager
+async def redis_stand_in(
+    password: str | None = None,
+) -> AsyncIterator[tuple[RedisStandIn, str]]:
+    """Run a Redis stand-in on a free local port; yields it and its URL."""
+    stand_in = RedisStandIn(password)
+    server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    auth = f":{password}@" if password else ""
+    try:
+        yield stand_in, f"redis://{auth}127.0.0.1:{port}/2"
+    finally:
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_commands() -> None:
+    """Test get, set, add and delete against the stand-in, including expiry."""
+    async with redis_stand_in(password="secret") as (stand_in, url):
+        backend = RedisBackend(url)
+        await backend.set_many([("a", b"1", 60), ("b", b"2", 0.05)])
+        assert await backend.get_many(["a", "b", "c"]) == [b"1", b"2", None]
+
+        assert not await backend.add("a", b"x", 60)
+        assert await backend.add("c", b"3", 60)
+        await backend.delete("c")
+        await asyncio.sleep(0.1)
+        assert await backend.get_many(["a", "b", "c"]) == [b"1", None, None]
+        await backend.close()
+
+    # One connection, authenticated and on the database from the URL
+    assert stand_in.commands[:2] == [[b"AUTH", b"secret"], [b"SELECT", b"2"]]
+    assert sum(command[0] == b"AUTH" for command in stand_in.commands) == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_rejects_bad_password() -> None:
+    """Test that an authentication failure surfaces as a backend error."""
+    async with redis_stand_in(password="secret") as (_, url):
+        backend = RedisBackend(url.replace("secret", "wrong"))
+        with pytest.raises(Exception, match="WRONGPASS"):
+            await backend.get_many(["a"])
+
+
+async def _check_delete_if(backend: CacheBackend) -> None:
+    """Check that delete_if removes a key only while it holds the value."""
+    await backend.set_many([("lock", b"mine", 60)])
+    assert not await backend.delete_if("lock", b"theirs")
+    assert await backend.get_many(["lock"]) == [b"mine"]
+    assert await backend.delete_if("lock", b"mine")
+    assert await backend.get_many(["lock"]) == [None]
+    assert not await backend.delete_if("lock", b"mine")
+
+
+@pytest.mark.asyncio
+async def test_delete_if_compares_value(tmp_path: Path) -> None:
+    """Test compare-and-delete on both backends."""
+    await _check_delete_if(SQLiteBackend(tmp_path / "cache.sqlite3"))
+    async with redis_stand_in() as (_, url):
+        backend = RedisBackend(url)
+        await _check_delete_if(backend)
+        await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_lock_is_not_released_by_late_fetch(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a fetch outliving its lock leaves the next holder's lock alone."""
+    monkeypatch.setattr(config, "cache_lock_timeout", 0.05)
+    backend = SQLiteBackend(tmp_path / "cache.sqlite3")
+    cache = SharedCache("test_lock", backend)
+    lock = f"{config.cache_key_prefix}:lock:test_lock:opinions/7"
+
+    async def fetch() -> dict[str, int]:
+        await asyncio.sleep(0.1)
+        # Another process took the expired lock in the meantime
+        assert await backend.add(lock, b"theirs", 60)
+        return {"id": 7}
+
+    assert await cache.get_or_fetch("opinions/7", fetch, 60) == {"id": 7}
+    assert await backend.get_many([lock]) == [b"theirs"]
+
+
+def test_redis_backend_rejects_other_schemes() -> None:
+    """Test that only redis:// URLs are accepted."""
+    with pytest.raises(ValueError, match="redis://"):
+        RedisBackend("rediss://cache.example.com:6380/0")
+
+
+def test_large_values_are_compressed() -> None:
+    """Test that values above the threshold are compressed and round-trip."""
+    text = "The court held that " * 200
+    small = {"id": 1}
+    large = {"id": 1, "plain_text": text}
+
+    assert encode_value(small).startswith(b"j")
+    encoded = encode_value(large)
+    assert encoded.startswith(b"z")
+    assert len(encoded) < len(text) / 10
+    assert decode_value(encode_value(small)) == small
+    assert decode_value(encoded) == large
+    with pytest.raises(ValueError):
+        decode_value(b"?{}")
+
+
+@pytest.mark.asyncio
+async def test_replicas_share_entries() -> None:
+    """Test that a value fetched by one replica is served to another."""
+    async with redis_stand_in() as (_, url):
+        first = SharedCache("test_share", RedisBackend(url))
+        second = SharedCache("test_share", RedisBackend(url))
+        calls = 0
+
+        async def fetch() -> dict[str, int]:
+            nonlocal calls
+            calls += 1
+            return {"id": 7}
+
+        assert await first.get_or_fetch("opinions/7", fetch, 60) == {"id": 7}
+        assert await second.get_or_fetch("opinions/7", fetch, 60) == {"id": 7}
+
+    assert calls == 1
+    assert second.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_stampede_fetches_once() -> None:
+    """Test that concurrent misses in and across replicas share one fetch."""
+    async with redis_stand_in() as (_, url):
+        replicas = [SharedCache("test_stampede", RedisBackend(url)) for _ in "ab"]
+        calls = 0
+
+        async def fetch() -> dict[str, int]:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.2)
+            return {"id": 7}
+
+        results = await asyncio.gather(
+            *(replicas[i % 2].get_or_fetch("opinions/7", fetch, 60) for i in range(10))
+        )
+
+    assert results == [{"id": 7}] * 10
+    assert calls == 1
+    assert sum(replica.lock_waits for replica in replicas) == 1
+
+
+@pytest.mark.asyncio
+async def test_waiters_fetch_when_holder_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a failed fetch releases waiting replicas without the timeout."""
+    monkeypatch.setattr(config, "cache_lock_timeout", 10.0)
+    async with redis_stand_in() as (_, url):
+        holder, waiter = (SharedCache("test_fail", RedisBackend(url)) for _ in "ab")
+
+        async def failing() -> dict[str, int]:
+            await asyncio.sleep(0.1)
+            raise httpx.ConnectError("upstream down")
+
+        async def fetch() -> dict[str, int]:
+            return {"id": 7}
+
+        failed = asyncio.create_task(holder.get_or_fetch("opinions/7", failing, 60))
+        await asyncio.sleep(0.02)
+        started = time.monotonic()
+        assert await waiter.get_or_fetch("opinions/7", fetch, 60) == {"id": 7}
+        elapsed = time.monotonic() - started
+        with pytest.raises(httpx.ConnectError):
+            await failed
+
+    assert waiter.lock_waits == 1
+    assert elapsed < 1.0
+
+
+@pytest.mark.asyncio
+async def test_unreachable_backend_is_a_miss(unused_tcp_port: int) -> None:
+    """Test that requests still succeed when the cache server is down."""
+    cache = SharedCache(
+        "test_down", RedisBackend(f"redis://127.0.0.1:{unused_tcp_port}", timeout=0.5)
+    )
+
+    async def fetch() -> dict[str, int]:
+        return {"id": 7}
+
+    assert await cache.get_or_fetch("opinions/7", fetch, 60) == {"id": 7}
+    assert cache.errors >= 1
+
+
+@pytest.mark.asyncio
+async def test_get_resource_uses_configured_backend(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that API responses are shared through CACHE_BACKEND=redis."""
+    url = f"{config.courtlistener_base_url}opinions/7/"
+    async with redis_stand_in() as (stand_in, redis_url):
+        monkeypatch.setattr(config, "cache_backend", "redis")
+        monkeypatch.setattr(config, "cache_redis_url", redis_url)
+        get_cache_backend.cache_clear()
+        try:
+            async with httpx.AsyncClient() as client:
+                with respx.mock:
+                    route = respx.get(url).mock(
+                        return_value=httpx.Response(200, json={"id": 7})
+                    )
+                    await get_resource(client, "opinions", 7, use_cache=True)
+                    # Another replica starts with an empty in-memory cache
+                    response_cache.clear()
+                    data = await get_resource(client, "opinions", 7, use_cache=True)
+        finally:
+            get_cache_backend.cache_clear()
+
+    assert data == {"id": 7}
+    assert route.call_count == 1
+    assert f"{config.cache_key_prefix}:api_responses:opinions/7/".encode() in (
+        stand_in.data
+    )
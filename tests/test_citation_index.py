@@ -0,0 +1,169 @@
+"""Tests for the offline citation index."""
+
+import bz2
+from collections.abc import Iterator
+from pathlib import Path
+import time
+from typing import Any
+
+from fastmcp import Client
+import httpx
+import pytest
+import respx
+
+from app.citation_index import (
+    CitationIndex,
+    get_citation_index,
+    import_citations,
+    reporter_key,
+    split_citation,
+)
+from app.config import config
+
+BULK_CSV = """id,volume,reporter,page,type,cluster_id,date_created,date_modified
+1,410,U.S.,113,1,108713,2014-01-01,2014-01-01
+2,93,S. Ct.,705,1,108713,2014-01-01,2014-01-01
+3,347,U.S.,483,1,105221,2014-01-01,2014-01-01
+4,45,F.4th,10,2,7001,2022-01-01,2022-01-01
+5,100,F. Supp. 2d,200,2,5001,2014-01-01,2014-01-01
+6,100,F. Supp. 2d,200,2,5002,2014-01-01,2014-01-01
+7,12,Cal. App. 4th,34,3,9001,2014-01-01,2014-01-01
+8,1,U.S.,1,1,not-a-number,2014-01-01,2014-01-01
+"""
+
+
+@pytest.fixture
+def bulk_csv(tmp_path: Path) -> Path:
+    """Write a small bulk citations export, bzip2-compressed like the real one."""
+    path = tmp_path / "citations-2025-01-01.csv.bz2"
+    path.write_bytes(bz2.compress(BULK_CSV.encode()))
+    return path
+
+
+@pytest.fixture
+def index_path(tmp_path: Path, bulk_csv: Path) -> Path:
+    """Import the sample export into an index."""
+    path = tmp_path / "citations.sqlite3"
+    import_citations(bulk_csv, path)
+    return path
+
+
+class TestImport:
+    """Tests for building the index from a bulk export."""
+
+    def test_imports_default_reporters(self, index_path: Path) -> None:
+        """Test that only well-formed rows for common reporters are imported."""
+        index = CitationIndex(index_path)
+
+        assert index.metadata()["citations"] == "6"
+        assert index.lookup("12", "Cal. App. 4th", "34") == []
+
+    def test_imports_all_reporters(self, tmp_path: Path, bulk_csv: Path) -> None:
+        """Test importing every reporter."""
+        path = tmp_path / "all.sqlite3"
+        assert import_citations(bulk_csv, path, reporters=None) == 7
+        assert CitationIndex(path).lookup("12", "Cal. App. 4th", "34") == [9001]
+
+    def test_rejects_unexpected_columns(self, tmp_path: Path) -> None:
+        """Test that a file without the bulk export columns is refused."""
+        path = tmp_path / "bad.csv"
+        path.write_text("volume,page\n1,2\n")
+
+        with pytest.raises(ValueError, match="missing columns"):
+            import_citations(path, tmp_path / "bad.sqlite3")
+        assert not (tmp_path / "bad.sqlite3").exists()
+
+
+class TestResolve:
+    """Tests for resolving citations against the index."""
+
+    def test_reporter_key_ignores_punctuation(self) -> None:
+        """Test that reporter spellings normalize to one key."""
+        assert reporter_key("F. Supp. 2d") == reporter_key("f-supp-2d") == "fsupp2d"
+        assert reporter_key("F. App'x") == "fappx"
+
+    def test_split_citation(self) -> None:
+        """Test splitting citeurl-known and unknown reporters."""
+        assert split_citation("410 U.S. 113, 120") == ("410", "us", "113")
+        assert split_citation("93 S. Ct. 705") == ("93", "sct", "705")
+        assert split_citation("Roe v. Wade") is None
+
+    def test_resolve(self, index_path: Path) -> None:
+        """Test resolving to one or several clusters."""
+        index = CitationIndex(index_path)
+
+        assert index.resolve("410 u.s. 113") == [108713]
+        assert index.resolve("93 S. Ct. 705") == [108713]
+        assert index.resolve("45 F.4th 10") == [7001]
+        assert sorted(index.resolve("100 F. Supp. 2d 200")) == [5001, 5002]
+        assert index.resolve("999 U.S. 999") == []
+
+    def test_lookup_is_sub_millisecond(self, index_path: Path) -> None:
+        """Test that indexed lookups are fast enough to skip the network."""
+        index = CitationIndex(index_path)
+        index.resolve("410 U.S. 113")  # warm the parse cache
+
+        rounds = 200
+        start = time.perf_counter()
+        for _ in range(rounds):
+            index.resolve("410 U.S. 113")
+        assert (time.perf_counter() - start) / rounds < 0.001
+
+
+class TestLookupTool:
+    """Tests for lookup_citation with an offline index configured."""
+
+    @pytest.fixture
+    def configured_index(
+        self, index_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> Iterator[Path]:
+        """Point the server at the sample index."""
+        monkeypatch.setattr(config, "citation_index_path", str(index_path))
+        get_citation_index.cache_clear()
+        yield index_path
+        get_citation_index.cache_clear()
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_offline_hit_skips_api(
+        self, client: Client[Any], configured_index: Path
+    ) -> None:
+        """Test that indexed citations are resolved without an API call."""
+        route = respx.post(
+            "https://www.courtlistener.com/api/rest/v4/citation-lookup/"
+        ).mock(return_value=httpx.Response(200, json=[]))
+
+        async with client:
+            result = await client.call_tool(
+                "citation_lookup_citation", {"citation": "410 U.S. 113"}
+            )
+
+            assert not route.called
+            data = result.data
+            assert data["offline"] is True
+            assert data["status"] == 200
+            assert data["results"][0]["clusters"][0]["id"] == 108713
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_offline_miss_uses_api(
+        self, client: Client[Any], configured_index: Path
+    ) -> None:
+        """Test that citations missing from the index still reach the API."""
+        route = respx.post(
+            "https://www.courtlistener.com/api/rest/v4/citation-lookup/"
+        ).mock(
+            return_value=httpx.Response(
+                200, json=[{"citation": "384 U.S. 436", "status": 200, "clusters": []}]
+            )
+        )
+
+        async with client:
+            result = await client.call_tool(
+                "citation_batch_lookup_citations",
+                {"citations": ["410 U.S. 113", "384 U.S. 436"]},
+            )
+
+            assert route.call_count == 1
+            assert result.data["offline"] == 1
+            assert [e["status"] for e in result.data["citations"]] == [200, 200]
@@ -0,0 +1,123 @@
+"""Tests for reloading the custom citation templates."""
+
+import asyncio
+from collections.abc import Iterator
+from pathlib import Path
+
+from fastmcp import Client
+import pytest
+
+from app import citator
+from app.citator import (
+    TemplateError,
+    get_template_set,
+    parse_cache,
+    parse_citation,
+    reload_templates,
+    watch_templates,
+)
+from app.tools.admin import admin_server
+
+EXTRA_TEMPLATE = """
+Test Reporter:
+  tokens:
+    volume:
+      regex: \\d+
+    page:
+      regex: \\d+
+  pattern: "{volume} T\\\\.R\\\\. {page}"
+  name builder:
+    parts:
+      - "{volume} T.R. {page}"
+"""
+
+
+@pytest.fixture
+def template_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Point the citator at a copy of the custom templates."""
+    path = tmp_path / "custom_citation_templates.yaml"
+    path.write_text(citator.TEMPLATE_PATH.read_text())
+    monkeypatch.setattr(citator, "TEMPLATE_PATH", path)
+    monkeypatch.setattr(citator, "_template_set", None)
+    yield path
+
+
+def test_reload_swaps_in_new_templates(template_path: Path) -> None:
+    """Test that an edited template file is picked up without a restart."""
+    assert parse_citation("12 T.R. 34") is None
+    old = get_template_set()
+
+    template_path.write_text(template_path.read_text() + EXTRA_TEMPLATE)
+    result = reload_templates()
+
+    assert result["reloaded"] is True
+    assert result["previous_version"] == old.version
+    assert result["version"] == get_template_set().version != old.version
+    parsed = parse_citation("12 T.R. 34")
+    assert parsed is not None
+    assert parsed.name == "12 T.R. 34"
+
+
+def test_reload_only_invalidates_old_version(template_path: Path) -> None:
+    """Test that parse results of other template versions stay cached."""
+    parse_citation("410 U.S. 113")
+    old_version = get_template_set().version
+    other_key = ("347 U.S. 483", True, "other-version")
+    parse_cache.put(other_key, None)
+
+    template_path.write_text(template_path.read_text() + EXTRA_TEMPLATE)
+    result = reload_templates()
+
+    assert result["invalidated_parse_entries"] >= 1
+    assert other_key in parse_cache
+    assert ("410 U.S. 113", True, old_version) not in parse_cache
+
+
+def test_unchanged_file_is_not_reloaded(template_path: Path) -> None:
+    """Test that a reload without changes keeps the current citator."""
+    current = get_template_set()
+
+    result = reload_templates()
+
+    assert result["reloaded"] is False
+    assert result["invalidated_parse_entries"] == 0
+    assert get_template_set() is current
+
+
+def test_invalid_file_keeps_current_templates(template_path: Path) -> None:
+    """Test that a broken template file leaves the working citator in place."""
+    current = get_template_set()
+
+    template_path.write_text("Broken: [unclosed")
+    with pytest.raises(TemplateError):
+        reload_templates()
+
+    assert get_template_set() is current
+
+
+@pytest.mark.asyncio
+async def test_watch_templates_reloads_on_change(template_path: Path) -> None:
+    """Test that the watcher picks up an edited template file."""
+    old_version = get_template_set().version
+    watcher = asyncio.create_task(watch_templates(0.01))
+    try:
+        await asyncio.sleep(0.05)
+        template_path.write_text(template_path.read_text() + EXTRA_TEMPLATE)
+        for _ in range(500):
+            await asyncio.sleep(0.01)
+            if get_template_set().version != old_version:
+                break
+    finally:
+        watcher.cancel()
+
+    assert get_template_set().version != old_version
+
+
+@pytest.mark.asyncio
+async def test_reload_tool(template_path: Path) -> None:
+    """Test the admin reload tool."""
+    async with Client(admin_server) as client:
+        result = await client.call_tool("reload_citation_templates", {"force": True})
+
+        assert result.data["reloaded"] is True
+        assert result.data["version"] == get_template_set().version
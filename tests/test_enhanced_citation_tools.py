@@ -38,3 +38,29 @@ async def test_extract_citations(client: Client[Any]) -> None:
         response = result.data
         assert response["total_citations"] > 0
         assert len(response["citations"]) > 0
+
+
+@pytest.mark.asyncio
+async def test_extract_citations_incremental(client: Client[Any]) -> None:
+    """Test that incremental extraction of an edited text matches a full one."""
+    text = (
+        "See Riverside v. Rivera, 477 U.S. 561 (1986).\n\n"
+        "Fees are available under 42 USC § 1988(b). Id. at (c)."
+    )
+    edited = text + "\n\nCompare 477 U.S. at 570."
+
+    async with client:
+        await client.call_tool(
+            "citation_extract_citations_from_text",
+            {"text": text, "incremental": True},
+        )
+        incremental = await client.call_tool(
+            "citation_extract_citations_from_text",
+            {"text": edited, "incremental": True},
+        )
+        full = await client.call_tool(
+            "citation_extract_citations_from_text", {"text": edited}
+        )
+
+        assert incremental.data == full.data
+        assert incremental.data["total_citations"] == 4
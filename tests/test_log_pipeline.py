@@ -0,0 +1,86 @@
+"""Tests for the background, sampled and coalesced logging pipeline."""
+
+from pathlib import Path
+from typing import Any
+
+from fastmcp import Client
+from fastmcp.client.logging import LogMessage
+from loguru import logger
+import pytest
+
+from app.config import config
+from app.log_pipeline import InfoSampler, configure_file_logging
+from app.server import mcp
+
+
+class _Level:
+    def __init__(self, no: int) -> None:
+        self.no = no
+
+
+def _record(line: int, level: int = 20) -> dict[str, Any]:
+    return {"name": "app.tools", "line": line, "level": _Level(level)}
+
+
+def test_info_sampler_keeps_one_in_n_per_call_site() -> None:
+    """Test that INFO records are sampled per call site and warnings are kept."""
+    sampler = InfoSampler(3)
+    kept = [sampler(_record(10)) for _ in range(6)]
+    assert kept == [True, False, False, True, False, False]
+    assert sampler(_record(11))
+    assert all(sampler(_record(10, level=30)) for _ in range(3))
+
+
+@pytest.mark.asyncio
+async def test_file_sink_writes_in_background(tmp_path: Path) -> None:
+    """Test that the enqueued file sink writes records once flushed."""
+    path = tmp_path / "logs" / "server.log"
+    sink = configure_file_logging(path)
+    try:
+        logger.info("background write check")
+        await logger.complete()
+    finally:
+        logger.remove(sink)
+    assert "background write check" in path.read_text(encoding="utf-8")
+
+
+async def _call_with_logs(tool: str, arguments: dict[str, Any]) -> list[LogMessage]:
+    messages: list[LogMessage] = []
+
+    async def collect(message: LogMessage) -> None:
+        messages.append(message)
+
+    async with Client(mcp, log_handler=collect) as client:
+        await client.call_tool(tool, arguments)
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_context_logs_are_coalesced_per_call() -> None:
+    """Test that a tool's ctx.info messages arrive as one structured message."""
+    messages = await _call_with_logs(
+        "citation_verify_citation_format", {"citation": "410 U.S. 113"}
+    )
+
+    [message] = messages
+    assert message.level == "info"
+    assert message.logger == "citation_verify_citation_format"
+    extra = message.data["extra"]
+    assert extra["tool"] == "citation_verify_citation_format"
+    assert [m["message"] for m in extra["messages"]] == [
+        "Verifying citation format: 410 U.S. 113",
+        "Citation format verification complete: True",
+    ]
+    assert extra["duration_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_tool_log_level_off_drops_context_logs(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that TOOL_LOG_LEVEL=off sends no per-call log messages."""
+    monkeypatch.setattr(config, "tool_log_level", "off")
+    messages = await _call_with_logs(
+        "citation_verify_citation_format", {"citation": "410 U.S. 113"}
+    )
+    assert messages == []
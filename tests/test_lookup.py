@@ -0,0 +1,120 @@
+"""Tests for citation-lookup chunking and upstream rate limiting."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.lookup import pack_chunks
+from app.ratelimit import RateLimiter
+from app.tools import citation as citation_tools
+
+
+class TestPackChunks:
+    """Tests for packing citations into request-sized chunks."""
+
+    def test_respects_citation_limit(self) -> None:
+        """Test that no chunk holds more than the citation limit."""
+        citations = [f"{i} U.S. {i}" for i in range(1, 8)]
+        chunks = pack_chunks(citations, max_citations=3, max_chars=10_000)
+
+        assert [len(c.citations) for c in chunks] == [3, 3, 1]
+        assert [c for chunk in chunks for c in chunk.citations] == citations
+
+    def test_respects_character_limit(self) -> None:
+        """Test that chunk text never exceeds the character limit."""
+        citations = ["410 U.S. 113"] * 5  # 12 chars each, 1 separator between
+        chunks = pack_chunks(citations, max_citations=100, max_chars=30)
+
+        assert all(len(c.text) <= 30 for c in chunks)
+        assert [len(c.citations) for c in chunks] == [2, 2, 1]
+
+    def test_offsets_point_at_citations(self) -> None:
+        """Test that recorded offsets locate each citation in the chunk text."""
+        citations = ["410 U.S. 113", "347 U.S. 483", "5 U.S.C. § 552"]
+        (chunk,) = pack_chunks(citations, max_citations=10, max_chars=1000)
+
+        for citation, start in zip(chunk.citations, chunk.starts, strict=True):
+            assert chunk.text[start : start + len(citation)] == citation
+
+    def test_oversized_citation_gets_own_chunk(self) -> None:
+        """Test that a citation longer than the limit is still sent."""
+        chunks = pack_chunks(["x" * 50, "410 U.S. 113"], max_citations=10, max_chars=20)
+
+        assert [c.citations for c in chunks] == [["x" * 50], ["410 U.S. 113"]]
+
+
+class TestRateLimiter:
+    """Tests for the upstream rate limiter."""
+
+    @pytest.mark.asyncio
+    async def test_caps_concurrency(self) -> None:
+        """Test that no more than max_concurrency requests run at once."""
+        limiter = RateLimiter(max_concurrency=2)
+        peak = 0
+
+        async def request() -> None:
+            nonlocal peak
+            async with limiter:
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(request() for _ in range(6)))
+
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+    def test_rejects_non_positive_concurrency(self) -> None:
+        """Test that a limiter needs at least one slot."""
+        with pytest.raises(ValueError):
+            RateLimiter(max_concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_pacing_wait_releases_slot(self) -> None:
+        """Test that a request cancelled while paced does not keep its slot."""
+        limiter = RateLimiter(max_concurrency=1, requests_per_second=1)
+        async with limiter:
+            pass  # The next start is now a second away
+
+        async def request() -> None:
+            async with limiter:
+                pass
+
+        waiting = asyncio.create_task(request())
+        await asyncio.sleep(0.05)
+        assert limiter.in_flight == 1
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        assert limiter.in_flight == 0
+        limiter.requests_per_second = 0
+        await asyncio.wait_for(request(), timeout=1)
+
+
+class TestCitationKeys:
+    """Tests for computing lookup keys from the tools."""
+
+    @pytest.mark.asyncio
+    async def test_uncached_citations_parse_off_the_loop(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that citeurl runs in a worker thread when a parse is missing."""
+        threads: list[int] = []
+
+        def citation_key(text: str) -> str:
+            threads.append(threading.get_ident())
+            return text.upper()
+
+        monkeypatch.setattr(citation_tools, "citation_key", citation_key)
+        monkeypatch.setattr(
+            citation_tools,
+            "cached_citation_key",
+            lambda text: "cached" if text == "a" else None,
+        )
+
+        assert await citation_tools._citation_keys(["a", "b"]) == ["A", "B"]
+        assert threads and threading.get_ident() not in threads
+        threads.clear()
+        assert await citation_tools._citation_keys(["a"]) == ["cached"]
+        assert threads == []
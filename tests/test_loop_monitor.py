@@ -0,0 +1,100 @@
+"""Tests for the event loop lag and slow callback detector."""
+
+import asyncio
+import time
+from typing import Any
+
+from fastmcp import Client, FastMCP
+import pytest
+
+from app.config import config
+from app.loop_monitor import LoopMonitor, ToolTaskMiddleware, monitoring
+from app.metrics import slow_callbacks
+from app.server import mcp
+
+
+def _blocking_server() -> FastMCP[Any]:
+    """A server with a tool that blocks the event loop."""
+    server: FastMCP[Any] = FastMCP(name="Blocking")
+    server.add_middleware(ToolTaskMiddleware())
+
+    @server.tool()
+    def block(seconds: float) -> str:
+        time.sleep(seconds)
+        return "done"
+
+    return server
+
+
+@pytest.mark.asyncio
+async def test_slow_callback_is_attributed_to_tool() -> None:
+    """Test that a blocking tool is reported with its name and stack."""
+    monitor = LoopMonitor(interval=0.01, threshold=0.05)
+    before = slow_callbacks.value("block")
+    task = asyncio.create_task(monitor.run())
+    try:
+        async with Client(_blocking_server()) as client:
+            await asyncio.sleep(0.05)
+            await client.call_tool("block", {"seconds": 0.3})
+            await asyncio.sleep(0.05)
+    finally:
+        task.cancel()
+
+    report = monitor.report()
+    [stall] = report["slow_callbacks"]
+    assert stall["tool"] == "block"
+    assert stall["blocked_seconds"] >= 0.25
+    assert any("time.sleep(seconds)" in line for line in stall["stack"])
+    assert report["lag_ms"]["max"] >= 250
+    assert slow_callbacks.value("block") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_no_stalls_when_loop_is_responsive() -> None:
+    """Test that ordinary awaits do not count as slow callbacks."""
+    monitor = LoopMonitor(interval=0.01, threshold=0.05)
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.2)
+    task.cancel()
+
+    report = monitor.report()
+    assert report["slow_callbacks"] == []
+    assert report["lag_ms"]["samples"] > 0
+
+
+@pytest.mark.asyncio
+async def test_event_loop_diagnostics_tool(client: Client[Any]) -> None:
+    """Test that the diagnostic tool reports monitor settings and lag."""
+    async with client:
+        result = await client.call_tool("event_loop_diagnostics", {})
+
+    assert result.data["enabled"] is False
+    assert {"interval_ms", "threshold_ms", "lag_ms", "slow_callbacks"} <= set(
+        result.data
+    )
+
+
+@pytest.mark.asyncio
+async def test_monitor_outlives_first_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the session that started the monitor ending does not stop it."""
+    monkeypatch.setattr(config, "loop_monitor_enabled", True)
+    opened, closing = asyncio.Event(), asyncio.Event()
+
+    async def first_session() -> None:
+        async with Client(mcp):
+            opened.set()
+            await closing.wait()
+
+    first = asyncio.create_task(first_session())
+    await opened.wait()
+    task = monitoring.task
+    async with Client(mcp):
+        closing.set()
+        await first
+        await asyncio.sleep(0)
+        assert task is not None and not task.done()
+        assert monitoring.task is task
+    await asyncio.sleep(0)
+
+    assert task.cancelled()
+    assert monitoring.task is None
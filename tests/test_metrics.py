@@ -0,0 +1,105 @@
+"""Tests for the Prometheus metrics."""
+
+from typing import Any
+
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+import httpx
+import pytest
+import respx
+
+from app.config import config
+from app.metrics import (
+    Counter,
+    Histogram,
+    citeurl_cpu,
+    tool_calls,
+    tool_duration,
+    upstream_duration,
+)
+from app.server import mcp
+
+
+def test_histogram_exposition() -> None:
+    """Test that histogram buckets are cumulative and labelled."""
+    histogram = Histogram("test_seconds", "Test.", ("op",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "a")
+    histogram.observe(0.5, "a")
+    histogram.observe(5.0, "a")
+
+    lines = histogram.collect()
+    assert "# TYPE courtlistener_mcp_test_seconds histogram" in lines
+    assert 'courtlistener_mcp_test_seconds_bucket{op="a",le="0.1"} 1' in lines
+    assert 'courtlistener_mcp_test_seconds_bucket{op="a",le="1.0"} 2' in lines
+    assert 'courtlistener_mcp_test_seconds_bucket{op="a",le="+Inf"} 3' in lines
+    assert 'courtlistener_mcp_test_seconds_count{op="a"} 3' in lines
+    assert histogram.count("a") == 3
+
+
+def test_counter_escapes_label_values() -> None:
+    """Test that label values are escaped in the exposition."""
+    counter = Counter("test_total", "Test.", ("name",))
+    counter.inc('say "hi"', amount=2)
+    assert 'courtlistener_mcp_test_total{name="say \\"hi\\""} 2.0' in counter.collect()
+
+
+@pytest.mark.asyncio
+async def test_tool_and_upstream_metrics(client: Client[Any]) -> None:
+    """Test that tool calls and upstream requests are recorded."""
+    calls = tool_calls.value("get_opinion", "ok")
+    timed = tool_duration.count("get_opinion")
+    upstream = upstream_duration.count("opinions", "200")
+
+    async with client:
+        with respx.mock:
+            respx.get(f"{config.courtlistener_base_url}opinions/123/").mock(
+                return_value=httpx.Response(200, json={"id": 123})
+            )
+            await client.call_tool("get_opinion", {"opinion_id": "123"})
+
+    assert tool_calls.value("get_opinion", "ok") == calls + 1
+    assert tool_duration.count("get_opinion") == timed + 1
+    assert upstream_duration.count("opinions", "200") == upstream + 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_tools_share_one_series(client: Client[Any]) -> None:
+    """Test that made-up tool names do not create new series."""
+    unknown = tool_calls.value("unknown", "error")
+
+    async with client:
+        for name in ("no_such_tool", "another_made_up_tool"):
+            with pytest.raises(ToolError):
+                await client.call_tool(name, {})
+
+    assert tool_calls.value("unknown", "error") == unknown + 2
+    assert "no_such_tool" not in tool_calls.collect()
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client: Client[Any]) -> None:
+    """Test that /metrics serves every metric family."""
+    async with client:
+        await client.call_tool(
+            "citation_parse_citation_with_citeurl", {"citation": "410 U.S. 113"}
+        )
+    assert citeurl_cpu.value("parse") > 0 or citeurl_cpu.value("build") > 0
+
+    transport = httpx.ASGITransport(app=mcp.http_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        response = await http.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    for family in (
+        "tool_calls_total",
+        "tool_duration_seconds",
+        "upstream_request_duration_seconds",
+        "http_pool_connections",
+        "rate_limiter_waiting",
+        "cache_hit_ratio",
+        "citeurl_cpu_seconds_total",
+    ):
+        assert f"# TYPE courtlistener_mcp_{family} " in body
+    assert 'courtlistener_mcp_cache_hit_ratio{cache="citation_parse"}' in body
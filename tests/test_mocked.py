@@ -4,7 +4,9 @@ These tests use respx to mock HTTP responses, avoiding real API calls.
 This enables testing error paths and edge cases reliably.
 """
 
+from pathlib import Path
 from typing import Any
+from urllib.parse import parse_qs
 
 from fastmcp import Client
 from fastmcp.exceptions import ToolError
@@ -12,6 +14,10 @@ import httpx
 import pytest
 import respx
 
+from app.citator import parse_cache
+from app.config import config
+from app.lookup import get_lookup_store, lookup_cache
+
 
 # Sample mock responses
 MOCK_OPINIONS_RESPONSE = {
@@ -124,7 +130,12 @@ class TestMockedSearchTools:
     @respx.mock
     async def test_search_empty_results(self, client: Client[Any]) -> None:
         """Test search returning no results."""
-        empty_response: dict[str, Any] = {"count": 0, "next": None, "previous": None, "results": []}
+        empty_response: dict[str, Any] = {
+            "count": 0,
+            "next": None,
+            "previous": None,
+            "results": [],
+        }
         respx.get("https://www.courtlistener.com/api/rest/v4/search/").mock(
             return_value=httpx.Response(200, json=empty_response)
         )
@@ -199,7 +210,8 @@ class TestErrorHandling:
         """Test handling of 403 Forbidden response."""
         respx.get("https://www.courtlistener.com/api/rest/v4/opinions/123/").mock(
             return_value=httpx.Response(
-                403, json={"detail": "You do not have permission to perform this action."}
+                403,
+                json={"detail": "You do not have permission to perform this action."},
             )
         )
 
@@ -226,7 +238,9 @@ class TestErrorHandling:
         respx.get("https://www.courtlistener.com/api/rest/v4/search/").mock(
             return_value=httpx.Response(
                 429,
-                json={"detail": "Request was throttled. Expected available in 60 seconds."},
+                json={
+                    "detail": "Request was throttled. Expected available in 60 seconds."
+                },
                 headers={"Retry-After": "60"},
             )
         )
@@ -315,6 +329,275 @@ class TestMockedCitationTools:
             data = result.data
             assert data["count"] == 2
 
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_batch_lookup_citations_chunked(
+        self, client: Client[Any], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that large batches are deduplicated, chunked and merged in order."""
+        monkeypatch.setattr(config, "citation_lookup_max_citations", 2)
+
+        def lookup(request: httpx.Request) -> httpx.Response:
+            # Echo one result per line, with offsets like the real endpoint
+            text = parse_qs(request.content.decode())["text"][0]
+            items, offset = [], 0
+            for line in text.split("\n"):
+                status = 404 if line.startswith("999") else 200
+                items.append(
+                    {
+                        "citation": line,
+                        "start_index": offset,
+                        "end_index": offset + len(line),
+                        "status": status,
+                        "error_message": "" if status == 200 else "Not found",
+                        "clusters": [{"id": len(line)}] if status == 200 else [],
+                    }
+                )
+                offset += len(line) + 1
+            return httpx.Response(200, json=items)
+
+        route = respx.post(
+            "https://www.courtlistener.com/api/rest/v4/citation-lookup/"
+        ).mock(side_effect=lookup)
+
+        citations = [
+            "410 U.S. 113",
+            "347 U.S. 483",
+            "410  u.s. 113",
+            "999 U.S. 1",
+            "384 U.S. 436",
+        ]
+        async with client:
+            result = await client.call_tool(
+                "citation_batch_lookup_citations", {"citations": citations}
+            )
+
+            assert not result.is_error
+            data = result.data
+            assert data["unique_citations"] == 4
+            assert data["chunks"] == 2
+            assert route.call_count == 2
+            assert data["count"] == 4
+
+            entries = data["citations"]
+            assert [e["citation"] for e in entries] == citations
+            assert [e["status"] for e in entries] == [200, 200, 200, 404, 200]
+            assert entries[0]["normalized"] == "410 U.S. 113"
+            assert entries[2]["normalized"] == "410 U.S. 113"
+            assert entries[0]["results"] == entries[2]["results"]
+            assert entries[3]["error"] == "Not found"
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_batch_lookup_citations_partial_failure(
+        self, client: Client[Any], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a failed chunk only marks its own citations as failed."""
+        monkeypatch.setattr(config, "citation_lookup_max_citations", 1)
+
+        def lookup(request: httpx.Request) -> httpx.Response:
+            text = parse_qs(request.content.decode())["text"][0]
+            if text.startswith("347"):
+                return httpx.Response(500, json={"detail": "Server error"})
+            return httpx.Response(200, json=[{"citation": text, "status": 200}])
+
+        respx.post("https://www.courtlistener.com/api/rest/v4/citation-lookup/").mock(
+            side_effect=lookup
+        )
+
+        async with client:
+            result = await client.call_tool(
+                "citation_batch_lookup_citations",
+                {"citations": ["410 U.S. 113", "347 U.S. 483"]},
+            )
+
+            assert not result.is_error
+            entries = result.data["citations"]
+            assert entries[0]["status"] == 200
+            assert entries[1]["status"] == 500
+            assert entries[1]["error"]
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_lookup_citation_is_cached(self, client: Client[Any]) -> None:
+        """Test that repeat lookups of a normalized citation skip the API."""
+        route = respx.post(
+            "https://www.courtlistener.com/api/rest/v4/citation-lookup/"
+        ).mock(return_value=httpx.Response(200, json=MOCK_CITATION_LOOKUP_RESPONSE))
+
+        async with client:
+            first = await client.call_tool(
+                "citation_lookup_citation", {"citation": "384 U.S. 436"}
+            )
+            second = await client.call_tool(
+                "citation_lookup_citation", {"citation": "384  u.s. 436"}
+            )
+
+            assert route.call_count == 1
+            assert first.data["cached"] is False
+            assert second.data["cached"] is True
+            assert second.data["results"] == first.data["results"]
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_lookup_citation_caches_not_found(self, client: Client[Any]) -> None:
+        """Test that "not found" results are cached but errors are not."""
+        route = respx.post(
+            "https://www.courtlistener.com/api/rest/v4/citation-lookup/"
+        ).mock(
+            side_effect=[
+                httpx.Response(500, json={"detail": "Server error"}),
+                httpx.Response(
+                    200,
+                    json=[{"citation": "999 U.S. 999", "status": 404, "clusters": []}],
+                ),
+            ]
+        )
+
+        async with client:
+            with pytest.raises(ToolError):
+                await client.call_tool(
+                    "citation_lookup_citation", {"citation": "999 U.S. 999"}
+                )
+            for _ in range(2):
+                result = await client.call_tool(
+                    "citation_lookup_citation", {"citation": "999 U.S. 999"}
+                )
+                assert result.data["status"] == 404
+
+            assert route.call_count == 2
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_batch_lookup_sends_only_cache_misses(
+        self, client: Client[Any]
+    ) -> None:
+        """Test that a batch only asks upstream for uncached citations."""
+
+        def lookup(request: httpx.Request) -> httpx.Response:
+            text = parse_qs(request.content.decode())["text"][0]
+            items = [{"citation": line, "status": 200} for line in text.split("\n")]
+            return httpx.Response(200, json=items)
+
+        route = respx.post(
+            "https://www.courtlistener.com/api/rest/v4/citation-lookup/"
+        ).mock(side_effect=lookup)
+
+        async with client:
+            await client.call_tool(
+                "citation_lookup_citation", {"citation": "410 U.S. 113"}
+            )
+            result = await client.call_tool(
+                "citation_batch_lookup_citations",
+                {"citations": ["410 U.S. 113", "347 U.S. 483"]},
+            )
+
+            assert result.data["cached"] == 1
+            assert [e["status"] for e in result.data["citations"]] == [200, 200]
+            sent = parse_qs(route.calls.last.request.content.decode())["text"][0]
+            assert sent == "347 U.S. 483"
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_lookup_cache_persists(
+        self, client: Client[Any], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Test that cached lookups survive a cleared in-memory cache."""
+        monkeypatch.setattr(
+            config, "citation_lookup_cache_path", str(tmp_path / "lookups.sqlite3")
+        )
+        get_lookup_store.cache_clear()
+        route = respx.post(
+            "https://www.courtlistener.com/api/rest/v4/citation-lookup/"
+        ).mock(return_value=httpx.Response(200, json=MOCK_CITATION_LOOKUP_RESPONSE))
+
+        try:
+            async with client:
+                await client.call_tool(
+                    "citation_lookup_citation", {"citation": "384 U.S. 436"}
+                )
+                lookup_cache.clear()
+                result = await client.call_tool(
+                    "citation_lookup_citation", {"citation": "384 U.S. 436"}
+                )
+
+                assert route.call_count == 1
+                assert result.data["cached"] is True
+        finally:
+            get_lookup_store.cache_clear()
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_resolve_citations_in_text(self, client: Client[Any]) -> None:
+        """Test the extract, resolve and hydrate pipeline in one call."""
+        text = (
+            "See Roe v. Wade, 410 U.S. 113, 120 (1973). Id. at 125. In Brown v. "
+            "Board, 347 U.S. 483 (1954), the Court agreed. Roe, 410 U.S. at 130. "
+            "See also 42 U.S.C. § 1983."
+        )
+        lookup = respx.post(
+            "https://www.courtlistener.com/api/rest/v4/citation-lookup/"
+        ).mock(
+            return_value=httpx.Response(
+                200,
+                json=[
+                    {
+                        "citation": "410 U.S. 113",
+                        "start_index": 0,
+                        "status": 200,
+                        "clusters": [
+                            {
+                                "id": 108713,
+                                "case_name": "Roe v. Wade",
+                                "date_filed": "1973-01-22",
+                                "absolute_url": "/opinion/108713/roe-v-wade/",
+                            }
+                        ],
+                    },
+                    {
+                        "citation": "347 U.S. 483",
+                        "start_index": 13,
+                        "status": 200,
+                        "clusters": [{"id": 105221}],
+                    },
+                ],
+            )
+        )
+        hydrate = respx.get(
+            "https://www.courtlistener.com/api/rest/v4/clusters/105221/"
+        ).mock(
+            return_value=httpx.Response(
+                200,
+                json={
+                    "id": 105221,
+                    "case_name": "Brown v. Board of Education",
+                    "date_filed": "1954-05-17",
+                },
+            )
+        )
+
+        async with client:
+            result = await client.call_tool(
+                "citation_resolve_citations_in_text", {"text": text}
+            )
+
+            assert not result.is_error
+            data = result.data
+            assert lookup.call_count == 1
+            assert hydrate.call_count == 1
+            assert data["summary"]["citations_found"] == 5
+            assert data["summary"]["case_authorities"] == 2
+            assert data["summary"]["resolved"] == 2
+            assert data["summary"]["clusters_hydrated"] == 1
+
+            rows = data["citations"]
+            assert [r["form"] for r in rows] == ["full", "id", "full", "short", "full"]
+            assert all(text[r["start"] : r["end"]] == r["text"] for r in rows)
+            assert {r["authority"] for r in rows[:2]} == {"410 U.S. 113"}
+            assert rows[1]["case_name"] == "Roe v. Wade"
+            assert rows[2]["case_name"] == "Brown v. Board of Education"
+            assert rows[4]["status"] is None
+
     @pytest.mark.asyncio
     async def test_verify_citation_format_valid(self, client: Client[Any]) -> None:
         """Test citation format verification with valid citation."""
@@ -333,7 +616,8 @@ class TestMockedCitationTools:
         """Test citation format verification with invalid citation."""
         async with client:
             result = await client.call_tool(
-                "citation_verify_citation_format", {"citation": "not a real citation xyz"}
+                "citation_verify_citation_format",
+                {"citation": "not a real citation xyz"},
             )
 
             assert not result.is_error
@@ -354,6 +638,22 @@ class TestMockedCitationTools:
             assert data["valid"] is False
             assert "Citation is empty" in data["issues"]
 
+    @pytest.mark.asyncio
+    async def test_batch_verify_citation_formats(self, client: Client[Any]) -> None:
+        """Test verifying several citations in one call."""
+        async with client:
+            result = await client.call_tool(
+                "citation_batch_verify_citation_formats",
+                {"citations": ["410 U.S. 113", "not a real citation xyz", ""]},
+            )
+
+            assert not result.is_error
+            data = result.data
+            assert data["total"] == 3
+            assert data["valid_count"] == 1
+            assert [r["valid"] for r in data["results"]] == [True, False, False]
+            assert data["results"][0]["matching_mode"] == "strict"
+
     @pytest.mark.asyncio
     @respx.mock
     async def test_enhanced_citation_lookup_success(self, client: Client[Any]) -> None:
@@ -392,6 +692,52 @@ class TestMockedCitationTools:
             # CourtListener data should be empty when not requested
             assert data["courtlistener_data"] == {}
 
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_enhanced_lookup_caches_canonical_citation(
+        self, client: Client[Any]
+    ) -> None:
+        """Test that an unparsed spelling is also cached under its canonical name."""
+        parse_cache.clear()
+        route = respx.post(
+            "https://www.courtlistener.com/api/rest/v4/citation-lookup/"
+        ).mock(return_value=httpx.Response(200, json=MOCK_CITATION_LOOKUP_RESPONSE))
+
+        async with client:
+            enhanced = await client.call_tool(
+                "citation_enhanced_citation_lookup", {"citation": "384 u.s.  436"}
+            )
+            lookup = await client.call_tool(
+                "citation_lookup_citation", {"citation": "384 U.S. 436"}
+            )
+
+            assert enhanced.data["combined_info"]["has_both_sources"] is True
+            assert lookup.data["cached"] is True
+            assert route.call_count == 1
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_batch_enhanced_citation_lookup(self, client: Client[Any]) -> None:
+        """Test enhancing several citations with one upstream request."""
+        route = respx.post(
+            "https://www.courtlistener.com/api/rest/v4/citation-lookup/"
+        ).mock(return_value=httpx.Response(200, json=MOCK_CITATION_LOOKUP_RESPONSE))
+
+        async with client:
+            result = await client.call_tool(
+                "citation_batch_enhanced_citation_lookup",
+                {"citations": ["384 U.S. 436", "not a citation"]},
+            )
+
+            assert not result.is_error
+            data = result.data
+            assert data["total"] == 2
+            first, second = data["results"]
+            assert first["citation"] == "384 U.S. 436"
+            assert first["combined_info"]["has_both_sources"] is True
+            assert second["citeurl_analysis"]["success"] is False
+            assert route.call_count == 1
+
 
 class TestSearchFilters:
     """Tests for search tool filter parameters with mocked responses."""
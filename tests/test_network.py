@@ -0,0 +1,187 @@
+"""Tests for citation network expansion."""
+
+from typing import Any
+from urllib.parse import parse_qs
+
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+import httpx
+import pytest
+import respx
+
+from app.network import edges_cache
+
+BASE = "https://www.courtlistener.com/api/rest/v4/"
+
+# Opinion -> opinions it cites; 5 has no opinions_cited and must be read
+GRAPH = {
+    1: [2, 3],
+    2: [3, 4],
+    3: [1],
+    4: [5, 6, 7],
+    5: [],
+    6: [],
+    7: [],
+}
+OPINION_5_TEXT = "As held in Miranda v. Arizona, 384 U.S. 436 (1966), and id. at 444."
+
+
+def _opinion(request: httpx.Request, opinion_id: str) -> httpx.Response:
+    """Serve opinion records from GRAPH, honoring the fields parameter."""
+    opinion = int(opinion_id)
+    if "plain_text" in request.url.params.get("fields", ""):
+        return httpx.Response(200, json={"plain_text": OPINION_5_TEXT})
+    return httpx.Response(
+        200,
+        json={
+            "id": opinion,
+            "cluster": f"{BASE}clusters/{opinion * 10}/",
+            "opinions_cited": [f"{BASE}opinions/{c}/" for c in GRAPH[opinion]],
+        },
+    )
+
+
+@pytest.fixture
+def api() -> respx.MockRouter:
+    """Mock the opinion, cluster and citation-lookup endpoints."""
+    with respx.mock(assert_all_called=False) as router:
+        router.get(url__regex=rf"{BASE}opinions/(?P<opinion_id>\d+)/").mock(
+            side_effect=_opinion
+        )
+        router.get(f"{BASE}clusters/10/").mock(
+            return_value=httpx.Response(
+                200, json={"id": 10, "sub_opinions": [f"{BASE}opinions/1/"]}
+            )
+        )
+        router.post(f"{BASE}citation-lookup/").mock(
+            side_effect=lambda request: httpx.Response(
+                200,
+                json=[
+                    {
+                        "citation": parse_qs(request.content.decode())["text"][0],
+                        "status": 200,
+                        "clusters": [
+                            {"id": 60, "sub_opinions": [f"{BASE}opinions/6/"]}
+                        ],
+                    }
+                ],
+            )
+        )
+        yield router
+
+
+class TestCitationNetwork:
+    """Tests for the build_citation_network tool."""
+
+    @pytest.mark.asyncio
+    async def test_breadth_first_expansion(
+        self, client: Client[Any], api: respx.MockRouter
+    ) -> None:
+        """Test depth-limited traversal with deduplicated nodes."""
+        async with client:
+            result = await client.call_tool(
+                "citation_build_citation_network", {"opinion_ids": [1], "depth": 2}
+            )
+
+            data = result.data
+            assert data["roots"] == [1]
+            depths = {node["id"]: node["depth"] for node in data["nodes"]}
+            assert depths == {1: 0, 2: 1, 3: 1, 4: 2}
+            assert data["adjacency"] == {"1": [2, 3], "2": [3, 4], "3": [1]}
+            assert data["summary"]["truncated"] is False
+            assert data["nodes"][0]["cluster_id"] == 10
+
+    @pytest.mark.asyncio
+    async def test_starts_from_cluster(
+        self, client: Client[Any], api: respx.MockRouter
+    ) -> None:
+        """Test that clusters start from their opinions."""
+        async with client:
+            result = await client.call_tool(
+                "citation_build_citation_network", {"cluster_ids": [10]}
+            )
+
+            assert result.data["roots"] == [1]
+            assert result.data["adjacency"] == {"1": [2, 3]}
+
+    @pytest.mark.asyncio
+    async def test_node_budget(
+        self, client: Client[Any], api: respx.MockRouter
+    ) -> None:
+        """Test that the graph stops growing at max_nodes."""
+        async with client:
+            result = await client.call_tool(
+                "citation_build_citation_network",
+                {"opinion_ids": [1], "depth": 3, "max_nodes": 3},
+            )
+
+            summary = result.data["summary"]
+            assert summary["nodes"] == 3
+            assert summary["truncated"] is True
+            assert summary["dropped_edges"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_text_fallback(
+        self, client: Client[Any], api: respx.MockRouter
+    ) -> None:
+        """Test that opinions without opinions_cited are read and resolved."""
+        async with client:
+            result = await client.call_tool(
+                "citation_build_citation_network", {"opinion_ids": [5]}
+            )
+
+            assert result.data["adjacency"] == {"5": [6]}
+            assert result.data["summary"]["expanded_from_text"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_cluster_keeps_other_edges(
+        self, client: Client[Any], api: respx.MockRouter
+    ) -> None:
+        """Test that one cluster failing to load does not drop the others."""
+        api.post(f"{BASE}citation-lookup/").mock(
+            return_value=httpx.Response(
+                200,
+                json=[
+                    {
+                        "citation": "384 U.S. 436",
+                        "status": 200,
+                        "clusters": [
+                            {"id": 60, "sub_opinions": [f"{BASE}opinions/6/"]},
+                            {"id": 70},
+                        ],
+                    }
+                ],
+            )
+        )
+        api.get(f"{BASE}clusters/70/").mock(return_value=httpx.Response(500))
+        async with client:
+            result = await client.call_tool(
+                "citation_build_citation_network", {"opinion_ids": [5]}
+            )
+
+            assert result.data["adjacency"] == {"5": [6]}
+            assert result.data["errors"] == {}
+        assert edges_cache.get(5) is None
+
+    @pytest.mark.asyncio
+    async def test_expansions_are_cached(
+        self, client: Client[Any], api: respx.MockRouter
+    ) -> None:
+        """Test that a repeated traversal makes no new requests."""
+        async with client:
+            await client.call_tool(
+                "citation_build_citation_network", {"opinion_ids": [1], "depth": 2}
+            )
+            calls = len(api.calls)
+            await client.call_tool(
+                "citation_build_citation_network", {"opinion_ids": [1], "depth": 2}
+            )
+
+            assert len(api.calls) == calls
+
+    @pytest.mark.asyncio
+    async def test_requires_a_start(self, client: Client[Any]) -> None:
+        """Test that at least one starting ID is required."""
+        async with client:
+            with pytest.raises(ToolError):
+                await client.call_tool("citation_build_citation_network", {})
@@ -0,0 +1,85 @@
+"""Tests for the citation template prefilter."""
+
+from pathlib import Path
+import re
+
+from citeurl import list_cites  # type: ignore[import-untyped]
+import pytest
+
+from app.citator import get_citator, get_prefilter, list_citations, paragraph_cache
+from app.prefilter import DIGIT, required_atoms
+
+CORPUS_DIR = Path(__file__).parent.parent / "benchmarks" / "corpus"
+
+
+def test_required_atoms_for_reporter_pattern() -> None:
+    """Test that literal runs and digits are extracted as requirements."""
+    regex = re.compile(r"(?<!\w)(?P<volume>\d+) U\.S\. (?P<page>\d+)")
+    atoms = required_atoms(regex)
+
+    assert frozenset([DIGIT]) in atoms
+    assert frozenset([" U.S. "]) in atoms
+
+
+def test_optional_fragments_are_not_required() -> None:
+    """Test that optional groups and case-insensitive literals are skipped."""
+    assert required_atoms(re.compile(r"\d+( Stat\.)?")) == [frozenset([DIGIT])]
+    assert required_atoms(re.compile(r"(?i)\d+ stat")) == [frozenset([DIGIT])]
+
+
+def test_prefilter_includes_custom_templates() -> None:
+    """Test that fragments from custom_citation_templates.yaml are loaded."""
+    assert any("M.S.P.R." in atom for atom in get_prefilter().atoms)
+
+
+def test_prefilter_rejects_citation_free_text() -> None:
+    """Test that prose without citation fragments is rejected cheaply."""
+    prefilter = get_prefilter()
+    text = "The officers approached the vehicle and spoke with the driver."
+
+    assert prefilter.candidate_templates(text) == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "See Roe v. Wade, 410 U.S. 113, 120 (1973). Id. at 125.\n\nLater, 410 U.S. at 130.",
+        "Fees are available under 42 USC § 1988(b), and, by discretion, id. at (c).",
+        "The Board held otherwise. 120 M.S.P.R. 45 (2013).",
+        "No citations here at all.\n\nNor here.",
+    ],
+)
+def test_list_citations_matches_citeurl(text: str) -> None:
+    """Test that prefiltered extraction returns exactly citeurl's citations."""
+    expected = [(c.span, c.text) for c in list_cites(text, citator=get_citator())]
+    assert [(c.span, c.text) for c in list_citations(text)] == expected
+
+
+@pytest.mark.parametrize("path", sorted(CORPUS_DIR.glob("*.txt")), ids=lambda p: p.name)
+def test_list_citations_matches_citeurl_on_corpus(path: Path) -> None:
+    """Test equivalence with citeurl on the benchmark corpus."""
+    text = path.read_text(encoding="utf-8")
+    expected = [(c.span, c.text) for c in list_cites(text, citator=get_citator())]
+    actual = [(c.span, c.text) for c in list_citations(text)]
+
+    assert actual == expected
+    assert len(actual) > 0
+
+
+@pytest.mark.parametrize("path", sorted(CORPUS_DIR.glob("*.txt")), ids=lambda p: p.name)
+def test_incremental_extraction_matches_full(path: Path) -> None:
+    """Test that reusing cached paragraphs gives the same citations."""
+    text = path.read_text(encoding="utf-8")
+    paragraphs = text.split("\n\n")
+    paragraphs[1] += " See 410 U.S. 113, 120 (1973). Id. at 125."
+    edited = "\n\n".join(["Introduction.", *paragraphs])
+
+    paragraph_cache.clear()
+    list_citations(text, incremental=True)
+    before = paragraph_cache.stats()
+    actual = [(c.span, c.text, c.name) for c in list_citations(edited, True)]
+    after = paragraph_cache.stats()
+
+    assert actual == [(c.span, c.text, c.name) for c in list_citations(edited)]
+    assert after.misses - before.misses == 2
+    assert after.hits - before.hits == len(paragraphs) - 1
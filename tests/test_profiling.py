@@ -0,0 +1,159 @@
+"""Tests for on-demand profiling and memory diffs."""
+
+import asyncio
+from pathlib import Path
+import pstats
+import time
+from typing import Any
+
+from fastmcp import Client, FastMCP
+import pytest
+
+from app.config import config
+from app.loop_monitor import ToolTaskMiddleware
+from app.profiling import (
+    memory_diff,
+    run_profile,
+    start_memory_tracking,
+    stop_memory_tracking,
+)
+from app.tools.admin import admin_server
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Write profiling artifacts to a temporary directory."""
+    monkeypatch.setattr(config, "profile_dir", str(tmp_path))
+    return tmp_path
+
+
+def _busy_server() -> FastMCP[Any]:
+    """A server with two CPU-bound tools."""
+    server: FastMCP[Any] = FastMCP(name="Busy")
+    server.add_middleware(ToolTaskMiddleware())
+
+    def spin(seconds: float) -> None:
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            pass
+
+    @server.tool()
+    def hot(seconds: float) -> str:
+        spin(seconds)
+        return "done"
+
+    @server.tool()
+    def cold(seconds: float) -> str:
+        spin(seconds)
+        return "done"
+
+    return server
+
+
+async def _call(client: Client[Any], tool: str, times: int) -> None:
+    """Call a tool repeatedly, yielding to the profiler in between."""
+    for _ in range(times):
+        await client.call_tool(tool, {"seconds": 0.05})
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_collapsed_profile_attributes_samples_to_tools(
+    profile_dir: Path,
+) -> None:
+    """Test that folded stacks are rooted at the tool that was running."""
+    async with Client(_busy_server()) as client:
+        profile, _ = await asyncio.gather(
+            run_profile(5, max_calls=3, interval=0.002),
+            _call(client, "hot", 3),
+        )
+
+    assert profile["tool_calls"] == 3
+    assert profile["duration_seconds"] < 5
+    artifact = Path(profile["artifact"])
+    assert artifact.parent == profile_dir
+    lines = artifact.read_text(encoding="utf-8").splitlines()
+    assert lines
+    _, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any(line.startswith("tool:hot;") and "spin" in line for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_tool_filter() -> None:
+    """Test that a tool filter drops other tools' samples and calls."""
+    async with Client(_busy_server()) as client:
+        profile, _, _ = await asyncio.gather(
+            run_profile(5, max_calls=2, tool="hot", interval=0.002),
+            _call(client, "cold", 4),
+            _call(client, "hot", 2),
+        )
+
+    assert profile["tool_calls"] == 2
+    assert profile["matched_samples"] > 0
+    assert profile["matched_samples"] < profile["samples"]
+    assert all(s["stack"].startswith("tool:hot;") for s in profile["top_stacks"])
+
+
+@pytest.mark.asyncio
+async def test_pstats_profile() -> None:
+    """Test that pstats mode writes a loadable cProfile artifact."""
+    async with Client(_busy_server()) as client:
+        profile, _ = await asyncio.gather(
+            run_profile(5, max_calls=1, mode="pstats"),
+            _call(client, "hot", 1),
+        )
+
+    stats = pstats.Stats(profile["artifact"])
+    assert any(func[2] == "spin" for func in stats.stats)  # type: ignore[attr-defined]
+    assert "spin" in profile["summary"]
+
+
+@pytest.mark.asyncio
+async def test_only_one_profile_at_a_time() -> None:
+    """Test that overlapping profiles are rejected."""
+    first = asyncio.create_task(run_profile(0.2))
+    await asyncio.sleep(0.01)
+    with pytest.raises(RuntimeError, match="already running"):
+        await run_profile(0.1)
+    await first
+    with pytest.raises(ValueError, match="Unknown profile mode"):
+        await run_profile(0.1, mode="flame")
+
+
+def test_memory_diff_reports_growth() -> None:
+    """Test that allocations after the baseline show up in the diff."""
+    with pytest.raises(RuntimeError):
+        memory_diff()
+
+    start_memory_tracking()
+    try:
+        retained = [bytearray(1024) for _ in range(2000)]
+        diff = memory_diff(top=5)
+    finally:
+        stop_memory_tracking()
+
+    assert len(retained) == 2000
+    assert diff["growth_kb"] >= 1900
+    assert "test_profiling.py" in diff["top"][0]["location"]
+    assert diff["top"][0]["count_diff"] >= 2000
+    assert Path(diff["artifact"]).exists()
+    assert "citation_lookup" in diff["caches"]
+
+
+@pytest.mark.asyncio
+async def test_admin_tools() -> None:
+    """Test the admin tools through an MCP client."""
+    async with Client(admin_server) as client:
+        result = await client.call_tool(
+            "profile", {"duration_seconds": 0.1, "interval_ms": 2}
+        )
+        assert result.data["mode"] == "collapsed"
+        assert Path(result.data["artifact"]).exists()
+
+        result = await client.call_tool("memory_snapshot", {"action": "start"})
+        assert result.data["tracing"] is True
+        result = await client.call_tool("memory_snapshot", {"action": "diff"})
+        assert "growth_kb" in result.data
+        result = await client.call_tool("memory_snapshot", {"action": "stop"})
+        assert result.data["tracing"] is False
@@ -0,0 +1,100 @@
+"""Tests for the optional uvloop and orjson fast paths."""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import date
+import importlib.util
+from typing import Any
+
+from fastmcp.tools.tool import default_serializer
+from pydantic import BaseModel
+import pytest
+
+from app import speedups
+from app.config import config
+
+HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+HAS_UVLOOP = importlib.util.find_spec("uvloop") is not None
+
+
+class Court(BaseModel):
+    """A pydantic model, which orjson cannot encode by itself."""
+
+    id: str
+    name: str
+
+
+@dataclass
+class Hit:
+    """A dataclass with a date."""
+
+    cluster_id: int
+    date_filed: date
+
+
+RESULT: dict[Any, Any] = {
+    "count": 2,
+    "results": [Hit(1, date(1973, 1, 22)), {"court": Court(id="scotus", name="SC")}],
+    "score": 1.5,
+    1: "non-string key",
+    "big": 2**70,
+    "text": "§ 1983 — “quoted”",
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def codec(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run a test with the orjson codec and with the standard library fallback."""
+    if request.param == "orjson":
+        if not HAS_ORJSON:
+            pytest.skip("orjson is not installed")
+        import orjson
+
+        monkeypatch.setattr(speedups, "_orjson", orjson)
+    else:
+        monkeypatch.setattr(speedups, "_orjson", None)
+    return str(request.param)
+
+
+def test_dumps_matches_fastmcp_serializer(codec: str) -> None:
+    """Test that tool results encode to the same JSON with either codec."""
+    encoded = speedups.json_dumps(RESULT)
+
+    assert speedups.json_loads(encoded) == speedups.json_loads(
+        default_serializer(RESULT)
+    )
+    assert speedups.active()["json"] == codec
+
+
+def test_loads_bytes_and_errors(codec: str) -> None:
+    """Test that response bodies decode from bytes and bad JSON raises ValueError."""
+    body = '{"id": 7, "plain_text": "Roe v. Wade, 410 U.S. 113"}'.encode()
+
+    assert speedups.json_loads(body) == {
+        "id": 7,
+        "plain_text": "Roe v. Wade, 410 U.S. 113",
+    }
+    with pytest.raises(ValueError):
+        speedups.json_loads(b"<html>Bad gateway</html>")
+
+
+@pytest.mark.skipif(not HAS_UVLOOP, reason="uvloop is not installed")
+def test_run_uses_uvloop() -> None:
+    """Test that the server runs on uvloop when it is installed."""
+
+    async def loop_name() -> str:
+        return speedups.active()["event_loop"]
+
+    assert speedups.run(loop_name()) == "uvloop"
+
+
+def test_run_falls_back_to_asyncio(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that disabling uvloop runs the default asyncio loop."""
+    monkeypatch.setattr(config, "uvloop_enabled", False)
+
+    async def loop_name() -> str:
+        await asyncio.sleep(0)
+        return speedups.active()["event_loop"]
+
+    assert speedups.loop_factory() is None
+    assert speedups.run(loop_name()) == "asyncio"
@@ -0,0 +1,56 @@
+"""Import-time regression tests for server startup."""
+
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+# Generous wall-clock budget for a cold `import app.server`, which is dominated
+# by fastmcp; it catches heavy modules creeping back onto the startup path
+IMPORT_BUDGET_SECONDS = 5.0
+
+# Modules that must only be loaded on first use
+LAZY_MODULES = ("citeurl", "psutil")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.server
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "elapsed": elapsed,
+    "loaded": [m for m in sys.argv[1:] if m in sys.modules],
+}))
+"""
+
+
+@pytest.fixture(scope="module")
+def cold_import() -> dict[str, object]:
+    """Import the server in a fresh interpreter and report what it loaded."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, *LAZY_MODULES],
+        cwd=ROOT,
+        env={**os.environ, "COURT_LISTENER_API_KEY": "test"},
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_heavy_modules_are_not_imported_at_startup(
+    cold_import: dict[str, object],
+) -> None:
+    """Test that citeurl and psutil stay off the startup path."""
+    assert cold_import["loaded"] == []
+
+
+def test_import_time_within_budget(cold_import: dict[str, object]) -> None:
+    """Test that importing the server stays within the cold-start budget."""
+    assert cold_import["elapsed"] < IMPORT_BUDGET_SECONDS  # type: ignore[operator]
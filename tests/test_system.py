@@ -0,0 +1,129 @@
+"""Tests for the background system sampler behind the status tool."""
+
+import asyncio
+import time
+from typing import Any
+
+from fastmcp import Client
+import pytest
+
+from app import system
+from app.config import config
+from app.server import mcp
+from app.system import SystemSampler, sampling, static_info
+
+
+def test_static_info_is_computed_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that Docker detection runs once, not on every status call."""
+    calls = []
+    monkeypatch.setattr(system, "is_docker", lambda: calls.append(1) or False)
+    static_info.cache_clear()
+    try:
+        assert static_info()["runtime"] == "native"
+        static_info()
+        assert calls == [1]
+    finally:
+        static_info.cache_clear()
+
+
+def test_snapshot_before_first_background_sample() -> None:
+    """Test that a snapshot is available before the sampler has run."""
+    snapshot = SystemSampler().snapshot()
+
+    assert snapshot["memory_mb"] > 0
+    assert snapshot["cpu_percent"] == 0.0
+    assert snapshot["loop_lag_ms"] is None
+    assert {"active", "idle", "max", "tcp"} <= snapshot["connections"].keys()
+
+
+@pytest.mark.asyncio
+async def test_background_sampling_keeps_rolling_window() -> None:
+    """Test that the sampler keeps only the most recent samples."""
+    sampler = SystemSampler(window=3)
+    task = asyncio.create_task(sampler.run(0.01))
+    await asyncio.sleep(0.2)
+    task.cancel()
+
+    assert len(sampler._cpu) == 3
+    assert len(sampler._lag) == 3
+
+
+@pytest.mark.asyncio
+async def test_background_sampling_measures_loop_lag(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a blocked event loop shows up as loop lag."""
+    sampler = SystemSampler()
+    monkeypatch.setattr(sampler, "sample", lambda: None)
+    task = asyncio.create_task(sampler.run(0.01))
+    await asyncio.sleep(0.005)  # let the sampler start its first sleep
+    # then stall the loop from a callback, as a slow handler would
+    asyncio.get_running_loop().call_soon(time.sleep, 0.05)
+    await asyncio.sleep(0.02)
+    task.cancel()
+    monkeypatch.undo()
+
+    assert sampler.snapshot()["loop_lag_max_ms"] >= 30
+
+
+@pytest.mark.asyncio
+async def test_status_samples_on_demand_when_disabled(
+    client: Client[Any], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that STATUS_SAMPLE_INTERVAL=0 samples on each call, not never."""
+    monkeypatch.setattr(config, "status_sample_interval", 0.0)
+    async with client:
+        first = await client.call_tool("status", {})
+        await asyncio.sleep(0.01)
+        second = await client.call_tool("status", {})
+
+    assert sampling.task is None
+    assert second.data["system"]["sampled_at"] != first.data["system"]["sampled_at"]
+
+
+@pytest.mark.asyncio
+async def test_status_does_not_block(client: Client[Any]) -> None:
+    """Test that status returns the latest snapshot without sampling CPU inline."""
+    async with client:
+        await client.call_tool("status", {})
+        start = time.perf_counter()
+        result = await client.call_tool("status", {})
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.09  # cpu_percent(interval=0.1) used to block for 100ms
+    assert "loop_lag_ms" in result.data["system"]
+    assert result.data["environment"] == static_info()
+
+
+@pytest.mark.asyncio
+async def test_sampler_outlives_sessions(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that status keeps updating after an earlier session has ended."""
+    monkeypatch.setattr(config, "status_sample_interval", 0.02)
+
+    async def sampled_at(client: Client[Any]) -> str:
+        result = await client.call_tool("status", {})
+        return str(result.data["system"]["sampled_at"])
+
+    opened, closing = asyncio.Event(), asyncio.Event()
+
+    async def first_session() -> None:
+        async with Client(mcp) as client:
+            await client.call_tool("status", {})
+            opened.set()
+            await closing.wait()
+
+    first = asyncio.create_task(first_session())
+    await opened.wait()
+    async with Client(mcp) as second:
+        # The session that started the sampler ends before this one
+        closing.set()
+        await first
+        before = await sampled_at(second)
+        await asyncio.sleep(0.2)
+        assert await sampled_at(second) != before
+
+    # A later session still gets fresh samples
+    async with Client(mcp) as third:
+        before = await sampled_at(third)
+        await asyncio.sleep(0.2)
+        assert await sampled_at(third) != before
@@ -0,0 +1,86 @@
+"""Tests for the debug-mode per-call timing breakdown."""
+
+import json
+from typing import Any
+
+from fastmcp import Client, FastMCP
+import httpx
+import pytest
+import respx
+
+from app.api import get_resource
+from app.citator import parse_cache, parse_citation
+from app.config import config
+from app.timing import PHASES, TimingMiddleware, phase, serialize, time_http_client
+
+
+def _timed_server(http_client: httpx.AsyncClient) -> FastMCP[Any]:
+    """A server whose tool fetches a record and parses a citation."""
+    server: FastMCP[Any] = FastMCP(name="Timed", tool_serializer=serialize)
+    server.add_middleware(TimingMiddleware())
+
+    @server.tool()
+    async def fetch(opinion_id: int) -> dict[str, Any]:
+        opinion = await get_resource(
+            http_client, "opinions", opinion_id, use_cache=True
+        )
+        parsed = parse_citation("410 U.S. 113")
+        return {"opinion": opinion, "citation": parsed.name if parsed else None}
+
+    @server.tool()
+    def echo(text: str) -> str:
+        return text
+
+    return server
+
+
+@pytest.mark.asyncio
+async def test_tool_result_includes_timing() -> None:
+    """Test that every phase of a call is reported with the result."""
+    parse_cache.clear()
+    url = f"{config.courtlistener_base_url}opinions/7/"
+    async with httpx.AsyncClient() as http_client:
+        time_http_client(http_client)
+        with respx.mock:
+            respx.get(url).mock(
+                return_value=httpx.Response(200, json={"id": 7, "text": "x" * 10000})
+            )
+            async with Client(_timed_server(http_client)) as client:
+                result = await client.call_tool("fetch", {"opinion_id": 7})
+                cached = await client.call_tool("fetch", {"opinion_id": 7})
+
+    timing = result.structured_content["_timing"]
+    assert set(timing) == {"total_ms", *(f"{name}_ms" for name in PHASES)}
+    for name in (
+        "upstream_ttfb",
+        "body_download",
+        "json_decode",
+        "cache_lookup",
+        "citeurl",
+        "serialization",
+    ):
+        assert timing[f"{name}_ms"] > 0, name
+    assert timing["total_ms"] >= timing["upstream_ttfb_ms"] + timing["citeurl_ms"]
+    assert result.data["opinion"]["id"] == 7
+    assert json.loads(result.content[-1].text) == {"_timing": timing}
+
+    # Served from the response cache: no upstream time
+    assert cached.structured_content["_timing"]["upstream_ttfb_ms"] == 0
+
+
+@pytest.mark.asyncio
+async def test_timing_for_unstructured_results() -> None:
+    """Test that results without structured content get a timing block."""
+    async with httpx.AsyncClient() as http_client:
+        async with Client(_timed_server(http_client)) as client:
+            result = await client.call_tool("echo", {"text": "hi"})
+
+    assert result.content[0].text == "hi"
+    assert "total_ms" in json.loads(result.content[-1].text)["_timing"]
+
+
+def test_phases_are_free_outside_tool_calls() -> None:
+    """Test that phases outside a timed call record nothing."""
+    with phase("citeurl"):
+        pass
+    assert serialize({"a": 1}) == '{"a":1}'
@@ -0,0 +1,108 @@
+"""Tests for the optional OpenTelemetry tracing."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import httpx
+import pytest
+import respx
+
+from app import tracing
+from app.api import get_resource
+from app.citator import parse_cache, parse_citation
+from app.config import config
+
+
+class RecordingSpan:
+    """Span that keeps its name, attributes and parent."""
+
+    def __init__(self, name: str, attributes: dict[str, Any], parent: Any) -> None:
+        self.name = name
+        self.attributes = dict(attributes)
+        self.parent = parent
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+
+class RecordingTracer:
+    """Minimal tracer recording spans in the order they start."""
+
+    def __init__(self) -> None:
+        self.spans: list[RecordingSpan] = []
+        self._stack: list[RecordingSpan] = []
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, attributes: dict[str, Any] | None = None
+    ) -> Iterator[RecordingSpan]:
+        parent = self._stack[-1] if self._stack else None
+        span = RecordingSpan(name, attributes or {}, parent)
+        self.spans.append(span)
+        self._stack.append(span)
+        try:
+            yield span
+        finally:
+            self._stack.pop()
+
+    def named(self, name: str) -> list[RecordingSpan]:
+        return [span for span in self.spans if span.name == name]
+
+
+@pytest.fixture
+def tracer(monkeypatch: pytest.MonkeyPatch) -> RecordingTracer:
+    """Record spans for the duration of a test."""
+    recording = RecordingTracer()
+    monkeypatch.setattr(tracing, "_tracer", recording)
+    return recording
+
+
+def test_span_is_noop_when_disabled() -> None:
+    """Test that spans cost nothing and accept attributes when tracing is off."""
+    assert not tracing.is_enabled()
+    first = tracing.span("a", {"x": 1})
+    assert first is tracing.span("b")
+    with first as current:
+        current.set_attribute("y", 2)
+
+
+def test_configure_tracing_respects_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that tracing stays off unless enabled with a known exporter."""
+    assert tracing.configure_tracing() is False
+
+    monkeypatch.setattr(config, "tracing_enabled", True)
+    monkeypatch.setattr(config, "tracing_exporter", "carrier-pigeon")
+    assert tracing.configure_tracing() is False
+    assert not tracing.is_enabled()
+
+
+@pytest.mark.asyncio
+async def test_get_resource_spans(tracer: RecordingTracer) -> None:
+    """Test spans for queueing, the request, JSON decoding and the cache."""
+    url = f"{config.courtlistener_base_url}opinions/7/"
+    async with httpx.AsyncClient() as client:
+        with respx.mock:
+            respx.get(url).mock(return_value=httpx.Response(200, json={"id": 7}))
+            await get_resource(client, "opinions", 7, use_cache=True)
+            await get_resource(client, "opinions", 7, use_cache=True)
+
+    requests = tracer.named("courtlistener.get_resource")
+    assert [span.attributes["cache.outcome"] for span in requests] == ["miss", "hit"]
+    assert requests[0].attributes["http.response.status_code"] == 200
+    assert requests[0].attributes["http.response.body.size"] > 0
+    assert tracer.named("rate_limiter.acquire")[0].parent is requests[0]
+    assert tracer.named("json.decode")[0].parent is requests[0]
+
+
+def test_citeurl_spans(tracer: RecordingTracer) -> None:
+    """Test that citeurl parses record their cache outcome."""
+    parse_cache.clear()
+    parse_citation("410 U.S. 113")
+    parse_citation("410 U.S. 113")
+
+    parses = tracer.named("citeurl.parse")
+    assert [span.attributes["cache.outcome"] for span in parses] == ["miss", "hit"]
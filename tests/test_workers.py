@@ -0,0 +1,172 @@
+"""Tests for the multi-process HTTP transport and its shared state."""
+
+import asyncio
+from collections.abc import Iterator
+import os
+from pathlib import Path
+import socket
+
+from fastmcp import Client
+import httpx
+import pytest
+import respx
+
+from app import server
+from app.api import get_resource, response_cache
+from app.cache_backend import get_cache_backend
+from app.config import config
+from app.lookup import lookup_cache, resolve_citations
+from app.ratelimit import RateLimiter, SharedSchedule
+from app.workers import run_workers, supports_reuse_port
+
+
+@pytest.fixture
+def shared_state(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Share state through a temporary file, as HTTP workers do."""
+    path = tmp_path / "shared.sqlite3"
+    monkeypatch.setattr(config, "shared_state_path", str(path))
+    monkeypatch.setattr(config, "cache_backend", "sqlite")
+    get_cache_backend.cache_clear()
+    yield path
+    get_cache_backend.cache_clear()
+
+
+def test_shared_schedule_spaces_starts_across_connections(tmp_path: Path) -> None:
+    """Test that schedules opened separately (as by two workers) share one budget."""
+    path = tmp_path / "schedule.sqlite3"
+    first, second = SharedSchedule(path), SharedSchedule(path)
+
+    delays = [first.reserve(0.1), second.reserve(0.1), first.reserve(0.1)]
+
+    assert delays[0] == pytest.approx(0.0, abs=0.02)
+    assert delays[1] == pytest.approx(0.1, abs=0.02)
+    assert delays[2] == pytest.approx(0.2, abs=0.02)
+    assert SharedSchedule(path, name="other").reserve(0.1) == pytest.approx(
+        0.0, abs=0.02
+    )
+
+
+@pytest.mark.asyncio
+async def test_shared_rate_limit(tmp_path: Path) -> None:
+    """Test that limiters sharing a schedule pace requests together."""
+    limiters = [RateLimiter(max_concurrency=8, requests_per_second=50) for _ in "ab"]
+    for limiter in limiters:
+        limiter.share(SharedSchedule(tmp_path / "schedule.sqlite3"), processes=2)
+    assert limiters[0].max_concurrency == 4
+
+    async def request(limiter: RateLimiter) -> float:
+        async with limiter:
+            return asyncio.get_running_loop().time()
+
+    starts = sorted(
+        await asyncio.gather(*(request(limiters[i % 2]) for i in range(10)))
+    )
+
+    # 10 starts at 50/s across both limiters take at least 9 intervals
+    assert starts[-1] - starts[0] >= 9 * 0.02 - 0.01
+
+
+@pytest.mark.asyncio
+async def test_workers_never_exceed_concurrency_cap(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the server runs no more workers than upstream request slots."""
+    started: list[int] = []
+
+    async def fake_run_workers(processes: int, *args: object) -> None:
+        started.append(processes)
+
+    monkeypatch.setattr(config, "courtlistener_max_concurrency", 2)
+    monkeypatch.setattr(server, "run_workers", fake_run_workers)
+    monkeypatch.setattr(server, "supports_reuse_port", lambda: True)
+    await server.run_server("http", "127.0.0.1", 8000, "/mcp/", "info", workers=4)
+
+    assert started == [2]
+
+
+@pytest.mark.asyncio
+async def test_response_cache_is_shared(shared_state: Path) -> None:
+    """Test that a record fetched by one worker is served to another from disk."""
+    url = f"{config.courtlistener_base_url}opinions/7/"
+    async with httpx.AsyncClient() as client:
+        with respx.mock:
+            route = respx.get(url).mock(
+                return_value=httpx.Response(200, json={"id": 7})
+            )
+            await get_resource(client, "opinions", 7, use_cache=True)
+            # Another worker starts with an empty in-memory cache
+            response_cache.clear()
+            data = await get_resource(client, "opinions", 7, use_cache=True)
+
+    assert data == {"id": 7}
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_lookup_cache_is_shared(shared_state: Path) -> None:
+    """Test that citation lookups made by one worker are reused by another."""
+    url = f"{config.courtlistener_base_url}citation-lookup/"
+    async with httpx.AsyncClient() as client:
+        with respx.mock:
+            route = respx.post(url).mock(
+                return_value=httpx.Response(
+                    200,
+                    json=[
+                        {
+                            "citation": "384 U.S. 436",
+                            "start_index": 0,
+                            "end_index": 12,
+                            "status": 200,
+                            "clusters": [{"id": 1}],
+                        }
+                    ],
+                )
+            )
+            await resolve_citations(client, ["384 U.S. 436"])
+            lookup_cache.clear()
+            resolved = await resolve_citations(client, ["384 U.S. 436"])
+
+    assert route.call_count == 1
+    assert resolved.cached_keys == {"384 U.S. 436"}
+    assert resolved.outcomes["384 U.S. 436"].status == 200
+
+
+def _free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not supports_reuse_port(), reason="needs SO_REUSEPORT")
+async def test_http_workers_serve_requests(shared_state: Path) -> None:
+    """Test that worker processes serve stateless MCP requests on one port."""
+    port = _free_port()
+    supervisor = asyncio.create_task(
+        run_workers(2, "127.0.0.1", port, "/mcp/", "warning")
+    )
+    try:
+        url = f"http://127.0.0.1:{port}/mcp/"
+        for _ in range(150):
+            try:
+                async with Client(url) as client:
+                    result = await client.call_tool("status")
+                break
+            except (httpx.HTTPError, RuntimeError):
+                # fastmcp reports a refused connection as a RuntimeError
+                if supervisor.done():
+                    supervisor.result()
+                await asyncio.sleep(0.1)
+        else:
+            pytest.fail("HTTP workers did not start")
+
+        assert result.data["status"] == "healthy"
+        assert result.data["server"]["pid"] != os.getpid()
+    finally:
+        supervisor.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await supervisor
+
+    with socket.socket() as sock:
+        assert sock.connect_ex(("127.0.0.1", port)) != 0